@@ -0,0 +1,124 @@
+"""Stress one database with several writer processes at once.
+
+Each process issues --ops writes (mostly add, some update-status) against the
+same file. "sync" uses ApplicationRepository directly, one commit per write,
+the way separate CLI invocations do. "async" runs --concurrency writes at a
+time through AsyncApplicationRepository, which coalesces them into shared
+transactions. Reports overall write throughput, per-write latency
+percentiles and how many writes failed (e.g. "database is locked").
+
+    PYTHONPATH=src python3 benchmarks/bench_concurrent_writers.py --processes 4 --ops 2000
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import sqlite3
+import tempfile
+import time
+
+from jobtracker.async_repository import AsyncApplicationRepository
+from jobtracker.db import connect, init_db
+from jobtracker.repository import ApplicationRepository
+
+# Every Nth write is a status update of the process's previous application.
+UPDATE_EVERY = 4
+
+
+def _sync_worker(db_path: str, worker: int, ops: int, busy_timeout_ms: int) -> tuple[list[float], int]:
+    conn = connect(db_path, busy_timeout_ms=busy_timeout_ms)
+    repo = ApplicationRepository(conn)
+    latencies: list[float] = []
+    errors = 0
+    last_id = None
+    for i in range(ops):
+        start = time.perf_counter()
+        try:
+            if last_id is not None and i % UPDATE_EVERY == 0:
+                repo.update_status(last_id, "interview")
+            else:
+                last_id = repo.add_application(company=f"Worker {worker} Co {i}", role="Engineer")
+        except sqlite3.OperationalError:
+            errors += 1
+            conn.rollback()
+        latencies.append(time.perf_counter() - start)
+    conn.close()
+    return latencies, errors
+
+
+async def _async_worker(
+    db_path: str, worker: int, ops: int, concurrency: int, busy_timeout_ms: int
+) -> tuple[list[float], int]:
+    latencies: list[float] = []
+    errors = 0
+    async with AsyncApplicationRepository(db_path, readers=1, busy_timeout_ms=busy_timeout_ms) as repo:
+        last_id = await repo.add_application(company=f"Worker {worker} seed", role="Engineer")
+        limit = asyncio.Semaphore(concurrency)
+
+        async def one(i: int) -> None:
+            nonlocal errors
+            async with limit:
+                start = time.perf_counter()
+                try:
+                    if i % UPDATE_EVERY == 0:
+                        await repo.update_status(last_id, "interview")
+                    else:
+                        await repo.add_application(company=f"Worker {worker} Co {i}", role="Engineer")
+                except sqlite3.OperationalError:
+                    errors += 1
+                latencies.append(time.perf_counter() - start)
+
+        await asyncio.gather(*(one(i) for i in range(ops)))
+    return latencies, errors
+
+
+def _run_worker(mode: str, db_path: str, worker: int, ops: int, concurrency: int, busy_timeout_ms: int):
+    if mode == "sync":
+        return _sync_worker(db_path, worker, ops, busy_timeout_ms)
+    return asyncio.run(_async_worker(db_path, worker, ops, concurrency, busy_timeout_ms))
+
+
+def _percentile(ordered: list[float], fraction: float) -> float:
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--ops", type=int, default=2000, help="Writes per process")
+    parser.add_argument("--concurrency", type=int, default=64, help="In-flight writes per process (async mode)")
+    parser.add_argument("--busy-timeout-ms", type=int, default=5000)
+    parser.add_argument("--mode", choices=["sync", "async", "both"], default="both")
+    parser.add_argument("--dir", default=None, help="Directory for the benchmark databases (use a real disk)")
+    args = parser.parse_args()
+
+    modes = ["sync", "async"] if args.mode == "both" else [args.mode]
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmpdir:
+        for mode in modes:
+            db_path = os.path.join(tmpdir, f"{mode}.db")
+            conn = connect(db_path)
+            init_db(conn)
+            conn.close()
+
+            jobs = [
+                (mode, db_path, worker, args.ops, args.concurrency, args.busy_timeout_ms)
+                for worker in range(args.processes)
+            ]
+            start = time.perf_counter()
+            with multiprocessing.Pool(args.processes) as pool:
+                results = pool.starmap(_run_worker, jobs)
+            elapsed = time.perf_counter() - start
+
+            latencies = sorted(sample for samples, _ in results for sample in samples)
+            errors = sum(failed for _, failed in results)
+            print(
+                f"{mode:<6} {len(latencies) / elapsed:9.0f} writes/s  "
+                f"p50={_percentile(latencies, 0.50) * 1000:7.2f}ms  "
+                f"p99={_percentile(latencies, 0.99) * 1000:7.2f}ms  errors={errors}"
+            )
+
+
+if __name__ == "__main__":
+    main()
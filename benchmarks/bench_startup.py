@@ -0,0 +1,64 @@
+"""Measure the per-command database overhead of the jobtracker CLI.
+
+Every CLI command connects, initializes the schema and runs one statement.
+"before" replays the old startup path: SQLite's default pragmas plus the full
+DDL script and a commit on every command. The other rows use the current
+path, where an up-to-date schema costs a single PRAGMA read, under each
+--db-profile.
+
+    PYTHONPATH=src python3 benchmarks/bench_startup.py --commands 2000
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from jobtracker.db import DB_PROFILES, LIST_INDEXES_SQL, SCHEMA_SQL, SEARCH_SCHEMA_SQL, connect, init_db
+from jobtracker.repository import ApplicationRepository
+
+FULL_DDL = SCHEMA_SQL + SEARCH_SCHEMA_SQL + LIST_INDEXES_SQL
+
+
+def _time_commands(db_path: str, profile: str, commands: int, gated: bool) -> list[float]:
+    samples = []
+    for i in range(commands):
+        start = time.perf_counter()
+        conn = connect(db_path, profile=profile)
+        if gated:
+            init_db(conn)
+        else:
+            conn.executescript(FULL_DDL)
+            conn.commit()
+        ApplicationRepository(conn).add_application(company=f"Company {i}", role="Engineer")
+        conn.close()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def _report(label: str, samples: list[float]) -> None:
+    ordered = sorted(samples)
+    p95 = ordered[max(int(len(ordered) * 0.95) - 1, 0)]
+    print(f"{label:<18} mean={statistics.mean(samples) * 1000:7.3f}ms  p95={p95 * 1000:7.3f}ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--commands", type=int, default=2000)
+    parser.add_argument("--dir", default=None, help="Directory for the benchmark databases (use a real disk)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmpdir:
+        runs = [("before", "legacy", False)] + [(f"after/{profile}", profile, True) for profile in DB_PROFILES]
+        for label, profile, gated in runs:
+            db_path = os.path.join(tmpdir, f"{label.replace('/', '-')}.db")
+            conn = connect(db_path, profile=profile)
+            init_db(conn)
+            conn.close()
+            _report(label, _time_commands(db_path, profile, args.commands, gated))
+
+
+if __name__ == "__main__":
+    main()
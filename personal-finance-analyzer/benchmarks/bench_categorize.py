@@ -0,0 +1,115 @@
+"""Compare the compiled keyword matcher with the original substring loop.
+
+With --word-rules the synthetic keywords become {"word": ...} rules, and the
+reference is a loop of one precompiled word-boundary regex per rule.
+
+Run from the project root:
+    PYTHONPATH=src python3 benchmarks/bench_categorize.py --rows 1000000
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import re
+import string
+import time
+
+from finance_analyzer.categorization import DEFAULT_RULES, Categorizer
+
+
+def substring_categorize(rules: dict[str, list[str]], description: str, amount: float) -> str:
+    text = description.lower()
+    if amount > 0:
+        return "Income"
+    for category, keywords in rules.items():
+        if category == "Income":
+            continue
+        if any(word in text for word in keywords):
+            return category
+    return "Other"
+
+
+def word_loop_categorizer(rules: dict[str, list]):
+    compiled = [
+        (category, [re.compile(rf"(?<!\w){re.escape(rule['word'])}(?!\w)") for rule in words])
+        for category, words in rules.items()
+        if category != "Income"
+    ]
+
+    def categorize(description: str, amount: float) -> str:
+        text = description.lower()
+        if amount > 0:
+            return "Income"
+        for category, patterns in compiled:
+            if any(pattern.search(text) for pattern in patterns):
+                return category
+        return "Other"
+
+    return categorize
+
+
+def synthetic_rules(extra_keywords: int, rng: random.Random) -> dict[str, list[str]]:
+    rules = {category: list(words) for category, words in DEFAULT_RULES.items()}
+    categories = [category for category in rules if category != "Income"]
+    for _ in range(extra_keywords):
+        word = "".join(rng.choices(string.ascii_lowercase, k=rng.randint(5, 10)))
+        rules[rng.choice(categories)].append(word)
+    return rules
+
+
+def synthetic_descriptions(rows: int, rules: dict[str, list[str]], rng: random.Random) -> list[str]:
+    keywords = [word for words in rules.values() for word in words]
+    noise = ["pos", "purchase", "card", "online", "store", "ach", "debit", "llc", "inc"]
+    out = []
+    for _ in range(rows):
+        parts = rng.choices(noise, k=rng.randint(1, 3))
+        if rng.random() < 0.7:
+            parts.insert(rng.randint(0, len(parts)), rng.choice(keywords))
+        parts.append(f"#{rng.randint(100, 9999)}")
+        out.append(" ".join(parts).upper())
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--keywords", type=int, default=2000, help="Extra synthetic merchant keywords")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--word-rules", action="store_true", help="Benchmark word-boundary rules instead")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    rules = synthetic_rules(args.keywords, rng)
+    descriptions = synthetic_descriptions(args.rows, rules, rng)
+    keyword_count = sum(len(words) for words in rules.values())
+    if args.word_rules:
+        rules = {category: [{"word": word} for word in words] for category, words in rules.items()}
+        reference_categorize = word_loop_categorizer(rules)
+    else:
+        def reference_categorize(description: str, amount: float) -> str:
+            return substring_categorize(rules, description, amount)
+
+    start = time.perf_counter()
+    categorizer = Categorizer(rules=rules)
+    compile_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    compiled = [categorizer.categorize(d, -1.0) for d in descriptions]
+    compiled_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    reference = [reference_categorize(d, -1.0) for d in descriptions]
+    reference_s = time.perf_counter() - start
+
+    if compiled != reference:
+        raise SystemExit("compiled matcher disagrees with the reference loop")
+
+    print(f"rows={args.rows} keywords={keyword_count}")
+    label = "word regex loop:" if args.word_rules else "substring loop:"
+    print(f"{label:<18}{reference_s:8.2f}s")
+    print(f"compiled matcher: {compiled_s:8.2f}s (+{compile_s * 1000:.1f}ms compile)")
+    print(f"speedup:          {reference_s / compiled_s:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Compare the NumPy columnar rollups with the pure-Python aggregator.
+
+Run from the project root (requires numpy):
+    PYTHONPATH=src python3 benchmarks/bench_columnar.py --rows 10000000
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import date, timedelta
+
+import numpy as np
+
+from finance_analyzer.analytics import SpendingAggregator
+from finance_analyzer.columnar import TransactionColumns
+from finance_analyzer.models import Transaction
+
+CATEGORIES = ["Housing", "Groceries", "Dining", "Transport", "Utilities", "Entertainment", "Healthcare", "Other"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    days = rng.integers(0, 5 * 365, size=args.rows)
+    cents = rng.integers(-50_000, 20_000, size=args.rows, dtype=np.int64)
+    codes = rng.integers(0, len(CATEGORIES), size=args.rows, dtype=np.int32)
+    columns = TransactionColumns(
+        dates=np.datetime64("2021-01-01") + days.astype("timedelta64[D]"),
+        cents=cents,
+        category_codes=codes,
+        categories=list(CATEGORIES),
+    )
+
+    start = time.perf_counter()
+    vector_summaries = columns.monthly_summaries()
+    vector_categories = columns.category_spending_by_month()
+    vector_s = time.perf_counter() - start
+
+    origin = date(2021, 1, 1)
+
+    def rows():
+        for day, amount, code in zip(days.tolist(), cents.tolist(), codes.tolist()):
+            yield Transaction(
+                date=origin + timedelta(days=day), description="", amount_cents=amount, category=CATEGORIES[code]
+            )
+
+    # Row construction is timed separately so only the aggregation itself is compared.
+    start = time.perf_counter()
+    for _ in rows():
+        pass
+    build_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    aggregator = SpendingAggregator()
+    for tx in rows():
+        aggregator.add(tx)
+    python_summaries = aggregator.summaries()
+    python_categories = aggregator.categories_by_month()
+    python_s = time.perf_counter() - start - build_s
+
+    if (vector_summaries, vector_categories) != (python_summaries, python_categories):
+        raise SystemExit("columnar rollups disagree with the Python aggregator")
+
+    print(f"rows={args.rows}")
+    print(f"python aggregator: {python_s:8.2f}s")
+    print(f"numpy columnar:    {vector_s:8.2f}s")
+    print(f"speedup:           {python_s / vector_s:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
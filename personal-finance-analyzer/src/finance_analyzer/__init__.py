@@ -5,6 +5,10 @@ __all__ = [
     "budget",
     "categorization",
     "charts",
+    "columnar",
     "csvio",
+    "incremental",
     "models",
+    "pipeline",
+    "store",
 ]
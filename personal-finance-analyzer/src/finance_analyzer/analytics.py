@@ -1,54 +1,208 @@
 from __future__ import annotations
 
 import csv
+from array import array
 from collections import defaultdict
+from datetime import date
+from itertools import islice
 from pathlib import Path
+from typing import Iterable, Iterator
 
-from .models import MonthlySummary, Transaction
+from .models import MonthlySummary, Transaction, TransactionTable, format_cents
 
 
-def assign_categories(transactions: list[Transaction], categorize_fn) -> list[Transaction]:
-    for tx in transactions:
-        tx.category = categorize_fn(tx.description, tx.amount)
-    return transactions
+# Rows handed to categorize_many at a time: duplicates are only found within a batch.
+CATEGORIZE_BATCH_SIZE = 8192
 
 
-def monthly_summaries(transactions: list[Transaction]) -> list[MonthlySummary]:
-    monthly_income: dict[str, float] = defaultdict(float)
-    monthly_expenses: dict[str, float] = defaultdict(float)
+def _batch_categorizer(categorize_fn):
+    """The ``categorize_many`` matching ``categorize_fn``, which may be a categorizer or its ``categorize`` method."""
+    owner = getattr(categorize_fn, "__self__", None)
+    if owner is not None and categorize_fn == getattr(owner, "categorize", None):
+        return getattr(owner, "categorize_many", None)
+    return getattr(categorize_fn, "categorize_many", None)
 
-    for tx in transactions:
+
+def _categorize_one_by_one(categorize_fn):
+    def categorize_many(descriptions: list[str], amounts: list[float]) -> list[str]:
+        return [categorize_fn(description, amount) for description, amount in zip(descriptions, amounts)]
+
+    return categorize_many
+
+
+def assign_categories(transactions: list[Transaction] | TransactionTable, categorize_fn):
+    categorize_many = _batch_categorizer(categorize_fn) or _categorize_one_by_one(categorize_fn)
+    if isinstance(transactions, TransactionTable):
+        _assign_table_categories(transactions, categorize_many)
+        return transactions
+    for start in range(0, len(transactions), CATEGORIZE_BATCH_SIZE):
+        _categorize_batch(transactions[start : start + CATEGORIZE_BATCH_SIZE], categorize_many)
+    return transactions
+
+
+def _categorize_batch(batch: list[Transaction], categorize_many) -> None:
+    categories = categorize_many([tx.description for tx in batch], [tx.amount for tx in batch])
+    for tx, category in zip(batch, categories):
+        tx.category = category
+
+
+def _assign_table_categories(table: TransactionTable, categorize_many) -> None:
+    descriptions = table.descriptions
+    for start in range(0, len(table), CATEGORIZE_BATCH_SIZE):
+        end = start + CATEGORIZE_BATCH_SIZE
+        categories = categorize_many(
+            [descriptions[description_id] for description_id in table.description_ids[start:end]],
+            [cents / 100 for cents in table.amount_cents[start:end]],
+        )
+        table.category_ids[start:end] = array("i", map(table.intern_category, categories))
+
+
+def make_monthly_summary(month: str, income_cents: int, expenses_cents: int) -> MonthlySummary:
+    net_cents = income_cents - expenses_cents
+    savings_rate = round((net_cents / income_cents) if income_cents else 0.0, 4)
+    return MonthlySummary(
+        month=month,
+        income_cents=income_cents,
+        expenses_cents=expenses_cents,
+        savings_rate=savings_rate,
+    )
+
+
+def iter_categorized(transactions: Iterable[Transaction], categorize_fn) -> Iterator[Transaction]:
+    categorize_many = _batch_categorizer(categorize_fn)
+    if categorize_many is None:
+        for tx in transactions:
+            tx.category = categorize_fn(tx.description, tx.amount)
+            yield tx
+        return
+
+    iterator = iter(transactions)
+    while batch := list(islice(iterator, CATEGORIZE_BATCH_SIZE)):
+        _categorize_batch(batch, categorize_many)
+        yield from batch
+
+
+class SpendingAggregator:
+    """Single-pass accumulator for the monthly and per-category rollups.
+
+    Feed it transactions with ``add`` (or pass a stream through ``consume``) and
+    read the finished reports once the stream is exhausted. All totals are
+    integer cents, so partial aggregates merge exactly in any grouping.
+    """
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.monthly_income: dict[str, int] = defaultdict(int)
+        self.monthly_expenses: dict[str, int] = defaultdict(int)
+        self.category_spend: dict[str, dict[str, int]] = {}
+
+    def add(self, tx: Transaction) -> None:
+        self.count += 1
         month = tx.date.strftime("%Y-%m")
-        if tx.amount >= 0:
-            monthly_income[month] += tx.amount
+        cents = tx.amount_cents
+        if cents >= 0:
+            self.monthly_income[month] += cents
         else:
-            monthly_expenses[month] += abs(tx.amount)
+            self.monthly_expenses[month] -= cents
+            by_category = self.category_spend.get(month)
+            if by_category is None:
+                by_category = self.category_spend[month] = defaultdict(int)
+            by_category[tx.category] -= cents
+
+    def add_table(self, table: TransactionTable) -> None:
+        """Same as ``add`` for every row, but working on the table's id columns."""
+        self.count += len(table)
+        months: dict[int, str] = {}
+        spend: dict[tuple[str, int], int] = defaultdict(int)
+        for ordinal, cents, category_id in zip(table.ordinals, table.amount_cents, table.category_ids):
+            month = months.get(ordinal)
+            if month is None:
+                month = months[ordinal] = date.fromordinal(ordinal).strftime("%Y-%m")
+            if cents >= 0:
+                self.monthly_income[month] += cents
+            else:
+                self.monthly_expenses[month] -= cents
+                spend[month, category_id] -= cents
+
+        categories = table.categories
+        for (month, category_id), cents in spend.items():
+            by_category = self.category_spend.get(month)
+            if by_category is None:
+                by_category = self.category_spend[month] = defaultdict(int)
+            by_category[categories[category_id]] += cents
+
+    def merge(self, other: SpendingAggregator) -> None:
+        """Fold another partial aggregate into this one (callers merge in input order)."""
+        self.count += other.count
+        for month, amount in other.monthly_income.items():
+            self.monthly_income[month] += amount
+        for month, amount in other.monthly_expenses.items():
+            self.monthly_expenses[month] += amount
+        for month, categories in other.category_spend.items():
+            by_category = self.category_spend.get(month)
+            if by_category is None:
+                by_category = self.category_spend[month] = defaultdict(int)
+            for category, amount in categories.items():
+                by_category[category] += amount
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "monthly_income": dict(self.monthly_income),
+            "monthly_expenses": dict(self.monthly_expenses),
+            "category_spend": {month: dict(categories) for month, categories in self.category_spend.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, raw: dict) -> SpendingAggregator:
+        aggregator = cls()
+        aggregator.count = raw["count"]
+        aggregator.monthly_income.update(raw["monthly_income"])
+        aggregator.monthly_expenses.update(raw["monthly_expenses"])
+        for month, categories in raw["category_spend"].items():
+            aggregator.category_spend[month] = defaultdict(int, categories)
+        return aggregator
+
+    def consume(self, transactions: Iterable[Transaction]) -> Iterator[Transaction]:
+        for tx in transactions:
+            self.add(tx)
+            yield tx
+
+    def summaries(self) -> list[MonthlySummary]:
+        months = sorted(set(self.monthly_income) | set(self.monthly_expenses))
+        summaries: list[MonthlySummary] = []
+
+        for month in months:
+            summaries.append(
+                make_monthly_summary(month, self.monthly_income.get(month, 0), self.monthly_expenses.get(month, 0))
+            )
 
-    months = sorted(set(monthly_income) | set(monthly_expenses))
-    summaries: list[MonthlySummary] = []
+        return summaries
 
-    for month in months:
-        income = round(monthly_income[month], 2)
-        expenses = round(monthly_expenses[month], 2)
-        net = round(income - expenses, 2)
-        savings_rate = round((net / income) if income else 0.0, 4)
-        summaries.append(MonthlySummary(month=month, income=income, expenses=expenses, net=net, savings_rate=savings_rate))
+    def categories_by_month(self) -> dict[str, dict[str, int]]:
+        """Spend in cents per category, with months and categories sorted."""
+        return {
+            month: dict(sorted(categories.items()))
+            for month, categories in sorted(self.category_spend.items())
+        }
 
-    return summaries
 
+def _aggregate(transactions: Iterable[Transaction] | TransactionTable) -> SpendingAggregator:
+    aggregator = SpendingAggregator()
+    if isinstance(transactions, TransactionTable):
+        aggregator.add_table(transactions)
+        return aggregator
+    for tx in transactions:
+        aggregator.add(tx)
+    return aggregator
 
-def category_spending_by_month(transactions: list[Transaction]) -> dict[str, dict[str, float]]:
-    data: dict[str, dict[str, float]] = defaultdict(lambda: defaultdict(float))
 
-    for tx in transactions:
-        if tx.amount < 0:
-            month = tx.date.strftime("%Y-%m")
-            data[month][tx.category] += abs(tx.amount)
+def monthly_summaries(transactions: Iterable[Transaction] | TransactionTable) -> list[MonthlySummary]:
+    return _aggregate(transactions).summaries()
+
 
-    return {
-        month: {category: round(amount, 2) for category, amount in sorted(categories.items())}
-        for month, categories in sorted(data.items())
-    }
+def category_spending_by_month(transactions: Iterable[Transaction] | TransactionTable) -> dict[str, dict[str, int]]:
+    return _aggregate(transactions).categories_by_month()
 
 
 def write_monthly_summary_csv(path: str | Path, summaries: list[MonthlySummary]) -> None:
@@ -62,15 +216,15 @@ def write_monthly_summary_csv(path: str | Path, summaries: list[MonthlySummary])
             writer.writerow(
                 {
                     "month": summary.month,
-                    "income": f"{summary.income:.2f}",
-                    "expenses": f"{summary.expenses:.2f}",
-                    "net": f"{summary.net:.2f}",
+                    "income": format_cents(summary.income_cents),
+                    "expenses": format_cents(summary.expenses_cents),
+                    "net": format_cents(summary.net_cents),
                     "savings_rate": f"{summary.savings_rate:.4f}",
                 }
             )
 
 
-def write_category_summary_csv(path: str | Path, categories_by_month: dict[str, dict[str, float]]) -> None:
+def write_category_summary_csv(path: str | Path, categories_by_month: dict[str, dict[str, int]]) -> None:
     out = Path(path)
     out.parent.mkdir(parents=True, exist_ok=True)
 
@@ -79,4 +233,4 @@ def write_category_summary_csv(path: str | Path, categories_by_month: dict[str,
         writer.writeheader()
         for month, categories in categories_by_month.items():
             for category, spend in categories.items():
-                writer.writerow({"month": month, "category": category, "spend": f"{spend:.2f}"})
+                writer.writerow({"month": month, "category": category, "spend": format_cents(spend)})
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 
-from .models import MonthlySummary
+from .models import MonthlySummary, format_cents
 
 
 @dataclass(slots=True)
@@ -13,7 +13,7 @@ class BudgetConfig:
 
 def generate_budget_alerts(
     summaries: list[MonthlySummary],
-    categories_by_month: dict[str, dict[str, float]],
+    categories_by_month: dict[str, dict[str, int]],
     budget: BudgetConfig,
 ) -> list[str]:
     if not summaries:
@@ -23,19 +23,23 @@ def generate_budget_alerts(
     latest_categories = categories_by_month.get(latest.month, {})
     alerts: list[str] = []
 
-    if budget.monthly_spending_limit is not None and latest.expenses > budget.monthly_spending_limit:
-        delta = latest.expenses - budget.monthly_spending_limit
-        alerts.append(
-            f"ALERT: Total spending for {latest.month} is ${latest.expenses:.2f}, "
-            f"which is ${delta:.2f} above your ${budget.monthly_spending_limit:.2f} budget."
-        )
+    # Limits come from the config in dollars; compare in cents.
+    if budget.monthly_spending_limit is not None:
+        limit_cents = round(budget.monthly_spending_limit * 100)
+        if latest.expenses_cents > limit_cents:
+            alerts.append(
+                f"ALERT: Total spending for {latest.month} is ${format_cents(latest.expenses_cents)}, "
+                f"which is ${format_cents(latest.expenses_cents - limit_cents)} above your "
+                f"${format_cents(limit_cents)} budget."
+            )
 
     for category, limit in budget.category_limits.items():
-        spent = latest_categories.get(category, 0.0)
-        if spent > limit:
+        limit_cents = round(limit * 100)
+        spent_cents = latest_categories.get(category, 0)
+        if spent_cents > limit_cents:
             alerts.append(
-                f"ALERT: {category} spending for {latest.month} is ${spent:.2f}, "
-                f"which is ${(spent - limit):.2f} above your ${limit:.2f} budget."
+                f"ALERT: {category} spending for {latest.month} is ${format_cents(spent_cents)}, "
+                f"which is ${format_cents(spent_cents - limit_cents)} above your ${format_cents(limit_cents)} budget."
             )
 
     if latest.savings_rate < 0.2:
@@ -1,6 +1,13 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import hashlib
+import json
+import re
+import sys
+from bisect import bisect_right
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Sequence
 
 
 DEFAULT_RULES: dict[str, list[str]] = {
@@ -14,26 +21,378 @@ DEFAULT_RULES: dict[str, list[str]] = {
     "Income": ["payroll", "salary", "direct deposit", "bonus", "refund"],
 }
 
+# Store numbers, dates and reference IDs are digit runs; collapsing each run to "#"
+# lets "SHELL #1042" and "SHELL #2210" share one cache entry.
+_DIGIT_RUN = re.compile(r"\d+")
+
+# A category rule is a plain substring keyword or an object such as {"word": "att"},
+# {"regex": "^sq \\*"} or {"merchant": "Uber Eats", "max_amount": 80}.
+Rule = str | dict[str, object]
+RULE_KINDS = ("keyword", "word", "regex", "merchant")
+_NO_LIMIT = sys.maxsize
+
+
+def _normalize_merchant(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+def _parse_rule(category: str, rule: Rule) -> tuple[str, str, int, int]:
+    """Return (kind, value, low, high) with the amount range in cents of spend, inclusive."""
+    if isinstance(rule, str):
+        return "keyword", rule.lower(), 0, _NO_LIMIT
+    if not isinstance(rule, dict):
+        raise ValueError(f"Rule for {category!r} must be a string or an object, got {rule!r}")
+    kinds = [kind for kind in RULE_KINDS if kind in rule]
+    unknown = set(rule) - set(RULE_KINDS) - {"min_amount", "max_amount"}
+    if len(kinds) != 1 or unknown or not isinstance(rule[kinds[0]], str):
+        raise ValueError(f"Rule {rule!r} for {category!r} needs exactly one of: {', '.join(RULE_KINDS)}")
+    kind = kinds[0]
+    value = rule[kind]
+    if kind == "regex":
+        try:
+            re.compile(value)
+        except re.error as exc:
+            raise ValueError(f"Invalid regex rule {value!r} for {category!r}: {exc}") from None
+    elif kind == "merchant":
+        value = _normalize_merchant(value)
+    else:
+        value = value.lower()
+
+    # Ranges are written in dollars of spend (the absolute amount) and compared in cents.
+    bounds = [rule[name] for name in ("min_amount", "max_amount") if name in rule]
+    if not all(isinstance(bound, (int, float)) and not isinstance(bound, bool) for bound in bounds):
+        raise ValueError(f"Rule {rule!r} for {category!r} has an invalid amount range")
+    low = round(rule.get("min_amount", 0) * 100)
+    high = round(rule["max_amount"] * 100) if "max_amount" in rule else _NO_LIMIT
+    if low < 0 or high < low:
+        raise ValueError(f"Rule {rule!r} for {category!r} has an invalid amount range")
+    return kind, value, low, high
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """Alternation of literal words factored into a trie.
+
+    ``re`` tries alternatives one after another, so a flat "a|b|c|..." over
+    hundreds of words costs one attempt per word at every position; the trie
+    form costs about one attempt per character of the text instead.
+    """
+    trie: dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node: dict[str, dict]) -> str:
+        branches = [re.escape(ch) + build(child) for ch, child in node.items() if ch]
+        if not branches:
+            return ""
+        pattern = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{pattern})?" if "" in node else pattern
+
+    return build(trie)
+
+
+def _tier_patterns(words: list[str], keywords: list[str], regexes: list[str]) -> list[re.Pattern[str]]:
+    # Literal words and keywords share one trie alternation. Each regex is compiled on its
+    # own, so group names, backreference numbers and leading (?i)-style flags behave as written.
+    sources = []
+    if words:
+        # Word rules must not touch another letter or digit on either side: "att" skips "Seattle".
+        sources.append(rf"(?<!\w){_trie_pattern(words)}(?!\w)")
+    if keywords:
+        sources.append(_trie_pattern(keywords))
+    try:
+        patterns = [re.compile("|".join(sources), re.IGNORECASE)] if sources else []
+        patterns.extend(re.compile(source, re.IGNORECASE) for source in regexes)
+    except re.error as exc:
+        raise ValueError(f"Invalid category rules: {exc}") from None
+    return patterns
+
+
+def rules_fingerprint(rules: dict[str, list[Rule]]) -> str:
+    """Stable digest of a rule set; rule order is significant so it is preserved."""
+    return hashlib.sha1(json.dumps(rules).encode("utf-8")).hexdigest()
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton that finds the best-priority keyword in one pass.
+
+    Each keyword carries an integer priority (lower wins). ``best_priority``
+    returns the lowest priority of any keyword occurring as a substring of the
+    text, or ``no_match`` when none does.
+    """
+
+    __slots__ = ("_goto", "_fail", "_best", "no_match")
+
+    def __init__(self, keywords: Iterable[tuple[str, int]], no_match: int):
+        self.no_match = no_match
+        goto: list[dict[str, int]] = [{}]
+        best: list[int] = [no_match]
+
+        for keyword, priority in keywords:
+            state = 0
+            for ch in keyword:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    best.append(no_match)
+                state = nxt
+            best[state] = min(best[state], priority)
+
+        # Breadth-first pass so every fail target is resolved before its dependents.
+        fail = [0] * len(goto)
+        queue: deque[int] = deque()
+        for nxt in goto[0].values():
+            best[nxt] = min(best[nxt], best[0])
+            queue.append(nxt)
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in goto[state].items():
+                target = fail[state]
+                while target and ch not in goto[target]:
+                    target = fail[target]
+                fail[nxt] = goto[target].get(ch, 0)
+                # Fold the fail chain's outputs in so the scan needs a single lookup per state.
+                best[nxt] = min(best[nxt], best[fail[nxt]])
+                queue.append(nxt)
+
+        self._goto = goto
+        self._fail = fail
+        self._best = best
+
+    def best_priority(self, text: str) -> int:
+        goto, fail, best = self._goto, self._fail, self._best
+        found = best[0]
+        state = 0
+        for ch in text:
+            if found == 0:
+                break
+            nxt = goto[state].get(ch)
+            while nxt is None and state:
+                state = fail[state]
+                nxt = goto[state].get(ch)
+            state = nxt or 0
+            if best[state] < found:
+                found = best[state]
+        return found
+
 
 @dataclass(slots=True)
 class Categorizer:
-    rules: dict[str, list[str]]
+    """Compiled ``category_rules``; categories earlier in the rules win over later ones.
 
-    def categorize(self, description: str, amount: float) -> str:
+    Precedence: positive amounts are always Income; otherwise an exact merchant
+    rule (one dict lookup on the whole description) wins; otherwise the
+    first category in rule order with any matching keyword, word or regex rule.
+    Plain keywords share one Aho-Corasick scan. Each category's word rules (and
+    ranged keywords) with the same amount range are compiled into one alternation;
+    regex rules keep a pattern each.
+    """
+
+    rules: dict[str, list[Rule]]
+    _labels: list[str] = field(init=False, repr=False, compare=False)
+    _matcher: KeywordMatcher = field(init=False, repr=False, compare=False)
+    _merchants: dict[str, list[tuple[int, int, int]]] = field(init=False, repr=False, compare=False)
+    _patterns: list[tuple[int, int, int, re.Pattern[str]]] = field(init=False, repr=False, compare=False)
+    _amount_edges: list[int] = field(init=False, repr=False, compare=False)
+    fingerprint: str = field(init=False, repr=False, compare=False)
+    digit_insensitive: bool = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self._compile()
+
+    def update_rules(self, rules: dict[str, list[Rule]]) -> None:
+        self.rules = rules
+        self._compile()
+
+    def _compile(self) -> None:
+        # Rule order is priority order; Income is handled by the amount sign instead.
+        categories = [category for category in self.rules if category != "Income"]
+        keywords: list[tuple[str, int]] = []
+        merchants: dict[str, list[tuple[int, int, int]]] = {}
+        # (priority, low, high) -> word, keyword and regex rules compiled together as one tier.
+        patterns: dict[tuple[int, int, int], dict[str, list[str]]] = {}
+        edges: set[int] = set()
+        # A keyword or merchant without digits or "#" can never straddle a digit run, so
+        # collapsing runs to "#" cannot change what matches. Word boundaries and regexes can.
+        digit_insensitive = True
+
+        for priority, category in enumerate(categories):
+            for rule in self.rules[category]:
+                kind, value, low, high = _parse_rule(category, rule)
+                if (low, high) != (0, _NO_LIMIT):
+                    edges.update((low, high + 1))
+                if kind in ("word", "regex") or "#" in value or _DIGIT_RUN.search(value):
+                    digit_insensitive = False
+
+                if kind == "merchant":
+                    merchants.setdefault(value, []).append((priority, low, high))
+                elif kind == "keyword" and (low, high) == (0, _NO_LIMIT):
+                    keywords.append((value, priority))
+                else:
+                    tier = patterns.setdefault((priority, low, high), {"word": [], "keyword": [], "regex": []})
+                    tier[kind].append(value)
+
+        self._labels = categories + ["Other"]
+        self._matcher = KeywordMatcher(keywords, no_match=len(categories))
+        self._merchants = merchants
+        # Insertion order is already priority order.
+        self._patterns = [
+            (priority, low, high, pattern)
+            for (priority, low, high), tier in patterns.items()
+            for pattern in _tier_patterns(tier["word"], tier["keyword"], tier["regex"])
+        ]
+        self._amount_edges = sorted(edges)
+        self.fingerprint = rules_fingerprint(self.rules)
+        self.digit_insensitive = digit_insensitive
+
+    def cache_key(self, description: str, amount: float) -> tuple[str, bool, int]:
+        """Normalized description, amount sign and amount bucket; equal keys always categorize the same.
+
+        The bucket is 0 unless some rule has an amount range, in which case it
+        identifies the span between range boundaries that the spend falls into.
+        """
         text = description.lower()
+        if self.digit_insensitive:
+            text = _DIGIT_RUN.sub("#", text)
+        bucket = bisect_right(self._amount_edges, round(abs(amount) * 100)) if self._amount_edges else 0
+        return text, amount > 0, bucket
 
+    def categorize(self, description: str, amount: float) -> str:
         # Positive amounts are usually income/refunds.
         if amount > 0:
-            if any(key in text for key in self.rules.get("Income", [])):
-                return "Income"
             return "Income"
 
-        for category, keywords in self.rules.items():
-            if category == "Income":
-                continue
-            if any(word in text for word in keywords):
-                return category
-        return "Other"
+        text = description.lower()
+        spend = round(-amount * 100)
+        if self._merchants:
+            for priority, low, high in self._merchants.get(_normalize_merchant(text), ()):
+                if low <= spend <= high:
+                    return self._labels[priority]
+
+        best = self._matcher.best_priority(text)
+        for priority, low, high, pattern in self._patterns:
+            if priority >= best:
+                break
+            if low <= spend <= high and pattern.search(text):
+                return self._labels[priority]
+        return self._labels[best]
+
+    def categorize_many(self, descriptions: Sequence[str], amounts: Sequence[float]) -> list[str]:
+        """Same as ``categorize`` per pair, but each distinct description is only matched once."""
+        return _categorize_unique(self, self.categorize, descriptions, amounts)[0]
+
+
+def _categorize_unique(
+    categorizer: Categorizer,
+    categorize: Callable[[str, float], str],
+    descriptions: Sequence[str],
+    amounts: Sequence[float],
+) -> tuple[list[str], int]:
+    """Categorize a batch with one ``categorize`` call per distinct key; return the results and that count.
+
+    The key is cheaper than ``cache_key``: the raw description for spending (plus the
+    amount bucket when rules have ranges), and one shared key for every positive amount.
+    """
+    edges = categorizer._amount_edges
+    seen: dict[object, str] = {}
+    results: list[str] = []
+    append = results.append
+    for description, amount in zip(descriptions, amounts, strict=True):
+        if amount > 0:
+            key = True
+        elif edges:
+            key = (description, bisect_right(edges, round(-amount * 100)))
+        else:
+            key = description
+        category = seen.get(key)
+        if category is None:
+            category = seen[key] = categorize(description, amount)
+        append(category)
+    return results, len(seen)
+
+
+@dataclass(slots=True)
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    # Rows categorized through categorize_many, and how many distinct keys those batches held.
+    batch_rows: int = 0
+    batch_unique: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    @property
+    def unique_ratio(self) -> float:
+        return self.batch_unique / self.batch_rows if self.batch_rows else 0.0
+
+
+class CachedCategorizer:
+    """Bounded LRU cache in front of a Categorizer, keyed by ``Categorizer.cache_key``.
+
+    The cache is dropped automatically whenever the wrapped categorizer's rules
+    fingerprint changes (for example after ``update_rules`` with a reloaded config).
+    """
+
+    def __init__(self, categorizer: Categorizer, maxsize: int = 65536):
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.categorizer = categorizer
+        self.maxsize = maxsize
+        self.stats = CacheStats()
+        self._entries: OrderedDict[tuple[str, bool, int], str] = OrderedDict()
+        self._fingerprint = categorizer.fingerprint
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._fingerprint = self.categorizer.fingerprint
+
+    def update_rules(self, rules: dict[str, list[Rule]]) -> None:
+        if rules_fingerprint(rules) != self._fingerprint:
+            self.categorizer.update_rules(rules)
+            self.clear()
+
+    def categorize(self, description: str, amount: float) -> str:
+        if self.categorizer.fingerprint != self._fingerprint:
+            self.clear()
+
+        key = self.categorizer.cache_key(description, amount)
+        entries = self._entries
+        category = entries.get(key)
+        if category is not None:
+            entries.move_to_end(key)
+            self.stats.hits += 1
+            return category
+
+        self.stats.misses += 1
+        # Categorize the normalized text so the cached value never depends on which raw variant came first.
+        category = self.categorizer.categorize(key[0], amount)
+        entries[key] = category
+        if len(entries) > self.maxsize:
+            entries.popitem(last=False)
+            self.stats.evictions += 1
+        return category
+
+    def categorize_many(self, descriptions: Sequence[str], amounts: Sequence[float]) -> list[str]:
+        """Batch form of ``categorize``: duplicates within the batch skip the cache lookup.
+
+        Each skipped duplicate still counts as a hit, so ``stats`` reads the same as row-by-row calls.
+        """
+        results, unique = _categorize_unique(self.categorizer, self.categorize, descriptions, amounts)
+        self.stats.hits += len(results) - unique
+        self.stats.batch_rows += len(results)
+        self.stats.batch_unique += unique
+        return results
 
 
 def build_default_categorizer() -> Categorizer:
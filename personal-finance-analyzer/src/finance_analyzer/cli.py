@@ -1,20 +1,19 @@
 from __future__ import annotations
 
 import argparse
+import os
+import time
 from pathlib import Path
 
-from .analytics import (
-    assign_categories,
-    category_spending_by_month,
-    monthly_summaries,
-    write_category_summary_csv,
-    write_monthly_summary_csv,
-)
+from .analytics import write_category_summary_csv, write_monthly_summary_csv
 from .budget import generate_budget_alerts
-from .categorization import Categorizer
 from .charts import write_category_bar_svg, write_spending_trend_svg
 from .config import load_config, write_default_config
-from .csvio import load_transactions, save_transactions_csv
+from .csvio import iter_transactions_parallel
+from .incremental import analyze_incremental, discard_state, write_if_changed
+from .models import format_cents
+from .pipeline import analyze_files, analyze_store, expand_inputs
+from .store import write_store
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -29,9 +28,36 @@ def build_parser() -> argparse.ArgumentParser:
     init.add_argument("--output", default="finance_config.json")
 
     analyze = sub.add_parser("analyze", help="Run full analysis from input CSV")
-    analyze.add_argument("--input", required=True, help="Path to bank CSV file")
+    source = analyze.add_mutually_exclusive_group(required=True)
+    source.add_argument(
+        "--input",
+        nargs="+",
+        help="Bank CSV files, directories of CSVs, or glob patterns",
+    )
+    source.add_argument("--store", help="Transaction store written by 'ingest' (skips CSV parsing)")
     analyze.add_argument("--output-dir", default="reports", help="Directory for generated reports")
     analyze.add_argument("--config", default=None, help="JSON config with budget limits and category rules")
+    analyze.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes for multi-file input (default: one per CPU, capped at the file count)",
+    )
+    analyze.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Keep per-file state in the output dir and only re-process new or changed inputs",
+    )
+
+    ingest = sub.add_parser("ingest", help="Convert bank CSVs into a binary transaction store for repeated analyses")
+    ingest.add_argument("--input", required=True, nargs="+", help="Bank CSV files, directories of CSVs, or glob patterns")
+    ingest.add_argument("--output", required=True, help="Store file to write")
+    ingest.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes for parsing large files (default: one per CPU)",
+    )
 
     return parser
 
@@ -47,8 +73,8 @@ def _build_markdown_report(
     if summaries:
         latest = summaries[-1]
         headline = (
-            f"Latest month: {latest.month} | Income: ${latest.income:.2f} | "
-            f"Expenses: ${latest.expenses:.2f} | Net: ${latest.net:.2f} | "
+            f"Latest month: {latest.month} | Income: ${format_cents(latest.income_cents)} | "
+            f"Expenses: ${format_cents(latest.expenses_cents)} | Net: ${format_cents(latest.net_cents)} | "
             f"Savings Rate: {latest.savings_rate:.1%}"
         )
     else:
@@ -85,44 +111,97 @@ def _build_markdown_report(
     out_path.write_text("\n".join(lines), encoding="utf-8")
 
 
-def cmd_analyze(input_path: str, output_dir: str, config_path: str | None) -> int:
+def cmd_analyze(
+    input_path: str | list[str],
+    output_dir: str,
+    config_path: str | None,
+    workers: int | None = None,
+    incremental: bool = False,
+    store_path: str | None = None,
+) -> int:
     budget, rules = load_config(config_path)
-    categorizer = Categorizer(rules=rules)
-
-    transactions = load_transactions(input_path)
-    assign_categories(transactions, categorizer.categorize)
-
-    summaries = monthly_summaries(transactions)
-    categories = category_spending_by_month(transactions)
-    alerts = generate_budget_alerts(summaries, categories, budget)
-
     out = Path(output_dir)
     out.mkdir(parents=True, exist_ok=True)
+    if not incremental:
+        discard_state(out)
+
+    if store_path is not None:
+        if incremental:
+            raise ValueError("--incremental applies to CSV inputs, not --store")
+        inputs = [Path(store_path)]
+        result = analyze_store(store_path, rules, out / "normalized_transactions.csv")
+    else:
+        inputs = expand_inputs([input_path] if isinstance(input_path, str) else input_path)
+        if workers is None:
+            workers = min(len(inputs), os.cpu_count() or 1)
+        if incremental:
+            result = analyze_incremental(inputs, rules, budget, out, workers=workers)
+        else:
+            result = analyze_files(inputs, rules, out / "normalized_transactions.csv", workers=workers)
+    aggregator = result.aggregator
+
+    summaries = aggregator.summaries()
+    categories = aggregator.categories_by_month()
+    alerts = generate_budget_alerts(summaries, categories, budget)
 
-    save_transactions_csv(out / "normalized_transactions.csv", transactions)
-    write_monthly_summary_csv(out / "monthly_summary.csv", summaries)
-    write_category_summary_csv(out / "category_summary.csv", categories)
+    monthly_chart = "monthly_spending_trend.svg"
+    category_chart = "latest_month_category_spending.svg"
 
-    latest_month = summaries[-1].month if summaries else None
-    latest_categories = categories.get(latest_month, {}) if latest_month else {}
+    def write_report(name: str, write) -> None:
+        # Incremental runs leave a report untouched, mtime included, when its content is unchanged.
+        if incremental:
+            if write_if_changed(out / name, write):
+                result.rewritten.append(name)
+        else:
+            write(out / name)
 
-    monthly_series = [(summary.month, summary.expenses) for summary in summaries]
+    if result.data_changed:
+        write_report("monthly_summary.csv", lambda path: write_monthly_summary_csv(path, summaries))
+        write_report("category_summary.csv", lambda path: write_category_summary_csv(path, categories))
 
-    monthly_chart = "monthly_spending_trend.svg"
-    category_chart = "latest_month_category_spending.svg"
-    write_spending_trend_svg(out / monthly_chart, monthly_series)
-    write_category_bar_svg(out / category_chart, latest_categories, "Latest Month Category Spending")
+        latest_month = summaries[-1].month if summaries else None
+        latest_categories = categories.get(latest_month, {}) if latest_month else {}
+        latest_spending = {category: cents / 100 for category, cents in latest_categories.items()}
+
+        monthly_series = [(summary.month, summary.expenses) for summary in summaries]
 
-    (out / "budget_alerts.txt").write_text("\n".join(alerts) + "\n", encoding="utf-8")
-    _build_markdown_report(out / "report.md", summaries, categories, alerts, monthly_chart, category_chart)
+        write_report(monthly_chart, lambda path: write_spending_trend_svg(path, monthly_series))
+        write_report(
+            category_chart,
+            lambda path: write_category_bar_svg(path, latest_spending, "Latest Month Category Spending"),
+        )
 
-    print(f"Analyzed {len(transactions)} transactions")
-    print(f"Generated reports in: {out.resolve()}")
+    if result.data_changed or result.budget_changed:
+        write_report("budget_alerts.txt", lambda path: path.write_text("\n".join(alerts) + "\n", encoding="utf-8"))
+        write_report(
+            "report.md",
+            lambda path: _build_markdown_report(path, summaries, categories, alerts, monthly_chart, category_chart),
+        )
+
+    print(f"Analyzed {aggregator.count} transactions from {len(inputs)} file(s)")
+    if not incremental:
+        print(f"Generated reports in: {out.resolve()}")
+    else:
+        print(f"Re-processed {result.processed} of {len(inputs)} file(s)")
+        if result.rewritten:
+            print(f"Regenerated {', '.join(result.rewritten)} in: {out.resolve()}")
+        else:
+            print(f"Reports in {out.resolve()} are up to date")
+    cache = result.cache_stats
+    print(
+        f"Categorization cache: {cache.hits} hits, {cache.misses} misses, "
+        f"{cache.evictions} evictions ({cache.hit_rate:.1%} hit rate)"
+    )
+    if cache.batch_rows:
+        print(
+            f"Categorized {cache.batch_rows} rows as {cache.batch_unique} unique descriptions "
+            f"({cache.unique_ratio:.1%} unique)"
+        )
     if summaries:
         latest = summaries[-1]
         print(
-            f"Latest month {latest.month}: expenses=${latest.expenses:.2f}, "
-            f"net=${latest.net:.2f}, savings_rate={latest.savings_rate:.1%}"
+            f"Latest month {latest.month}: expenses=${format_cents(latest.expenses_cents)}, "
+            f"net=${format_cents(latest.net_cents)}, savings_rate={latest.savings_rate:.1%}"
         )
     for alert in alerts:
         print(alert)
@@ -130,6 +209,17 @@ def cmd_analyze(input_path: str, output_dir: str, config_path: str | None) -> in
     return 0
 
 
+def cmd_ingest(input_path: str | list[str], output_path: str, workers: int | None = None) -> int:
+    inputs = expand_inputs([input_path] if isinstance(input_path, str) else input_path)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    started = time.perf_counter()
+    rows = write_store(output_path, (tx for path in inputs for tx in iter_transactions_parallel(path, workers)))
+    elapsed = time.perf_counter() - started
+    print(f"Ingested {rows} transactions from {len(inputs)} file(s) into {output_path} in {elapsed:.2f}s")
+    return 0
+
+
 def main(argv: list[str] | None = None) -> int:
     parser = build_parser()
     args = parser.parse_args(argv)
@@ -140,7 +230,10 @@ def main(argv: list[str] | None = None) -> int:
         return 0
 
     if args.command == "analyze":
-        return cmd_analyze(args.input, args.output_dir, args.config)
+        return cmd_analyze(args.input, args.output_dir, args.config, args.workers, args.incremental, args.store)
+
+    if args.command == "ingest":
+        return cmd_ingest(args.input, args.output, args.workers)
 
     parser.print_help()
     return 1
@@ -0,0 +1,132 @@
+"""Optional NumPy columnar backend for the monthly and category rollups.
+
+Transactions are held as parallel arrays (datetime64 dates, int64 cents and
+categorical codes) so the rollups become vectorized ``bincount`` group-bys.
+The results match ``analytics.monthly_summaries`` and
+``analytics.category_spending_by_month``.
+"""
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass
+from typing import Iterable
+
+from .analytics import make_monthly_summary
+from .models import MonthlySummary, Transaction, TransactionTable
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy installed
+    np = None
+
+# date.toordinal() of 1970-01-01, the datetime64 epoch.
+_EPOCH_ORDINAL = 719163
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise RuntimeError("The columnar backend requires numpy (pip install 'personal-finance-analyzer[columnar]')")
+
+
+@dataclass(slots=True)
+class TransactionColumns:
+    dates: "np.ndarray"
+    cents: "np.ndarray"
+    category_codes: "np.ndarray"
+    categories: list[str]
+
+    def __len__(self) -> int:
+        return len(self.cents)
+
+    @classmethod
+    def from_transactions(cls, transactions: Iterable[Transaction]) -> TransactionColumns:
+        _require_numpy()
+        ordinals = array("i")
+        cents = array("q")
+        codes = array("i")
+        category_codes: dict[str, int] = {}
+
+        for tx in transactions:
+            ordinals.append(tx.date.toordinal() - _EPOCH_ORDINAL)
+            cents.append(tx.amount_cents)
+            code = category_codes.get(tx.category)
+            if code is None:
+                code = category_codes[tx.category] = len(category_codes)
+            codes.append(code)
+
+        return cls(
+            dates=np.frombuffer(ordinals, dtype=np.int32).astype("datetime64[D]"),
+            cents=np.frombuffer(cents, dtype=np.int64),
+            category_codes=np.frombuffer(codes, dtype=np.int32),
+            categories=list(category_codes),
+        )
+
+    @classmethod
+    def from_table(cls, table: TransactionTable) -> TransactionColumns:
+        """Wrap a table's columns; only the dates are converted, the cents and codes are copied as-is."""
+        _require_numpy()
+        ordinals = np.frombuffer(table.ordinals, dtype=np.int32) - _EPOCH_ORDINAL
+        return cls(
+            dates=ordinals.astype("datetime64[D]"),
+            cents=np.array(table.amount_cents, dtype=np.int64),
+            category_codes=np.array(table.category_ids, dtype=np.int32),
+            categories=list(table.categories),
+        )
+
+    def _month_offsets(self) -> tuple["np.ndarray", int, int]:
+        months = self.dates.astype("datetime64[M]").astype(np.int64)
+        first = int(months.min())
+        span = int(months.max()) - first + 1
+        return months - first, first, span
+
+    @staticmethod
+    def _month_label(month_index: int) -> str:
+        return str(np.datetime64(int(month_index), "M"))
+
+    def monthly_summaries(self) -> list[MonthlySummary]:
+        if not len(self):
+            return []
+        offsets, first, span = self._month_offsets()
+        income_mask = self.cents >= 0
+
+        # Float weights are exact for integer cent totals below 2**53.
+        income = np.bincount(offsets, weights=np.where(income_mask, self.cents, 0), minlength=span)
+        expenses = np.bincount(offsets, weights=np.where(income_mask, 0, -self.cents), minlength=span)
+        present = np.bincount(offsets, minlength=span)
+
+        return [
+            make_monthly_summary(
+                self._month_label(first + i),
+                int(income[i]),
+                int(expenses[i]),
+            )
+            for i in np.flatnonzero(present)
+        ]
+
+    def category_spending_by_month(self) -> dict[str, dict[str, int]]:
+        spend_mask = self.cents < 0
+        if not spend_mask.any():
+            return {}
+        offsets, first, span = self._month_offsets()
+        width = len(self.categories)
+        keys = offsets[spend_mask] * width + self.category_codes[spend_mask]
+
+        totals = np.bincount(keys, weights=-self.cents[spend_mask], minlength=span * width).reshape(span, width)
+        counts = np.bincount(keys, minlength=span * width).reshape(span, width)
+        by_name = sorted(range(width), key=self.categories.__getitem__)
+
+        result: dict[str, dict[str, int]] = {}
+        for i in np.flatnonzero(counts.any(axis=1)):
+            row_totals, row_counts = totals[i], counts[i]
+            result[self._month_label(first + i)] = {
+                self.categories[code]: int(row_totals[code]) for code in by_name if row_counts[code]
+            }
+        return result
+
+
+def monthly_summaries(transactions: Iterable[Transaction]) -> list[MonthlySummary]:
+    return TransactionColumns.from_transactions(transactions).monthly_summaries()
+
+
+def category_spending_by_month(transactions: Iterable[Transaction]) -> dict[str, dict[str, int]]:
+    return TransactionColumns.from_transactions(transactions).category_spending_by_month()
@@ -1,10 +1,16 @@
 from __future__ import annotations
 
 import csv
-from datetime import datetime
+import io
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import ROUND_HALF_EVEN, Decimal, InvalidOperation
+from itertools import chain, islice
 from pathlib import Path
+from typing import BinaryIO, Callable, Iterable, Iterator
 
-from .models import Transaction
+from .models import Transaction, TransactionTable, format_cents
 
 DATE_ALIASES = {"date", "transaction date", "posted date"}
 DESCRIPTION_ALIASES = {"description", "merchant", "name", "details"}
@@ -12,6 +18,16 @@ AMOUNT_ALIASES = {"amount", "transaction amount"}
 DEBIT_ALIASES = {"debit", "withdrawal"}
 CREDIT_ALIASES = {"credit", "deposit"}
 
+_CENT = Decimal("0.01")
+
+# Rows inspected to pick a date fast path, and the cap on memoized date strings.
+DATE_SNIFF_ROWS = 50
+DATE_MEMO_LIMIT = 100_000
+
+# Target size of one parallel parse chunk, and the read size while scanning for boundaries.
+PARSE_CHUNK_BYTES = 32 * 1024 * 1024
+SCAN_BLOCK_BYTES = 1024 * 1024
+
 
 def _clean_header(value: str) -> str:
     return value.strip().lower()
@@ -24,13 +40,24 @@ def _pick_column(headers: list[str], aliases: set[str]) -> str | None:
     return None
 
 
-def _parse_float(value: str | None) -> float:
+def _parse_cents(value: str | None) -> int:
     if not value:
-        return 0.0
+        return 0
     cleaned = value.replace(",", "").replace("$", "").strip()
     if cleaned.startswith("(") and cleaned.endswith(")"):
         cleaned = f"-{cleaned[1:-1]}"
-    return float(cleaned)
+
+    # Fast path for plain [-+]digits[.dd]; anything else goes through Decimal.
+    digits = cleaned[1:] if cleaned[:1] in "-+" else cleaned
+    whole, _, frac = digits.partition(".")
+    if len(frac) <= 2 and (whole or frac) and (not whole or whole.isdigit()) and (not frac or frac.isdigit()):
+        cents = int(whole or 0) * 100 + int(frac.ljust(2, "0") or 0)
+        return -cents if cleaned[:1] == "-" else cents
+
+    try:
+        return int(Decimal(cleaned).quantize(_CENT, rounding=ROUND_HALF_EVEN) * 100)
+    except InvalidOperation:
+        raise ValueError(f"Unsupported amount: {value}") from None
 
 
 def _parse_date(value: str) -> datetime.date:
@@ -43,55 +70,332 @@ def _parse_date(value: str) -> datetime.date:
     raise ValueError(f"Unsupported date format: {value}")
 
 
-def load_transactions(csv_path: str | Path) -> list[Transaction]:
+def _fast_iso_date(value: str) -> date | None:
+    # Fixed-width YYYY-MM-DD by slicing; anything else goes to strptime.
+    if len(value) != 10 or value[4] != "-" or value[7] != "-":
+        return None
+    year, month, day = value[:4], value[5:7], value[8:]
+    if not (year.isdigit() and month.isdigit() and day.isdigit()):
+        return None
+    return date(int(year), int(month), int(day))
+
+
+def _fast_us_date(value: str) -> date | None:
+    # M/D/YYYY or M/D/YY with the same two-digit year pivot as strptime's %y.
+    parts = value.split("/")
+    if len(parts) != 3:
+        return None
+    month, day, year = parts
+    if not (0 < len(month) <= 2 and 0 < len(day) <= 2 and len(year) in (2, 4)):
+        return None
+    if not (month.isdigit() and day.isdigit() and year.isdigit()):
+        return None
+    full_year = int(year)
+    if len(year) == 2:
+        full_year += 1900 if full_year >= 69 else 2000
+    return date(full_year, int(month), int(day))
+
+
+_FAST_DATE_PARSERS: tuple[Callable[[str], date | None], ...] = (_fast_iso_date, _fast_us_date)
+
+
+def _try_fast(parser: Callable[[str], date | None], value: str) -> date | None:
+    try:
+        return parser(value)
+    except ValueError:
+        return None
+
+
+class DateParser:
+    """Date parser for one CSV column.
+
+    The fast path is sniffed once from sample values; parsed values are
+    memoized because bank exports repeat the same dates on many rows. Values
+    the fast path rejects fall back to ``_parse_date``.
+    """
+
+    def __init__(self, samples: Iterable[str] = ()):
+        self._memo: dict[str, date] = {}
+        self._fast: Callable[[str], date | None] | None = None
+
+        values = [value.strip() for value in samples]
+        best_hits = 0
+        for parser in _FAST_DATE_PARSERS:
+            hits = sum(1 for value in values if _try_fast(parser, value) is not None)
+            if hits > best_hits:
+                self._fast, best_hits = parser, hits
+
+    def __call__(self, value: str) -> date:
+        parsed = self._memo.get(value)
+        if parsed is not None:
+            return parsed
+
+        parsed = _try_fast(self._fast, value.strip()) if self._fast else None
+        if parsed is None:
+            parsed = _parse_date(value)
+        if len(self._memo) < DATE_MEMO_LIMIT:
+            self._memo[value] = parsed
+        return parsed
+
+
+@dataclass(slots=True, frozen=True)
+class CsvLayout:
+    """Column positions resolved once from the header row, so rows can be read positionally."""
+    date_index: int
+    description_index: int
+    amount_index: int | None = None
+    debit_index: int | None = None
+    credit_index: int | None = None
+
+    @classmethod
+    def from_headers(cls, headers: list[str]) -> CsvLayout:
+        date_index = _column_index(headers, DATE_ALIASES)
+        description_index = _column_index(headers, DESCRIPTION_ALIASES)
+        amount_index = _column_index(headers, AMOUNT_ALIASES)
+        debit_index = _column_index(headers, DEBIT_ALIASES)
+        credit_index = _column_index(headers, CREDIT_ALIASES)
+
+        if date_index is None or description_index is None:
+            raise ValueError("CSV must include date and description columns")
+
+        if amount_index is None and (debit_index is None or credit_index is None):
+            raise ValueError("CSV must include either amount column or debit+credit columns")
+
+        return cls(date_index, description_index, amount_index, debit_index, credit_index)
+
+
+def _column_index(headers: list[str], aliases: set[str]) -> int | None:
+    name = _pick_column(headers, aliases)
+    if name is None:
+        return None
+    # A repeated header name resolves to its last column, as it does with csv.DictReader.
+    return len(headers) - 1 - headers[::-1].index(name)
+
+
+def _iter_parsed_rows(rows: Iterator[list[str]], layout: CsvLayout) -> Iterator[tuple[date, str, int]]:
+    """Turn positional CSV rows into ``(date, description, amount_cents)``, skipping blank lines."""
+    rows = (row for row in rows if row)
+    head = list(islice(rows, DATE_SNIFF_ROWS))
+    date_index = layout.date_index
+    parse_date = DateParser(row[date_index] for row in head if len(row) > date_index and row[date_index])
+
+    description_index = layout.description_index
+    amount_index = layout.amount_index
+    debit_index = layout.debit_index
+    credit_index = layout.credit_index
+    for row in chain(head, rows):
+        width = len(row)
+        if amount_index is not None:
+            amount_cents = _parse_cents(row[amount_index] if amount_index < width else None)
+        else:
+            credit = row[credit_index] if credit_index < width else None
+            debit = row[debit_index] if debit_index < width else None
+            amount_cents = _parse_cents(credit) - _parse_cents(debit)
+        yield parse_date(row[date_index]), row[description_index].strip(), amount_cents
+
+
+def iter_transactions(csv_path: str | Path) -> Iterator[Transaction]:
+    """Yield transactions one row at a time so callers never hold the whole file."""
     path = Path(csv_path)
     with path.open("r", encoding="utf-8-sig", newline="") as handle:
-        reader = csv.DictReader(handle)
-        if not reader.fieldnames:
+        reader = csv.reader(handle)
+        headers = next(reader, None)
+        if not headers:
+            return
+        for tx_date, description, amount_cents in _iter_parsed_rows(reader, CsvLayout.from_headers(headers)):
+            yield Transaction(date=tx_date, description=description, amount_cents=amount_cents)
+
+
+def _quote_parity(handle: BinaryIO, start: int, end: int) -> int:
+    handle.seek(start)
+    parity = 0
+    remaining = end - start
+    while remaining > 0:
+        block = handle.read(min(SCAN_BLOCK_BYTES, remaining))
+        if not block:
+            break
+        parity ^= block.count(b'"') & 1
+        remaining -= len(block)
+    return parity
+
+
+def _next_record_start(handle: BinaryIO, pos: int, parity: int) -> int | None:
+    """First offset after a newline at or past ``pos`` that is outside a quoted field.
+
+    ``parity`` is the number of quote characters before ``pos``, mod 2; an escaped
+    quote (``""``) counts twice, so it never flips the result.
+    """
+    handle.seek(pos)
+    while block := handle.read(SCAN_BLOCK_BYTES):
+        index = 0
+        while (newline := block.find(b"\n", index)) != -1:
+            parity ^= block.count(b'"', index, newline) & 1
+            index = newline + 1
+            if not parity:
+                return pos + index
+        parity ^= block.count(b'"', index) & 1
+        pos += len(block)
+    return None
+
+
+@dataclass(slots=True, frozen=True)
+class CsvChunk:
+    """Byte range ``[start, end)`` of a CSV file holding whole records."""
+    path: Path
+    layout: CsvLayout
+    start: int
+    end: int
+
+    def iter_rows(self) -> Iterator[tuple[date, str, int]]:
+        with self.path.open("rb") as handle:
+            handle.seek(self.start)
+            text = handle.read(self.end - self.start).decode("utf-8")
+        return _iter_parsed_rows(csv.reader(io.StringIO(text, newline="")), self.layout)
+
+    def iter_transactions(self) -> Iterator[Transaction]:
+        for tx_date, description, amount_cents in self.iter_rows():
+            yield Transaction(date=tx_date, description=description, amount_cents=amount_cents)
+
+
+def split_csv(csv_path: str | Path, chunk_bytes: int = PARSE_CHUNK_BYTES) -> list[CsvChunk]:
+    """Split a CSV file into chunks of about ``chunk_bytes`` that end on record boundaries.
+
+    Boundaries are newlines outside quoted fields, found by tracking quote
+    parity from the start of the data, so a quoted description that contains a
+    newline is never cut in half. Quotes that appear inside unquoted fields
+    (which the csv module reads literally) would confuse the parity; such
+    files should be read with ``iter_transactions``.
+    """
+    if chunk_bytes <= 0:
+        raise ValueError("chunk_bytes must be positive")
+    path = Path(csv_path)
+    size = path.stat().st_size
+    with path.open("rb") as handle:
+        header_end = _next_record_start(handle, 0, 0) or size
+        handle.seek(0)
+        header_text = handle.read(header_end).decode("utf-8-sig")
+        headers = next(csv.reader(io.StringIO(header_text, newline="")), None)
+        if not headers:
             return []
+        layout = CsvLayout.from_headers(headers)
 
-        headers = list(reader.fieldnames)
-        date_col = _pick_column(headers, DATE_ALIASES)
-        description_col = _pick_column(headers, DESCRIPTION_ALIASES)
-        amount_col = _pick_column(headers, AMOUNT_ALIASES)
-        debit_col = _pick_column(headers, DEBIT_ALIASES)
-        credit_col = _pick_column(headers, CREDIT_ALIASES)
+        boundaries = [header_end]
+        parity = 0
+        while boundaries[-1] + chunk_bytes < size:
+            start = boundaries[-1]
+            target = start + chunk_bytes
+            parity ^= _quote_parity(handle, start, target)
+            boundary = _next_record_start(handle, target, parity)
+            if boundary is None or boundary >= size:
+                break
+            # The record start is outside quotes, so parity is even again.
+            parity = 0
+            boundaries.append(boundary)
+    boundaries.append(size)
+    return [CsvChunk(path, layout, start, end) for start, end in zip(boundaries, boundaries[1:]) if end > start]
 
-        if not date_col or not description_col:
-            raise ValueError("CSV must include date and description columns")
 
-        if not amount_col and not (debit_col and credit_col):
-            raise ValueError("CSV must include either amount column or debit+credit columns")
+def parse_csv_chunk(chunk: CsvChunk) -> TransactionTable:
+    """Parse one chunk into a table: flat arrays that are cheap to send between processes."""
+    table = TransactionTable()
+    append = table.append
+    for tx_date, description, cents in chunk.iter_rows():
+        append(tx_date, description, cents)
+    return table
+
+
+def iter_chunk_tables(
+    csv_path: str | Path,
+    workers: int,
+    chunk_bytes: int = PARSE_CHUNK_BYTES,
+) -> Iterator[TransactionTable]:
+    """Parse one large file in ``workers`` processes, yielding one table per chunk in file order."""
+    chunks = split_csv(csv_path, chunk_bytes)
+    if workers <= 1 or len(chunks) <= 1:
+        yield from map(parse_csv_chunk, chunks)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(parse_csv_chunk, chunks)
+
+
+def iter_transactions_parallel(
+    csv_path: str | Path,
+    workers: int,
+    chunk_bytes: int = PARSE_CHUNK_BYTES,
+) -> Iterator[Transaction]:
+    """Like ``iter_transactions``, but parse chunks of one large file in ``workers`` processes.
+
+    Rows come back in file order.
+    """
+    chunks = split_csv(csv_path, chunk_bytes)
+    if workers <= 1 or len(chunks) <= 1:
+        for chunk in chunks:
+            yield from chunk.iter_transactions()
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for parsed in pool.map(parse_csv_chunk, chunks):
+            yield from parsed.transactions()
+
+
+def load_transactions(csv_path: str | Path, workers: int = 1) -> list[Transaction]:
+    if workers > 1:
+        return list(iter_transactions_parallel(csv_path, workers))
+    return list(iter_transactions(csv_path))
+
 
-        transactions: list[Transaction] = []
-        for row in reader:
-            tx_date = _parse_date(row[date_col])
-            description = row[description_col].strip()
+def load_table(csv_path: str | Path, workers: int = 1, chunk_bytes: int = PARSE_CHUNK_BYTES) -> TransactionTable:
+    """Like ``load_transactions``, but into a ``TransactionTable`` for large histories.
 
-            if amount_col:
-                amount = _parse_float(row.get(amount_col))
-            else:
-                debit = _parse_float(row.get(debit_col))
-                credit = _parse_float(row.get(credit_col))
-                amount = credit - debit
+    With several workers, the per-chunk tables are merged as they arrive, without
+    materializing a ``Transaction`` per row.
+    """
+    table = TransactionTable()
+    if workers > 1:
+        for chunk_table in iter_chunk_tables(csv_path, workers, chunk_bytes):
+            table.extend_table(chunk_table)
+        return table
+    append = table.append
+    for tx in iter_transactions(csv_path):
+        append(tx.date, tx.description, tx.amount_cents)
+    return table
 
-            transactions.append(Transaction(date=tx_date, description=description, amount=round(amount, 2)))
 
-    return transactions
+def _write_table_rows(writer, table: TransactionTable) -> int:
+    descriptions = table.descriptions
+    categories = table.categories
+    iso_dates: dict[int, str] = {}
+    for ordinal, cents, description_id, category_id in zip(
+        table.ordinals, table.amount_cents, table.description_ids, table.category_ids
+    ):
+        iso = iso_dates.get(ordinal)
+        if iso is None:
+            iso = iso_dates[ordinal] = date.fromordinal(ordinal).isoformat()
+        writer.writerow((iso, descriptions[description_id], format_cents(cents), categories[category_id]))
+    return len(table)
 
 
-def save_transactions_csv(csv_path: str | Path, transactions: list[Transaction]) -> None:
+def save_transactions_csv(
+    csv_path: str | Path,
+    transactions: Iterable[Transaction] | TransactionTable,
+    include_header: bool = True,
+) -> int:
+    written = 0
     path = Path(csv_path)
     path.parent.mkdir(parents=True, exist_ok=True)
     with path.open("w", encoding="utf-8", newline="") as handle:
         writer = csv.DictWriter(handle, fieldnames=["date", "description", "amount", "category"])
-        writer.writeheader()
+        if include_header:
+            writer.writeheader()
+        if isinstance(transactions, TransactionTable):
+            return _write_table_rows(writer.writer, transactions)
         for tx in transactions:
             writer.writerow(
                 {
                     "date": tx.date.isoformat(),
                     "description": tx.description,
-                    "amount": f"{tx.amount:.2f}",
+                    "amount": format_cents(tx.amount_cents),
                     "category": tx.category,
                 }
             )
+            written += 1
+    return written
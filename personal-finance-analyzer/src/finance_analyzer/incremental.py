@@ -0,0 +1,177 @@
+"""Incremental analyze runs backed by a state file in the output directory.
+
+The state records a fingerprint (size, mtime, SHA-256) and the partial
+aggregate of every input file. A rerun only re-parses files that are new or
+whose content changed. Unchanged files reuse their stored aggregate and their
+normalized-row part file. Reports are rebuilt only when their inputs changed,
+and a rebuilt report replaces the old file only if its bytes differ.
+"""
+from __future__ import annotations
+
+import filecmp
+import hashlib
+import json
+import os
+import shutil
+from dataclasses import asdict
+from pathlib import Path
+from typing import Callable
+
+from .analytics import SpendingAggregator
+from .budget import BudgetConfig
+from .categorization import CacheStats, rules_fingerprint
+from .pipeline import AnalysisResult, add_cache_stats, concat_parts, run_files
+
+STATE_FILE = ".analyze_state.json"
+PARTS_DIR = ".analyze_parts"
+STATE_VERSION = 2
+
+# Reports derived from the aggregates; an incremental run rewrites them only when the data changed.
+DATA_REPORTS = (
+    "normalized_transactions.csv",
+    "monthly_summary.csv",
+    "category_summary.csv",
+    "monthly_spending_trend.svg",
+    "latest_month_category_spending.svg",
+)
+# Reports that also depend on the budget limits.
+BUDGET_REPORTS = ("budget_alerts.txt", "report.md")
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for block in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _budget_fingerprint(budget: BudgetConfig) -> str:
+    return hashlib.sha1(json.dumps(asdict(budget), sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def write_if_changed(path: Path, write: Callable[[Path], None]) -> bool:
+    """Produce a report via ``write(tmp_path)`` and replace ``path`` only if the bytes differ.
+
+    Returns whether ``path`` was (re)written; an unchanged report keeps its mtime.
+    """
+    tmp = path.with_name(f".{path.name}.tmp")
+    write(tmp)
+    if path.exists() and filecmp.cmp(tmp, path, shallow=False):
+        tmp.unlink()
+        return False
+    os.replace(tmp, path)
+    return True
+
+
+def discard_state(output_dir: str | Path) -> None:
+    """Forget the incremental state in ``output_dir``.
+
+    Called before a full run writes its reports there, so a later incremental
+    run cannot mistake those reports for its own.
+    """
+    out = Path(output_dir)
+    (out / STATE_FILE).unlink(missing_ok=True)
+    shutil.rmtree(out / PARTS_DIR, ignore_errors=True)
+
+
+def _load_state(path: Path) -> dict:
+    try:
+        state = json.loads(path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return {}
+    return state if isinstance(state, dict) and state.get("version") == STATE_VERSION else {}
+
+
+def _save_state(path: Path, state: dict) -> None:
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(state, indent=1), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def analyze_incremental(
+    inputs: list[Path],
+    rules: dict[str, list[str]],
+    budget: BudgetConfig,
+    output_dir: str | Path,
+    workers: int = 1,
+) -> AnalysisResult:
+    """Re-analyze only new or changed inputs and merge them with the stored partials.
+
+    Partials are merged in input order, like ``analyze_files``, so the reports
+    match a full run byte for byte.
+    """
+    out = Path(output_dir)
+    parts_dir = out / PARTS_DIR
+    parts_dir.mkdir(parents=True, exist_ok=True)
+    state_path = out / STATE_FILE
+
+    state = _load_state(state_path)
+    rules_fp = rules_fingerprint(rules)
+    if state.get("rules") != rules_fp:
+        # New rules can change any file's categories, so nothing stored is reusable.
+        state = {}
+    previous: dict[str, dict] = state.get("files", {})
+
+    keys = [str(path.resolve()) for path in inputs]
+    files: dict[str, dict] = {}
+    dirty: list[int] = []
+    for index, (path, key) in enumerate(zip(inputs, keys)):
+        stat = path.stat()
+        part = f"{hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]}.csv"
+        entry = previous.get(key)
+        reusable = entry is not None and (parts_dir / entry["part"]).exists()
+
+        if reusable and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+            files[key] = entry
+            continue
+        digest = _sha256(path)
+        if reusable and entry["size"] == stat.st_size and entry["sha256"] == digest:
+            # Touched but not modified: keep the partial and remember the new mtime.
+            files[key] = {**entry, "mtime_ns": stat.st_mtime_ns}
+            continue
+
+        files[key] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": digest, "part": part}
+        dirty.append(index)
+
+    cache_stats = CacheStats()
+    units = [(inputs[i], parts_dir / files[keys[i]]["part"]) for i in dirty]
+    for index, (aggregator, stats) in zip(dirty, run_files(units, rules, workers)):
+        files[keys[index]]["aggregate"] = aggregator.to_dict()
+        add_cache_stats(cache_stats, stats)
+
+    for key, entry in previous.items():
+        if key not in files:
+            (parts_dir / entry["part"]).unlink(missing_ok=True)
+
+    merged = SpendingAggregator()
+    for key in keys:
+        merged.merge(SpendingAggregator.from_dict(files[key]["aggregate"]))
+
+    data_changed = (
+        bool(dirty)
+        or keys != state.get("inputs")
+        or not all((out / name).exists() for name in DATA_REPORTS)
+    )
+    budget_fp = _budget_fingerprint(budget)
+    budget_changed = budget_fp != state.get("budget") or not all((out / name).exists() for name in BUDGET_REPORTS)
+
+    rewritten = []
+    if data_changed:
+        parts = [parts_dir / files[key]["part"] for key in keys]
+        if write_if_changed(out / "normalized_transactions.csv", lambda tmp: concat_parts(tmp, parts)):
+            rewritten.append("normalized_transactions.csv")
+
+    _save_state(
+        state_path,
+        {"version": STATE_VERSION, "rules": rules_fp, "budget": budget_fp, "inputs": keys, "files": files},
+    )
+    return AnalysisResult(
+        aggregator=merged,
+        cache_stats=cache_stats,
+        files=list(inputs),
+        processed=len(dirty),
+        data_changed=data_changed,
+        budget_changed=budget_changed,
+        rewritten=rewritten,
+    )
@@ -1,21 +1,185 @@
 from __future__ import annotations
 
+from array import array
 from dataclasses import dataclass
 from datetime import date
+from typing import Iterable, Iterator
+
+
+def format_cents(cents: int) -> str:
+    """Render integer cents as a plain decimal string, e.g. -12345 -> "-123.45"."""
+    sign = "-" if cents < 0 else ""
+    whole, frac = divmod(abs(cents), 100)
+    return f"{sign}{whole}.{frac:02d}"
 
 
 @dataclass(slots=True)
 class Transaction:
     date: date
     description: str
-    amount: float
+    amount_cents: int
     category: str = "Uncategorized"
 
+    @property
+    def amount(self) -> float:
+        return self.amount_cents / 100
+
 
 @dataclass(slots=True)
 class MonthlySummary:
     month: str
-    income: float
-    expenses: float
-    net: float
+    income_cents: int
+    expenses_cents: int
     savings_rate: float
+
+    @property
+    def net_cents(self) -> int:
+        return self.income_cents - self.expenses_cents
+
+    @property
+    def income(self) -> float:
+        return self.income_cents / 100
+
+    @property
+    def expenses(self) -> float:
+        return self.expenses_cents / 100
+
+    @property
+    def net(self) -> float:
+        return self.net_cents / 100
+
+
+class TransactionTable:
+    """Many transactions held as parallel arrays instead of one object per row.
+
+    Dates are ``date.toordinal()`` ints, and descriptions and categories are
+    interned: ``descriptions`` and ``categories`` hold each distinct value once
+    and the per-row id arrays index into them. Indexing or iterating yields
+    ``TransactionRow`` views for code that wants ``Transaction``-style attributes.
+    """
+
+    __slots__ = (
+        "ordinals",
+        "amount_cents",
+        "description_ids",
+        "category_ids",
+        "descriptions",
+        "categories",
+        "_description_codes",
+        "_category_codes",
+    )
+
+    def __init__(self) -> None:
+        self.ordinals = array("i")
+        self.amount_cents = array("q")
+        self.description_ids = array("i")
+        self.category_ids = array("i")
+        self.descriptions: list[str] = []
+        self.categories: list[str] = []
+        self._description_codes: dict[str, int] = {}
+        self._category_codes: dict[str, int] = {}
+
+    @classmethod
+    def from_transactions(cls, transactions: Iterable[Transaction]) -> TransactionTable:
+        table = cls()
+        table.extend(transactions)
+        return table
+
+    def intern_description(self, description: str) -> int:
+        code = self._description_codes.get(description)
+        if code is None:
+            code = self._description_codes[description] = len(self.descriptions)
+            self.descriptions.append(description)
+        return code
+
+    def intern_category(self, category: str) -> int:
+        code = self._category_codes.get(category)
+        if code is None:
+            code = self._category_codes[category] = len(self.categories)
+            self.categories.append(category)
+        return code
+
+    def append(self, tx_date: date, description: str, amount_cents: int, category: str = "Uncategorized") -> None:
+        self.ordinals.append(tx_date.toordinal())
+        self.amount_cents.append(amount_cents)
+        self.description_ids.append(self.intern_description(description))
+        self.category_ids.append(self.intern_category(category))
+
+    def extend(self, transactions: Iterable[Transaction]) -> None:
+        for tx in transactions:
+            self.append(tx.date, tx.description, tx.amount_cents, tx.category)
+
+    def extend_table(self, other: TransactionTable) -> None:
+        """Append another table's rows, remapping its description and category ids onto this table's."""
+        description_ids = [self.intern_description(description) for description in other.descriptions]
+        category_ids = [self.intern_category(category) for category in other.categories]
+        self.ordinals.extend(other.ordinals)
+        self.amount_cents.extend(other.amount_cents)
+        self.description_ids.extend(array("i", map(description_ids.__getitem__, other.description_ids)))
+        self.category_ids.extend(array("i", map(category_ids.__getitem__, other.category_ids)))
+
+    def set_category(self, index: int, category: str) -> None:
+        self.category_ids[index] = self.intern_category(category)
+
+    def __len__(self) -> int:
+        return len(self.ordinals)
+
+    def __getitem__(self, index: int) -> TransactionRow:
+        if index < 0:
+            index += len(self.ordinals)
+        if not 0 <= index < len(self.ordinals):
+            raise IndexError("transaction index out of range")
+        return TransactionRow(self, index)
+
+    def __iter__(self) -> Iterator[TransactionRow]:
+        for index in range(len(self.ordinals)):
+            yield TransactionRow(self, index)
+
+    def transactions(self) -> Iterator[Transaction]:
+        """Materialize the rows as ``Transaction`` objects, in order."""
+        descriptions = self.descriptions
+        categories = self.categories
+        # Consecutive rows usually share a date, so reuse the last date object.
+        last_ordinal = None
+        tx_date = None
+        for ordinal, cents, description_id, category_id in zip(
+            self.ordinals, self.amount_cents, self.description_ids, self.category_ids
+        ):
+            if ordinal != last_ordinal:
+                tx_date = date.fromordinal(ordinal)
+                last_ordinal = ordinal
+            yield Transaction(tx_date, descriptions[description_id], cents, categories[category_id])
+
+
+class TransactionRow:
+    """One row of a ``TransactionTable``; assigning ``category`` writes through to the table."""
+
+    __slots__ = ("table", "index")
+
+    def __init__(self, table: TransactionTable, index: int):
+        self.table = table
+        self.index = index
+
+    @property
+    def date(self) -> date:
+        return date.fromordinal(self.table.ordinals[self.index])
+
+    @property
+    def description(self) -> str:
+        return self.table.descriptions[self.table.description_ids[self.index]]
+
+    @property
+    def amount_cents(self) -> int:
+        return self.table.amount_cents[self.index]
+
+    @property
+    def amount(self) -> float:
+        return self.amount_cents / 100
+
+    @property
+    def category(self) -> str:
+        return self.table.categories[self.table.category_ids[self.index]]
+
+    @category.setter
+    def category(self, value: str) -> None:
+        self.table.set_category(self.index, value)
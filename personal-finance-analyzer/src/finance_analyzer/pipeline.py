@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import glob
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from .analytics import SpendingAggregator, iter_categorized
+from .categorization import CachedCategorizer, CacheStats, Categorizer
+from .csvio import PARSE_CHUNK_BYTES, CsvChunk, iter_transactions, save_transactions_csv, split_csv
+from .models import Transaction
+from .store import TransactionStore
+
+
+@dataclass(slots=True)
+class AnalysisResult:
+    aggregator: SpendingAggregator
+    cache_stats: CacheStats
+    files: list[Path] = field(default_factory=list)
+    processed: int = 0
+    # False when an incremental run found nothing new, so the matching reports can be left alone.
+    data_changed: bool = True
+    budget_changed: bool = True
+    # Report files an incremental run actually replaced.
+    rewritten: list[str] = field(default_factory=list)
+
+
+def analyze_stream(
+    transactions: Iterable[Transaction],
+    categorize_fn,
+    normalized_path: str | Path,
+    include_header: bool = True,
+) -> SpendingAggregator:
+    """Categorize, aggregate and write normalized rows in a single pass.
+
+    Each transaction is dropped as soon as it has been written, so peak memory
+    depends on the number of months and categories, not on the number of rows.
+    """
+    aggregator = SpendingAggregator()
+    save_transactions_csv(
+        normalized_path,
+        aggregator.consume(iter_categorized(transactions, categorize_fn)),
+        include_header=include_header,
+    )
+    return aggregator
+
+
+def analyze_file(
+    input_path: str | Path,
+    categorize_fn,
+    normalized_path: str | Path,
+    include_header: bool = True,
+) -> SpendingAggregator:
+    return analyze_stream(iter_transactions(input_path), categorize_fn, normalized_path, include_header)
+
+
+def expand_inputs(patterns: Iterable[str | Path]) -> list[Path]:
+    """Resolve files, directories (their *.csv files) and glob patterns, keeping first-seen order."""
+    files: list[Path] = []
+    seen: set[Path] = set()
+    for pattern in patterns:
+        path = Path(pattern)
+        if path.is_dir():
+            matches = sorted(path.glob("*.csv"))
+        elif any(ch in str(pattern) for ch in "*?["):
+            matches = sorted(Path(match) for match in glob.glob(str(pattern), recursive=True))
+        else:
+            matches = [path]
+        for match in matches:
+            if match not in seen:
+                seen.add(match)
+                files.append(match)
+    if not files:
+        raise ValueError(f"No input CSV files matched: {', '.join(str(p) for p in patterns)}")
+    return files
+
+
+def add_cache_stats(total: CacheStats, delta: CacheStats) -> None:
+    total.hits += delta.hits
+    total.misses += delta.misses
+    total.evictions += delta.evictions
+    total.batch_rows += delta.batch_rows
+    total.batch_unique += delta.batch_unique
+
+
+Source = Path | CsvChunk
+
+
+def _analyze_unit(cache: CachedCategorizer, source: Source, part_path: Path) -> tuple[SpendingAggregator, CacheStats]:
+    before = replace(cache.stats)
+    transactions = source.iter_transactions() if isinstance(source, CsvChunk) else iter_transactions(source)
+    aggregator = analyze_stream(transactions, cache.categorize, part_path, include_header=False)
+    after = cache.stats
+    delta = CacheStats(
+        after.hits - before.hits,
+        after.misses - before.misses,
+        after.evictions - before.evictions,
+        after.batch_rows - before.batch_rows,
+        after.batch_unique - before.batch_unique,
+    )
+    return aggregator, delta
+
+
+_worker_cache: CachedCategorizer | None = None
+
+
+def _init_worker(rules: dict[str, list[str]]) -> None:
+    global _worker_cache
+    _worker_cache = CachedCategorizer(Categorizer(rules=rules))
+
+
+def _worker_analyze(source: Source, part_path: Path) -> tuple[SpendingAggregator, CacheStats]:
+    # Only the small partial aggregate travels back; rows stay in the part file.
+    return _analyze_unit(_worker_cache, source, part_path)
+
+
+def run_units(
+    units: list[tuple[Source, Path]],
+    rules: dict[str, list[str]],
+    workers: int = 1,
+) -> Iterator[tuple[SpendingAggregator, CacheStats]]:
+    """Analyze ``(input file or chunk, part file)`` units and yield their partial results in unit order."""
+    if workers > 1 and len(units) > 1:
+        sources, parts = zip(*units)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(rules,)) as pool:
+            yield from pool.map(_worker_analyze, sources, parts)
+    else:
+        cache = CachedCategorizer(Categorizer(rules=rules))
+        for source, part in units:
+            yield _analyze_unit(cache, source, part)
+
+
+def run_files(
+    files: list[tuple[Path, Path]],
+    rules: dict[str, list[str]],
+    workers: int = 1,
+    chunk_bytes: int = PARSE_CHUNK_BYTES,
+) -> Iterator[tuple[SpendingAggregator, CacheStats]]:
+    """Like ``run_units`` for whole files, yielding one result per ``(input, part file)``.
+
+    With several workers, files larger than ``chunk_bytes`` are split on record
+    boundaries so one big export is spread across processes. A split file's
+    chunk parts are concatenated and its chunk aggregates merged in file order,
+    so the result is the same as analyzing the file in one piece.
+    """
+    units: list[tuple[Source, Path]] = []
+    unit_counts: list[int] = []
+    for input_path, part in files:
+        chunks = split_csv(input_path, chunk_bytes) if workers > 1 and input_path.stat().st_size > chunk_bytes else []
+        if len(chunks) > 1:
+            units.extend((chunk, part.with_name(f"{part.name}.{n:05d}")) for n, chunk in enumerate(chunks))
+            unit_counts.append(len(chunks))
+        else:
+            units.append((input_path, part))
+            unit_counts.append(1)
+
+    results = run_units(units, rules, workers)
+    position = 0
+    for (_, part), count in zip(files, unit_counts):
+        aggregator, stats = SpendingAggregator(), CacheStats()
+        for (_, unit_part), (partial, delta) in zip(units[position : position + count], results):
+            aggregator.merge(partial)
+            add_cache_stats(stats, delta)
+        if count > 1:
+            chunk_parts = [unit_part for _, unit_part in units[position : position + count]]
+            _concat_files(part, chunk_parts)
+            for chunk_part in chunk_parts:
+                chunk_part.unlink()
+        position += count
+        yield aggregator, stats
+
+
+def _concat_files(target: Path, parts: Iterable[Path], mode: str = "wb") -> None:
+    with target.open(mode) as out:
+        for part in parts:
+            with part.open("rb") as handle:
+                shutil.copyfileobj(handle, out)
+
+
+def concat_parts(normalized_path: str | Path, parts: Iterable[Path]) -> None:
+    normalized = Path(normalized_path)
+    save_transactions_csv(normalized, ())
+    _concat_files(normalized, parts, mode="ab")
+
+
+def analyze_files(
+    inputs: list[Path],
+    rules: dict[str, list[str]],
+    normalized_path: str | Path,
+    workers: int = 1,
+    chunk_bytes: int = PARSE_CHUNK_BYTES,
+) -> AnalysisResult:
+    """Analyze several CSV files in parallel and merge the partial aggregates.
+
+    Each file (or chunk of a large file) writes its normalized rows to a part
+    file, and the parts and aggregates are merged in input order, so the
+    reports are identical for any worker count.
+    """
+    normalized = Path(normalized_path)
+    normalized.parent.mkdir(parents=True, exist_ok=True)
+    result = AnalysisResult(aggregator=SpendingAggregator(), cache_stats=CacheStats(), files=list(inputs))
+
+    with tempfile.TemporaryDirectory(dir=normalized.parent, prefix=".parts-") as tmpdir:
+        parts = [Path(tmpdir) / f"{index:05d}.csv" for index in range(len(inputs))]
+        for aggregator, stats in run_files(list(zip(inputs, parts)), rules, workers, chunk_bytes):
+            result.aggregator.merge(aggregator)
+            add_cache_stats(result.cache_stats, stats)
+        concat_parts(normalized, parts)
+
+    result.processed = len(inputs)
+    return result
+
+
+def analyze_store(store_path: str | Path, rules: dict[str, list[str]], normalized_path: str | Path) -> AnalysisResult:
+    """Analyze a store written by ``ingest``: same reports as the source CSVs, without parsing text."""
+    cache = CachedCategorizer(Categorizer(rules=rules))
+    with TransactionStore(store_path) as store:
+        aggregator = analyze_stream(store.iter_transactions(), cache.categorize, normalized_path)
+    return AnalysisResult(aggregator=aggregator, cache_stats=cache.stats, files=[Path(store_path)], processed=1)
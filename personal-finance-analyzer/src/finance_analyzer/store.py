@@ -0,0 +1,162 @@
+"""Compact binary transaction store, written once by ``ingest`` and memory-mapped by ``analyze --store``.
+
+Layout (little-endian), every section starting on an 8-byte boundary:
+
+    header      64 bytes: magic, version, row count, description count, text bytes
+    cents       int64 per row
+    offsets     uint64 per description + 1, byte offsets into the text section
+    ordinals    int32 per row, date.toordinal()
+    desc ids    int32 per row, index into the description dictionary
+    text        UTF-8 descriptions, concatenated
+
+The numeric columns are read straight out of the mapping without copying;
+only the description dictionary, one entry per distinct description, is decoded.
+"""
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import sys
+from array import array
+from datetime import date
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from .models import Transaction
+
+MAGIC = b"FATXSTOR"
+STORE_VERSION = 1
+_HEADER = struct.Struct("<8sIQQQ")
+HEADER_SIZE = 64
+
+_LITTLE_ENDIAN = sys.byteorder == "little"
+
+
+def _padded(size: int) -> int:
+    return (size + 7) & ~7
+
+
+def _to_le_bytes(values: array) -> bytes:
+    if not _LITTLE_ENDIAN:
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def write_store(path: str | Path, transactions: Iterable[Transaction]) -> int:
+    """Write ``transactions`` in order to a store file and return the row count.
+
+    The file is written next to ``path`` and renamed into place, so readers
+    never see a partial store.
+    """
+    cents = array("q")
+    ordinals = array("i")
+    description_ids = array("i")
+    codes: dict[str, int] = {}
+    for tx in transactions:
+        code = codes.get(tx.description)
+        if code is None:
+            code = codes[tx.description] = len(codes)
+        cents.append(tx.amount_cents)
+        ordinals.append(tx.date.toordinal())
+        description_ids.append(code)
+
+    offsets = array("Q", [0])
+    encoded = []
+    for description in codes:
+        data = description.encode("utf-8")
+        encoded.append(data)
+        offsets.append(offsets[-1] + len(data))
+    text = b"".join(encoded)
+
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(target.name + ".tmp")
+    with tmp.open("wb") as handle:
+        handle.write(_HEADER.pack(MAGIC, STORE_VERSION, len(cents), len(codes), len(text)).ljust(HEADER_SIZE, b"\0"))
+        for section in (cents, offsets, ordinals, description_ids):
+            data = _to_le_bytes(section)
+            handle.write(data.ljust(_padded(len(data)), b"\0"))
+        handle.write(text)
+    os.replace(tmp, target)
+    return len(cents)
+
+
+class TransactionStore:
+    """Read-only view of a store file.
+
+    ``cents``, ``ordinals`` and ``description_ids`` index like lists of ints and
+    are backed by the mapping itself; call ``close`` (or use ``with``) when done.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        with self.path.open("rb") as handle:
+            self._mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        self._views: list[memoryview] = []
+        try:
+            self._load()
+        except BaseException:
+            self.close()
+            raise
+
+    def _load(self) -> None:
+        if len(self._mmap) < HEADER_SIZE:
+            raise ValueError(f"{self.path} is not a transaction store")
+        magic, version, rows, descriptions, text_bytes = _HEADER.unpack_from(self._mmap)
+        if magic != MAGIC:
+            raise ValueError(f"{self.path} is not a transaction store")
+        if version != STORE_VERSION:
+            raise ValueError(f"Unsupported transaction store version {version} in {self.path}")
+        sizes = [rows * 8, (descriptions + 1) * 8, rows * 4, rows * 4]
+        if len(self._mmap) < HEADER_SIZE + sum(_padded(size) for size in sizes) + text_bytes:
+            raise ValueError(f"{self.path} is truncated")
+
+        view = memoryview(self._mmap)
+        self._views.append(view)
+        position = HEADER_SIZE
+        columns = []
+        for size, typecode in zip(sizes, "qQii"):
+            section = view[position : position + size]
+            position += _padded(size)
+            if _LITTLE_ENDIAN:
+                columns.append(section.cast(typecode))
+                self._views.append(columns[-1])
+            else:
+                values = array(typecode, section.tobytes())
+                values.byteswap()
+                columns.append(values)
+            section.release()
+        self.cents, offsets, self.ordinals, self.description_ids = columns
+
+        text = view[position : position + text_bytes]
+        self.descriptions = [str(text[offsets[i] : offsets[i + 1]], "utf-8") for i in range(descriptions)]
+        text.release()
+
+    def __len__(self) -> int:
+        return len(self.cents)
+
+    def __enter__(self) -> TransactionStore:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def iter_transactions(self) -> Iterator[Transaction]:
+        descriptions = self.descriptions
+        # Consecutive rows usually share a date, so reuse the last date object.
+        last_ordinal = None
+        tx_date = None
+        for ordinal, cents, description_id in zip(self.ordinals, self.cents, self.description_ids):
+            if ordinal != last_ordinal:
+                tx_date = date.fromordinal(ordinal)
+                last_ordinal = ordinal
+            yield Transaction(date=tx_date, description=descriptions[description_id], amount_cents=cents)
+
+    def close(self) -> None:
+        # Exported memoryviews must be released before the mapping can close.
+        for view in reversed(self._views):
+            view.release()
+        self._views.clear()
+        self._mmap.close()
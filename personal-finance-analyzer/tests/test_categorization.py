@@ -1,6 +1,64 @@
+import random
+import re
 import unittest
+from datetime import date
 
-from finance_analyzer.categorization import build_default_categorizer
+from finance_analyzer.analytics import assign_categories
+from finance_analyzer.categorization import (
+    DEFAULT_RULES,
+    CachedCategorizer,
+    Categorizer,
+    build_default_categorizer,
+)
+from finance_analyzer.models import Transaction
+
+
+def substring_categorize(rules: dict[str, list[str]], description: str, amount: float) -> str:
+    # Reference implementation: the original nested substring loop.
+    text = description.lower()
+    if amount > 0:
+        return "Income"
+    for category, keywords in rules.items():
+        if category == "Income":
+            continue
+        if any(word in text for word in keywords):
+            return category
+    return "Other"
+
+
+def reference_categorize(rules: dict, description: str, amount: float) -> str:
+    # Reference implementation for mixed rules: every rule checked one by one.
+    if amount > 0:
+        return "Income"
+    text = description.lower()
+    spend = round(-amount * 100)
+    categories = [(category, rules[category]) for category in rules if category != "Income"]
+
+    def in_range(rule) -> bool:
+        if isinstance(rule, str):
+            return True
+        return rule.get("min_amount", 0) * 100 <= spend <= rule.get("max_amount", float("inf")) * 100
+
+    for category, category_rules in categories:
+        for rule in category_rules:
+            if isinstance(rule, dict) and "merchant" in rule and in_range(rule):
+                if " ".join(text.split()) == " ".join(rule["merchant"].lower().split()):
+                    return category
+    for category, category_rules in categories:
+        for rule in category_rules:
+            if not in_range(rule):
+                continue
+            if isinstance(rule, str) or "keyword" in rule:
+                matched = (rule if isinstance(rule, str) else rule["keyword"]).lower() in text
+            elif "word" in rule:
+                matched = re.search(rf"(?<!\w){re.escape(rule['word'].lower())}(?!\w)", text) is not None
+            elif "regex" in rule:
+                matched = re.search(rule["regex"], text, re.IGNORECASE) is not None
+            else:
+                matched = False
+            if matched:
+                return category
+    return "Other"
 
 
 class CategorizationTests(unittest.TestCase):
@@ -16,6 +74,179 @@ class CategorizationTests(unittest.TestCase):
         c = build_default_categorizer()
         self.assertEqual(c.categorize("Random merchant", -12.0), "Other")
 
+    def test_rule_order_wins_over_match_position(self) -> None:
+        c = build_default_categorizer()
+        # "uber eats" (Dining) is listed before "uber" (Transport).
+        self.assertEqual(c.categorize("UBER EATS order", -23.0), "Dining")
+        self.assertEqual(c.categorize("Uber trip", -14.0), "Transport")
+        self.assertEqual(c.categorize("Shell near the market", -40.0), "Groceries")
+
+    def test_overlapping_keywords_use_fail_links(self) -> None:
+        c = Categorizer(rules={"First": ["bcd"], "Second": ["abce", "c"]})
+        self.assertEqual(c.categorize("xabcd", -1.0), "First")
+        self.assertEqual(c.categorize("abce", -1.0), "Second")
+        self.assertEqual(c.categorize("", -1.0), "Other")
+
+    def test_matches_substring_reference(self) -> None:
+        rng = random.Random(7)
+        words = [w for keywords in DEFAULT_RULES.values() for w in keywords] + ["acme", "store", "#1234", "att"]
+        c = build_default_categorizer()
+        for _ in range(500):
+            description = " ".join(rng.choice(words) for _ in range(rng.randint(0, 4))).title()
+            amount = rng.choice([-10.0, 0.0, 10.0])
+            self.assertEqual(c.categorize(description, amount), substring_categorize(DEFAULT_RULES, description, amount))
+
+    def test_cache_shares_entries_across_store_numbers(self) -> None:
+        cache = CachedCategorizer(build_default_categorizer())
+        self.assertEqual(cache.categorize("SHELL OIL #1042 01/05", -40.0), "Transport")
+        self.assertEqual(cache.categorize("Shell Oil #2210 02/11", -35.0), "Transport")
+        self.assertEqual(cache.categorize("Shell Oil #2210 02/11", 35.0), "Income")
+        self.assertEqual((cache.stats.hits, cache.stats.misses), (1, 2))
+
+    def test_cache_keeps_digits_when_rules_use_them(self) -> None:
+        cache = CachedCategorizer(Categorizer(rules={"Fuel": ["76"], "Misc": ["station"]}))
+        self.assertEqual(cache.categorize("Station 76", -10.0), "Fuel")
+        self.assertEqual(cache.categorize("Station 77", -10.0), "Misc")
+
+    def test_cache_evicts_and_invalidates_on_rule_change(self) -> None:
+        cache = CachedCategorizer(build_default_categorizer(), maxsize=2)
+        for name in ("Netflix", "Hulu", "Spotify"):
+            cache.categorize(name, -10.0)
+        self.assertEqual(cache.stats.evictions, 1)
+        self.assertEqual(len(cache), 2)
+
+        cache.update_rules({"Streaming": ["netflix"]})
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.categorize("Netflix", -10.0), "Streaming")
+
+
+class RuleEngineTests(unittest.TestCase):
+    RULES = {
+        "Dining": [{"merchant": "Uber   Eats"}, {"word": "cafe"}, {"keyword": "pizza", "max_amount": 60}],
+        "Transport": ["uber", {"regex": r"^sq \*(taxi|cab)\b"}],
+        "Utilities": [{"word": "att"}, {"merchant": "Seattle City Light"}],
+        "Electronics": [{"keyword": "pizza oven", "min_amount": 100}, {"regex": r"best ?buy"}],
+    }
+
+    def test_word_rules_respect_word_boundaries(self) -> None:
+        c = Categorizer(rules=self.RULES)
+        self.assertEqual(c.categorize("ATT*BILL PAYMENT", -80.0), "Utilities")
+        self.assertEqual(c.categorize("Matt's Place", -12.0), "Other")
+        self.assertEqual(c.categorize("Cafe Seattle", -4.0), "Dining")
+        self.assertEqual(c.categorize("cafeteria", -4.0), "Other")
+
+    def test_exact_merchant_is_checked_first(self) -> None:
+        c = Categorizer(rules=self.RULES)
+        # "uber" (Transport) would also match, but an exact merchant rule wins outright.
+        self.assertEqual(c.categorize("UBER EATS", -23.0), "Dining")
+        self.assertEqual(c.categorize("UBER EATS 8841", -23.0), "Transport")
+        # Merchant rules beat earlier categories' keyword and word rules too.
+        self.assertEqual(c.categorize("Seattle City  Light", -60.0), "Utilities")
+
+    def test_regex_and_amount_ranges(self) -> None:
+        c = Categorizer(rules=self.RULES)
+        self.assertEqual(c.categorize("SQ *TAXI 4471", -18.0), "Transport")
+        self.assertEqual(c.categorize("Best Buy #12", -300.0), "Electronics")
+        self.assertEqual(c.categorize("Pizza Oven Outlet", -45.0), "Dining")
+        self.assertEqual(c.categorize("Pizza Oven Outlet", -60.0), "Dining")
+        self.assertEqual(c.categorize("Pizza Oven Outlet", -60.01), "Other")
+        self.assertEqual(c.categorize("Pizza Oven Outlet", -150.0), "Electronics")
+        self.assertEqual(c.categorize("Pizza Oven Outlet", 150.0), "Income")
+
+    def test_cache_key_separates_amount_buckets(self) -> None:
+        c = Categorizer(rules=self.RULES)
+        self.assertFalse(c.digit_insensitive)
+        self.assertEqual(c.cache_key("Pizza", -10.0), c.cache_key("Pizza", -59.0))
+        self.assertNotEqual(c.cache_key("Pizza", -59.0), c.cache_key("Pizza", -61.0))
+
+        cache = CachedCategorizer(c)
+        self.assertEqual(
+            [cache.categorize("Pizza Oven", amount) for amount in (-10.0, -150.0, -20.0)],
+            ["Dining", "Electronics", "Dining"],
+        )
+        self.assertEqual((cache.stats.hits, cache.stats.misses), (1, 2))
+
+    def test_matches_reference_on_mixed_rules(self) -> None:
+        rng = random.Random(5)
+        words = ["uber", "eats", "cafe", "cafeteria", "att", "matt", "pizza", "oven", "sq", "*taxi", "best", "buy"]
+        words += ["seattle", "city", "light", "#1234"]
+        c = Categorizer(rules=self.RULES)
+        for _ in range(1000):
+            description = " ".join(rng.choice(words) for _ in range(rng.randint(0, 4))).title()
+            amount = rng.choice([-10.0, -60.0, -99.99, -100.0, -250.0, 0.0, 10.0])
+            self.assertEqual(
+                c.categorize(description, amount), reference_categorize(self.RULES, description, amount), description
+            )
+
+    def test_regex_rules_do_not_interfere(self) -> None:
+        c = Categorizer(
+            rules={
+                "Named": [{"regex": "(?P<n>foo)"}, {"regex": "(?P<n>bar)"}],
+                "Flags": [{"regex": "(?i)qux"}, {"word": "zap"}],
+                "Backref": [{"regex": "(z)y"}, {"regex": r"(a)\1"}],
+            }
+        )
+        self.assertEqual(c.categorize("bar", -1.0), "Named")
+        self.assertEqual(c.categorize("QUX", -1.0), "Flags")
+        self.assertEqual(c.categorize("aa", -1.0), "Backref")
+        self.assertEqual(c.categorize("ab", -1.0), "Other")
+
+    def test_invalid_rules_are_rejected(self) -> None:
+        rules = (
+            {"regex": "("},
+            {"word": "a", "regex": "b"},
+            {"wrod": "a"},
+            {"word": "a", "max_amount": -1},
+            {"word": "a", "min_amount": "10"},
+            {"word": "a", "max_amount": None},
+            7,
+        )
+        for rule in rules:
+            with self.assertRaises(ValueError):
+                Categorizer(rules={"Misc": [rule]})
+
+
+class BatchCategorizationTests(unittest.TestCase):
+    def test_categorize_many_matches_categorize(self) -> None:
+        rng = random.Random(3)
+        names = ["Pizza Oven", "SQ *TAXI 12", "Uber Eats", "Matt's Place", "Best Buy", "Cafe"]
+        descriptions = [rng.choice(names) for _ in range(400)]
+        amounts = [rng.choice([-10.0, -75.0, -150.0, 0.0, 20.0]) for _ in range(400)]
+        for rules in (DEFAULT_RULES, RuleEngineTests.RULES):
+            c = Categorizer(rules=rules)
+            expected = [c.categorize(d, a) for d, a in zip(descriptions, amounts)]
+            self.assertEqual(c.categorize_many(descriptions, amounts), expected)
+            cache = CachedCategorizer(Categorizer(rules=rules))
+            self.assertEqual(cache.categorize_many(descriptions, amounts), expected)
+
+    def test_batch_counters_track_unique_ratio(self) -> None:
+        cache = CachedCategorizer(build_default_categorizer())
+        descriptions = ["Netflix", "Shell #1", "Netflix", "Shell #2", "Payroll", "Refund"]
+        amounts = [-10.0, -40.0, -10.0, -35.0, 2000.0, 15.0]
+        self.assertEqual(
+            cache.categorize_many(descriptions, amounts),
+            ["Entertainment", "Transport", "Entertainment", "Transport", "Income", "Income"],
+        )
+        # Netflix, the two Shell descriptions and one key for every positive amount.
+        self.assertEqual((cache.stats.batch_rows, cache.stats.batch_unique), (6, 4))
+        self.assertAlmostEqual(cache.stats.unique_ratio, 4 / 6)
+        # The Shell descriptions share one cache entry; in-batch duplicates count as hits too.
+        self.assertEqual((cache.stats.hits, cache.stats.misses), (3, 3))
+        self.assertAlmostEqual(cache.stats.hit_rate, 0.5)
+        with self.assertRaises(ValueError):
+            cache.categorize_many(["Netflix"], [])
+
+    def test_assign_categories_uses_or_falls_back_from_batches(self) -> None:
+        c = build_default_categorizer()
+        rows = [Transaction(date(2026, 1, day), "Netflix" if day % 2 else "Kroger", -day * 100) for day in range(1, 21)]
+        assign_categories(rows, c.categorize)
+        self.assertEqual({tx.category for tx in rows}, {"Entertainment", "Groceries"})
+
+        calls = []
+        assign_categories(rows, lambda description, amount: calls.append(description) or "Misc")
+        self.assertEqual(len(calls), 20)
+        self.assertEqual({tx.category for tx in rows}, {"Misc"})
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,60 @@
+import random
+import unittest
+from datetime import date, timedelta
+
+from finance_analyzer.analytics import category_spending_by_month, monthly_summaries
+from finance_analyzer.models import Transaction, TransactionTable
+
+try:
+    import numpy  # noqa: F401
+except ImportError:
+    numpy = None
+
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class ColumnarTests(unittest.TestCase):
+    def _transactions(self) -> list[Transaction]:
+        rng = random.Random(11)
+        categories = ["Dining", "Groceries", "Transport", "Other"]
+        start = date(2025, 11, 20)
+        return [
+            Transaction(
+                date=start + timedelta(days=rng.randint(0, 120)),
+                description="row",
+                amount_cents=rng.randint(-25000, 25000),
+                category=rng.choice(categories),
+            )
+            for _ in range(2000)
+        ]
+
+    def test_rollups_match_python_backend(self) -> None:
+        from finance_analyzer.columnar import TransactionColumns
+
+        transactions = self._transactions()
+        columns = TransactionColumns.from_transactions(transactions)
+        self.assertEqual(len(columns), 2000)
+        self.assertEqual(columns.monthly_summaries(), monthly_summaries(transactions))
+        self.assertEqual(columns.category_spending_by_month(), category_spending_by_month(transactions))
+
+    def test_table_columns_match_python_backend(self) -> None:
+        from finance_analyzer.columnar import TransactionColumns
+
+        transactions = self._transactions()
+        table = TransactionTable.from_transactions(transactions)
+        columns = TransactionColumns.from_table(table)
+        self.assertEqual(columns.monthly_summaries(), monthly_summaries(transactions))
+        self.assertEqual(columns.category_spending_by_month(), category_spending_by_month(transactions))
+        # The table's arrays are not pinned by the NumPy columns and can keep growing.
+        table.extend(transactions[:1])
+        self.assertEqual(len(table), 2001)
+
+    def test_empty_input(self) -> None:
+        from finance_analyzer.columnar import TransactionColumns
+
+        columns = TransactionColumns.from_transactions([])
+        self.assertEqual(columns.monthly_summaries(), [])
+        self.assertEqual(columns.category_spending_by_month(), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
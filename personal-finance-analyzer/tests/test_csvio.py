@@ -1,8 +1,10 @@
 import tempfile
 import unittest
+from datetime import date
 from pathlib import Path
 
-from finance_analyzer.csvio import load_transactions
+from finance_analyzer.csvio import DateParser, _parse_cents, load_transactions
+from finance_analyzer.models import format_cents
 
 
 class CsvIoTests(unittest.TestCase):
@@ -19,6 +21,7 @@ class CsvIoTests(unittest.TestCase):
             self.assertEqual(len(txs), 2)
             self.assertEqual(txs[0].amount, 2500.0)
             self.assertEqual(txs[1].amount, -91.22)
+            self.assertEqual(txs[1].amount_cents, -9122)
 
     def test_debit_credit_parsing(self) -> None:
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -33,6 +36,35 @@ class CsvIoTests(unittest.TestCase):
             self.assertEqual(txs[0].amount, 2500.0)
             self.assertEqual(txs[1].amount, -5.5)
 
+    def test_date_parser_sniffs_fast_path_and_falls_back(self) -> None:
+        parse = DateParser(["01/03/2026", "1/4/2026", "12/31/25"])
+        self.assertEqual(parse("01/03/2026"), date(2026, 1, 3))
+        self.assertEqual(parse("2/9/70"), date(1970, 2, 9))
+        self.assertEqual(parse("3/1/68"), date(2068, 3, 1))
+        # Rows in another supported format still parse through the strptime fallback.
+        self.assertEqual(parse("2026-02-01"), date(2026, 2, 1))
+        self.assertEqual(parse(" 2026-2-1 "), date(2026, 2, 1))
+        with self.assertRaises(ValueError):
+            parse("2026-02-30")
+        with self.assertRaises(ValueError):
+            parse("Feb 1 2026")
+
+    def test_iso_dates_parse_without_sniffed_samples(self) -> None:
+        parse = DateParser()
+        self.assertEqual(parse("2026-01-15"), date(2026, 1, 15))
+
+    def test_amounts_parse_to_integer_cents(self) -> None:
+        self.assertEqual(_parse_cents("$1,234.5"), 123450)
+        self.assertEqual(_parse_cents("(5.50)"), -550)
+        self.assertEqual(_parse_cents("-.07"), -7)
+        self.assertEqual(_parse_cents("+12"), 1200)
+        self.assertEqual(_parse_cents("0.125"), 12)
+        self.assertEqual(_parse_cents(""), 0)
+        with self.assertRaises(ValueError):
+            _parse_cents("12.3.4")
+        self.assertEqual(format_cents(-123405), "-1234.05")
+        self.assertEqual(format_cents(7), "0.07")
+
 
 if __name__ == "__main__":
     unittest.main()
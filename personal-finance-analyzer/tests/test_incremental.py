@@ -0,0 +1,96 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from finance_analyzer.cli import cmd_analyze
+from finance_analyzer.config import write_default_config
+from finance_analyzer.incremental import STATE_FILE
+
+
+def _statement(month: int, rows: list[str]) -> str:
+    return "Date,Description,Amount\n" + "".join(f"2026-{month:02d}-{row}\n" for row in rows)
+
+
+class IncrementalTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp = Path(self._tmp.name)
+        self.inputs = self.tmp / "statements"
+        self.inputs.mkdir()
+        self.config = self.tmp / "config.json"
+        write_default_config(self.config)
+        (self.inputs / "jan.csv").write_text(
+            _statement(1, ["01,Payroll ACME,4000", "03,Trader Joe,-130", "04,Netflix,-16.99"]), encoding="utf-8"
+        )
+        (self.inputs / "feb.csv").write_text(
+            _statement(2, ["01,Payroll ACME,4000", "05,Shell Gas,-45.10"]), encoding="utf-8"
+        )
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def _run(self, out: str, incremental: bool = True) -> Path:
+        rc = cmd_analyze([str(self.inputs)], str(self.tmp / out), str(self.config), workers=1, incremental=incremental)
+        self.assertEqual(rc, 0)
+        return self.tmp / out
+
+    def _snapshot(self, out: Path) -> dict[str, bytes]:
+        return {p.name: p.read_bytes() for p in out.iterdir() if p.is_file() and not p.name.startswith(".")}
+
+    def test_rerun_without_changes_leaves_reports_alone(self) -> None:
+        out = self._run("reports")
+        self.assertTrue((out / STATE_FILE).exists())
+        mtimes = {p.name: p.stat().st_mtime_ns for p in out.iterdir() if p.is_file()}
+        (out / "monthly_summary.csv").write_text("sentinel", encoding="utf-8")
+
+        self._run("reports")
+        self.assertEqual((out / "monthly_summary.csv").read_text(encoding="utf-8"), "sentinel")
+        self.assertEqual((out / "report.md").stat().st_mtime_ns, mtimes["report.md"])
+
+    def test_only_reports_with_new_content_are_replaced(self) -> None:
+        out = self._run("reports")
+        # Replaced reports are renamed into place, so they get a new inode.
+        inodes = {p.name: p.stat().st_ino for p in out.iterdir() if p.is_file()}
+        # A January-only change: February stays the latest month, so its chart and the alerts are unchanged.
+        (self.inputs / "jan.csv").write_text(
+            _statement(1, ["01,Payroll ACME,4000", "03,Trader Joe,-131", "04,Netflix,-16.99"]), encoding="utf-8"
+        )
+        self._run("reports")
+
+        replaced = {name for name, inode in inodes.items() if (out / name).stat().st_ino != inode}
+        self.assertIn("monthly_summary.csv", replaced)
+        self.assertIn("normalized_transactions.csv", replaced)
+        self.assertNotIn("latest_month_category_spending.svg", replaced)
+        self.assertNotIn("budget_alerts.txt", replaced)
+        self.assertEqual([p.name for p in out.iterdir() if p.name.endswith(".tmp")], [])
+        self.assertEqual(self._snapshot(out), self._snapshot(self._run("full", incremental=False)))
+
+    def test_full_run_into_the_same_dir_discards_the_state(self) -> None:
+        out = self._run("reports")
+        other = self.tmp / "other"
+        other.mkdir()
+        (other / "mar.csv").write_text(_statement(3, ["02,Netflix,-16.99"]), encoding="utf-8")
+        cmd_analyze([str(other)], str(out), str(self.config), workers=1)
+        self.assertFalse((out / STATE_FILE).exists())
+
+        expected = self._snapshot(self._run("full", incremental=False))
+        self.assertEqual(self._snapshot(self._run("reports")), expected)
+
+    def test_changed_and_added_files_match_a_full_run(self) -> None:
+        out = self._run("reports")
+        (self.inputs / "feb.csv").write_text(
+            _statement(2, ["01,Payroll ACME,4000", "05,Shell Gas,-45.10", "09,Whole Foods,-88.40"]), encoding="utf-8"
+        )
+        (self.inputs / "mar.csv").write_text(_statement(3, ["02,Rent March,-1500"]), encoding="utf-8")
+        self._run("reports")
+
+        full = self._run("full", incremental=False)
+        self.assertEqual(self._snapshot(out), self._snapshot(full))
+
+        (self.inputs / "jan.csv").unlink()
+        self._run("reports")
+        self.assertEqual(self._snapshot(out), self._snapshot(self._run("full", incremental=False)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,8 +2,30 @@ import tempfile
 import unittest
 from pathlib import Path
 
+from finance_analyzer.analytics import assign_categories, category_spending_by_month, monthly_summaries
+from finance_analyzer.categorization import DEFAULT_RULES, build_default_categorizer
 from finance_analyzer.cli import cmd_analyze
 from finance_analyzer.config import write_default_config
+from finance_analyzer.csvio import (
+    iter_transactions,
+    load_table,
+    load_transactions,
+    parse_csv_chunk,
+    save_transactions_csv,
+    split_csv,
+)
+from finance_analyzer.models import TransactionTable
+from finance_analyzer.pipeline import analyze_files, analyze_stream, expand_inputs
+
+SAMPLE_CSV = (
+    "Date,Description,Amount\n"
+    "2026-01-01,Payroll ACME,4000\n"
+    "2026-01-02,Rent January,-1500\n"
+    "2026-01-03,Trader Joe,-130\n"
+    "2026-01-04,Netflix,-16.99\n"
+    "2026-02-01,Payroll ACME,4000\n"
+    "2026-02-07,Shell Gas,-41.10\n"
+)
 
 
 class PipelineTests(unittest.TestCase):
@@ -39,6 +61,122 @@ class PipelineTests(unittest.TestCase):
             for name in expected:
                 self.assertTrue((out_dir / name).exists(), name)
 
+    def test_streaming_pipeline_matches_list_rollups(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp = Path(tmpdir)
+            csv_path = tmp / "input.csv"
+            csv_path.write_text(SAMPLE_CSV, encoding="utf-8")
+            categorizer = build_default_categorizer()
+
+            stream = iter_transactions(csv_path)
+            self.assertFalse(isinstance(stream, list))
+            aggregator = analyze_stream(stream, categorizer.categorize, tmp / "normalized.csv")
+
+            transactions = load_transactions(csv_path)
+            for tx in transactions:
+                tx.category = categorizer.categorize(tx.description, tx.amount)
+
+            self.assertEqual(aggregator.count, 6)
+            self.assertEqual(aggregator.summaries(), monthly_summaries(transactions))
+            self.assertEqual(aggregator.categories_by_month(), category_spending_by_month(transactions))
+            self.assertEqual(len((tmp / "normalized.csv").read_text(encoding="utf-8").splitlines()), 7)
+
+    def _write_statements(self, directory: Path) -> None:
+        directory.mkdir()
+        rows = SAMPLE_CSV.splitlines()
+        header, body = rows[0], rows[1:]
+        for index in range(4):
+            lines = [header] + [row.replace("2026-", f"202{index}-") for row in body]
+            (directory / f"statement_{index}.csv").write_text("\n".join(lines) + "\n", encoding="utf-8")
+        (directory / "notes.txt").write_text("not a statement", encoding="utf-8")
+
+    def test_expand_inputs_accepts_directories_and_globs(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            statements = Path(tmpdir) / "statements"
+            self._write_statements(statements)
+            by_dir = expand_inputs([str(statements)])
+            by_glob = expand_inputs([str(statements / "statement_*.csv"), str(statements / "statement_0.csv")])
+            self.assertEqual(by_dir, by_glob)
+            self.assertEqual([p.name for p in by_dir], [f"statement_{i}.csv" for i in range(4)])
+            with self.assertRaises(ValueError):
+                expand_inputs([str(statements / "*.json")])
+
+    def test_parallel_run_matches_serial_run(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp = Path(tmpdir)
+            statements = tmp / "statements"
+            self._write_statements(statements)
+            config_path = tmp / "config.json"
+            write_default_config(config_path)
+
+            self.assertEqual(cmd_analyze([str(statements)], str(tmp / "serial"), str(config_path), workers=1), 0)
+            self.assertEqual(cmd_analyze([str(statements)], str(tmp / "parallel"), str(config_path), workers=3), 0)
+
+            serial = sorted(p.name for p in (tmp / "serial").iterdir())
+            self.assertEqual(serial, sorted(p.name for p in (tmp / "parallel").iterdir()))
+            for name in serial:
+                self.assertEqual((tmp / "serial" / name).read_bytes(), (tmp / "parallel" / name).read_bytes(), name)
+            normalized = (tmp / "serial" / "normalized_transactions.csv").read_text(encoding="utf-8")
+            self.assertEqual(len(normalized.splitlines()), 1 + 4 * 6)
+
+    def test_large_file_is_split_on_record_boundaries(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp = Path(tmpdir)
+            csv_path = tmp / "export.csv"
+            lines = ["\ufeffPosted Date,Merchant,Debit,Credit"]
+            for i in range(60):
+                # Quoted descriptions with commas, escaped quotes and newlines must stay whole.
+                description = f'"Shop {i}, ""aisle""\nline two"' if i % 7 == 0 else f"Trader Joe {i % 5}"
+                lines.append(f"01/{1 + i % 28:02d}/2026,{description},{i}.5,{'100' if i % 9 == 0 else ''}")
+            csv_path.write_text("\r\n".join(lines) + "\r\n\r\n", encoding="utf-8")
+
+            chunks = split_csv(csv_path, chunk_bytes=200)
+            self.assertGreater(len(chunks), 5)
+            expected = load_transactions(csv_path)
+            self.assertEqual(len(expected), 60)
+            self.assertEqual([tx for chunk in chunks for tx in parse_csv_chunk(chunk).transactions()], expected)
+            self.assertEqual(load_transactions(csv_path, workers=2), expected)
+            merged = load_table(csv_path, workers=2, chunk_bytes=200)
+            self.assertEqual(list(merged.transactions()), expected)
+            self.assertEqual(len(merged.descriptions), len({tx.description for tx in expected}))
+
+            serial = analyze_files([csv_path], DEFAULT_RULES, tmp / "serial.csv", workers=1)
+            chunked = analyze_files([csv_path], DEFAULT_RULES, tmp / "chunked.csv", workers=3, chunk_bytes=200)
+            self.assertEqual((tmp / "serial.csv").read_bytes(), (tmp / "chunked.csv").read_bytes())
+            self.assertEqual(serial.aggregator.to_dict(), chunked.aggregator.to_dict())
+            self.assertEqual([p.name for p in tmp.iterdir() if p.name.startswith(".parts")], [])
+
+    def test_transaction_table_matches_transaction_lists(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp = Path(tmpdir)
+            csv_path = tmp / "input.csv"
+            csv_path.write_text(SAMPLE_CSV + "2026-02-08,Trader Joe,-95.5\n", encoding="utf-8")
+            categorizer = build_default_categorizer()
+            transactions = assign_categories(load_transactions(csv_path), categorizer.categorize)
+            table = assign_categories(load_table(csv_path), categorizer.categorize)
+
+            self.assertEqual(len(table), 7)
+            self.assertEqual(len(table.descriptions), 5)
+            self.assertEqual(list(table.transactions()), transactions)
+            self.assertEqual(table[-1].description, "Trader Joe")
+            self.assertEqual(table[-1].amount, -95.5)
+            table[-1].category = "Snacks"
+            self.assertEqual(table[-1].category, "Snacks")
+            table[-1].category = transactions[-1].category
+            with self.assertRaises(IndexError):
+                table[7]
+
+            self.assertEqual(monthly_summaries(table), monthly_summaries(transactions))
+            self.assertEqual(category_spending_by_month(table), category_spending_by_month(transactions))
+            self.assertEqual(list(TransactionTable.from_transactions(transactions).transactions()), transactions)
+
+            save_transactions_csv(tmp / "from_list.csv", transactions)
+            save_transactions_csv(tmp / "from_table.csv", table)
+            save_transactions_csv(tmp / "from_rows.csv", iter(table))
+            expected = (tmp / "from_list.csv").read_bytes()
+            self.assertEqual((tmp / "from_table.csv").read_bytes(), expected)
+            self.assertEqual((tmp / "from_rows.csv").read_bytes(), expected)
+
 
 if __name__ == "__main__":
     unittest.main()
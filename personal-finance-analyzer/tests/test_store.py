@@ -0,0 +1,70 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from finance_analyzer.cli import cmd_analyze, cmd_ingest
+from finance_analyzer.config import write_default_config
+from finance_analyzer.csvio import load_transactions
+from finance_analyzer.store import TransactionStore, write_store
+
+SAMPLE_CSV = (
+    "Date,Description,Amount\n"
+    "2026-01-01,Payroll ACME,4000\n"
+    "2026-01-02,Rent January,-1500\n"
+    "2026-01-03,Café Olé,-4.75\n"
+    "2026-01-03,Café Olé,-5.25\n"
+    "2026-02-01,Payroll ACME,4000\n"
+)
+
+
+class StoreTests(unittest.TestCase):
+    def test_round_trip_preserves_rows_in_order(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp = Path(tmpdir)
+            csv_path = tmp / "input.csv"
+            csv_path.write_text(SAMPLE_CSV, encoding="utf-8")
+            transactions = load_transactions(csv_path)
+
+            self.assertEqual(write_store(tmp / "history.store", transactions), 5)
+            with TransactionStore(tmp / "history.store") as store:
+                self.assertEqual(len(store), 5)
+                self.assertEqual(len(store.descriptions), 3)
+                self.assertEqual(store.cents[2], -475)
+                self.assertEqual(list(store.iter_transactions()), transactions)
+
+            write_store(tmp / "empty.store", [])
+            with TransactionStore(tmp / "empty.store") as store:
+                self.assertEqual(list(store.iter_transactions()), [])
+
+    def test_rejects_foreign_and_truncated_files(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp = Path(tmpdir)
+            (tmp / "input.csv").write_text(SAMPLE_CSV, encoding="utf-8")
+            with self.assertRaises(ValueError):
+                TransactionStore(tmp / "input.csv")
+
+            write_store(tmp / "history.store", load_transactions(tmp / "input.csv"))
+            data = (tmp / "history.store").read_bytes()
+            (tmp / "cut.store").write_bytes(data[:-10])
+            with self.assertRaises(ValueError):
+                TransactionStore(tmp / "cut.store")
+
+    def test_analyze_from_store_matches_csv_reports(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp = Path(tmpdir)
+            csv_path = tmp / "input.csv"
+            csv_path.write_text(SAMPLE_CSV, encoding="utf-8")
+            config_path = tmp / "config.json"
+            write_default_config(config_path)
+
+            self.assertEqual(cmd_ingest(str(csv_path), str(tmp / "history.store"), workers=1), 0)
+            self.assertEqual(cmd_analyze(str(csv_path), str(tmp / "from_csv"), str(config_path)), 0)
+            self.assertEqual(
+                cmd_analyze(None, str(tmp / "from_store"), str(config_path), store_path=str(tmp / "history.store")), 0
+            )
+            for report in (tmp / "from_csv").iterdir():
+                self.assertEqual(report.read_bytes(), (tmp / "from_store" / report.name).read_bytes(), report.name)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,3 @@
 """Job tracker package."""
 
-__all__ = ["analytics", "db", "models", "repository"]
+__all__ = ["analytics", "async_repository", "batch", "db", "export", "models", "repository"]
@@ -1,11 +1,17 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import date
 from typing import Iterable
 
 from .models import JobApplication
 
+INTERVIEW_STAGE_STATUSES = frozenset({"phone_screen", "interview", "offer"})
+
+# Groupings accepted by grouped_funnel_metrics; "cohort" buckets by applied_date.
+GROUP_BY_FIELDS = ("cohort", "source", "company")
+COHORT_PERIODS = ("week", "month")
+
 
 @dataclass(slots=True)
 class FunnelMetrics:
@@ -19,28 +25,36 @@ class FunnelMetrics:
     avg_days_to_update: float
 
 
+@dataclass(slots=True)
+class StageDuration:
+    """Average time spent in one stage before moving to the next."""
+    from_status: str
+    to_status: str
+    transitions: int
+    avg_days: float
+
+
 def _days_between(start: str, end: str) -> int:
-    # Guard against bad ordering so metrics never go negative.
-    s = datetime.strptime(start, "%Y-%m-%d")
-    e = datetime.strptime(end, "%Y-%m-%d")
+    # Guard against bad ordering so metrics never go negative. A date that is not
+    # YYYY-MM-DD (imports store it unchecked) counts as 0 days, as julianday() does in SQL.
+    try:
+        s = date.fromisoformat(start)
+        e = date.fromisoformat(end)
+    except ValueError:
+        return 0
     return max((e - s).days, 0)
 
 
-def build_funnel_metrics(applications: Iterable[JobApplication]) -> FunnelMetrics:
-    """Compute top-of-funnel and conversion metrics from application records."""
-    apps = list(applications)
-    total = len(apps)
-    # Any app that reached phone screen/interview/offer is treated as an interview-stage response.
-    interviews = sum(1 for a in apps if a.status in {"phone_screen", "interview", "offer"})
-    offers = sum(1 for a in apps if a.status == "offer")
-    rejected = sum(1 for a in apps if a.status == "rejected")
-
-    touched = [a for a in apps if a.last_updated and a.applied_date]
-    avg_days = 0.0
-    if touched:
-        # Average time from application date to most recent status update.
-        avg_days = sum(_days_between(a.applied_date, a.last_updated) for a in touched) / len(touched)
-
+def funnel_metrics_from_totals(
+    total: int,
+    interviews: int,
+    offers: int,
+    rejected: int,
+    days_to_update_total: float,
+    touched: int,
+) -> FunnelMetrics:
+    """Turn raw counts into rounded KPIs; shared by the Python and SQL aggregation paths."""
+    avg_days = days_to_update_total / touched if touched else 0.0
     response_rate = (interviews + rejected + offers) / total if total else 0.0
     offer_rate = offers / total if total else 0.0
 
@@ -53,3 +67,88 @@ def build_funnel_metrics(applications: Iterable[JobApplication]) -> FunnelMetric
         offer_rate=round(offer_rate, 3),
         avg_days_to_update=round(avg_days, 2),
     )
+
+
+@dataclass(slots=True)
+class FunnelAccumulator:
+    """Running funnel totals; ``add`` one application at a time, read ``metrics()`` at any point."""
+    total: int = 0
+    interviews: int = 0
+    offers: int = 0
+    rejected: int = 0
+    days_total: int = 0
+    touched: int = 0
+
+    def add(self, app: JobApplication) -> None:
+        self.total += 1
+        status = app.status
+        # Any app that reached phone screen/interview/offer is treated as an interview-stage response.
+        if status in INTERVIEW_STAGE_STATUSES:
+            self.interviews += 1
+            if status == "offer":
+                self.offers += 1
+        elif status == "rejected":
+            self.rejected += 1
+        if app.last_updated and app.applied_date:
+            # Time from application date to most recent status update.
+            self.days_total += _days_between(app.applied_date, app.last_updated)
+            self.touched += 1
+
+    def metrics(self) -> FunnelMetrics:
+        return funnel_metrics_from_totals(
+            self.total, self.interviews, self.offers, self.rejected, self.days_total, self.touched
+        )
+
+
+def build_funnel_metrics(applications: Iterable[JobApplication]) -> FunnelMetrics:
+    """Compute top-of-funnel and conversion metrics from application records.
+
+    Reference implementation for ``ApplicationRepository.funnel_metrics``, which
+    reads the same figures from SQL. Consumes ``applications`` in one pass.
+    """
+    acc = FunnelAccumulator()
+    for app in applications:
+        acc.add(app)
+    return acc.metrics()
+
+
+def cohort_key(applied_date: str, period: str) -> str:
+    """Label an application date with its cohort: ``YYYY-MM`` or the ISO week ``YYYY-Www``."""
+    if period == "month":
+        return applied_date[:7] or "unknown"
+    try:
+        year, week, _ = date.fromisoformat(applied_date).isocalendar()
+    except ValueError:
+        return "unknown"
+    return f"{year}-W{week:02d}"
+
+
+def grouped_funnel_metrics(
+    applications: Iterable[JobApplication],
+    by: str,
+    period: str = "month",
+) -> dict[str, FunnelMetrics]:
+    """Funnel metrics per cohort, source or company, in one pass over ``applications``.
+
+    Memory grows with the number of groups, not the number of applications.
+    """
+    if by not in GROUP_BY_FIELDS:
+        raise ValueError(f"Unsupported grouping: {by}")
+    if period not in COHORT_PERIODS:
+        raise ValueError(f"Unsupported cohort period: {period}")
+
+    groups: dict[str, FunnelAccumulator] = {}
+    # Applications cluster on relatively few dates, so label each date once.
+    cohorts: dict[str, str] = {}
+    for app in applications:
+        if by == "cohort":
+            key = cohorts.get(app.applied_date)
+            if key is None:
+                key = cohorts[app.applied_date] = cohort_key(app.applied_date, period)
+        else:
+            key = getattr(app, by)
+        acc = groups.get(key)
+        if acc is None:
+            acc = groups[key] = FunnelAccumulator()
+        acc.add(app)
+    return {key: groups[key].metrics() for key in sorted(groups)}
@@ -0,0 +1,299 @@
+from __future__ import annotations
+
+import asyncio
+import queue
+import random
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, TypeVar
+
+from .analytics import FunnelMetrics
+from .db import BUSY_TIMEOUT_MS, connect, init_db
+from .models import JobApplication
+from .repository import ApplicationRepository
+
+T = TypeVar("T")
+
+# Most writes a single transaction may absorb while the writer drains its queue.
+WRITE_BATCH_SIZE = 256
+READ_POOL_SIZE = 4
+
+# Sentinel that tells the writer thread to finish its queue and exit.
+_STOP = object()
+
+
+@dataclass(slots=True, frozen=True)
+class RetryPolicy:
+    """How the writer retries ``BEGIN IMMEDIATE`` once the busy timeout has already expired."""
+    attempts: int = 5
+    backoff_ms: float = 25.0
+    max_backoff_ms: float = 1000.0
+
+    def delays(self) -> list[float]:
+        # Exponential backoff with jitter so competing processes do not retry in lockstep.
+        return [
+            min(self.backoff_ms * 2**attempt, self.max_backoff_ms) * random.uniform(0.5, 1.0) / 1000
+            for attempt in range(self.attempts - 1)
+        ]
+
+
+def _is_busy(exc: sqlite3.OperationalError) -> bool:
+    message = str(exc)
+    return "locked" in message or "busy" in message
+
+
+@dataclass(slots=True)
+class _WriteOp:
+    method: str
+    args: tuple[Any, ...]
+    kwargs: dict[str, Any]
+    future: asyncio.Future[Any]
+
+
+class AsyncApplicationRepository:
+    """asyncio front end for a database shared with other processes.
+
+    All writes go through one writer thread that owns the only write connection.
+    Operations queued while a transaction is running are coalesced into the next
+    one (up to ``write_batch_size``), so N concurrent writers cost one commit
+    rather than N. Each awaited write resolves only after its transaction has
+    committed; a failing operation raises for its caller without affecting the
+    rest of the batch. Reads run on a small pool of read-only connections, which
+    under WAL never wait on the writer.
+
+        async with AsyncApplicationRepository("applications.db") as repo:
+            app_id = await repo.add_application(company="Acme", role="Engineer")
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        profile: str = "default",
+        readers: int = READ_POOL_SIZE,
+        write_batch_size: int = WRITE_BATCH_SIZE,
+        busy_timeout_ms: int = BUSY_TIMEOUT_MS,
+        retry: RetryPolicy = RetryPolicy(),
+    ):
+        if db_path == ":memory:":
+            raise ValueError("AsyncApplicationRepository needs a database file shared by its connections")
+        self.db_path = db_path
+        self.profile = profile
+        self.readers = readers
+        self.write_batch_size = write_batch_size
+        self.busy_timeout_ms = busy_timeout_ms
+        self.retry = retry
+        self.commits = 0
+        self._queue: queue.SimpleQueue[_WriteOp | object] = queue.SimpleQueue()
+        self._writer: threading.Thread | None = None
+        # Guards _closing so no write can be queued behind _STOP, where nothing would ever run it.
+        self._lock = threading.Lock()
+        self._closing = False
+        # Set if the writer thread died; later writes fail with it instead of queueing.
+        self._writer_error: BaseException | None = None
+        self._pool: asyncio.Queue[sqlite3.Connection] | None = None
+        self._read_conns: list[sqlite3.Connection] = []
+
+    async def __aenter__(self) -> AsyncApplicationRepository:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.close()
+
+    async def start(self) -> None:
+        loop = asyncio.get_running_loop()
+        ready: asyncio.Future[None] = loop.create_future()
+        self._writer = threading.Thread(target=self._writer_main, args=(loop, ready), name="jobtracker-writer", daemon=True)
+        self._writer.start()
+        # The writer creates and migrates the file before any read-only connection opens it.
+        await ready
+        self._closing = False
+        self._writer_error = None
+
+        self._pool = asyncio.Queue()
+        for _ in range(self.readers):
+            conn = connect(
+                self.db_path,
+                profile=self.profile,
+                busy_timeout_ms=self.busy_timeout_ms,
+                read_only=True,
+                check_same_thread=False,
+            )
+            self._read_conns.append(conn)
+            self._pool.put_nowait(conn)
+
+    async def close(self) -> None:
+        if self._writer is not None:
+            with self._lock:
+                self._closing = True
+                self._queue.put(_STOP)
+            await asyncio.to_thread(self._writer.join)
+            self._writer = None
+        for conn in self._read_conns:
+            conn.close()
+        self._read_conns.clear()
+        self._pool = None
+
+    # Writes
+
+    async def add_application(
+        self,
+        company: str,
+        role: str,
+        source: str = "unknown",
+        applied_date: str | None = None,
+        notes: str = "",
+    ) -> int:
+        return await self._write(
+            "add_application", company, role, source=source, applied_date=applied_date, notes=notes
+        )
+
+    async def update_status(self, application_id: int, new_status: str) -> bool:
+        return await self._write("update_status", application_id, new_status)
+
+    async def _write(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        future = asyncio.get_running_loop().create_future()
+        with self._lock:
+            if self._writer is None:
+                raise RuntimeError("AsyncApplicationRepository is not started")
+            if self._writer_error is not None:
+                raise RuntimeError("AsyncApplicationRepository writer has stopped") from self._writer_error
+            if self._closing:
+                raise RuntimeError("AsyncApplicationRepository is closing")
+            self._queue.put(_WriteOp(method, args, kwargs, future))
+        return await future
+
+    def _writer_main(self, loop: asyncio.AbstractEventLoop, ready: asyncio.Future[None]) -> None:
+        try:
+            conn = connect(self.db_path, profile=self.profile, busy_timeout_ms=self.busy_timeout_ms)
+            init_db(conn)
+            # Transactions are managed explicitly below.
+            conn.isolation_level = None
+        except BaseException as exc:
+            loop.call_soon_threadsafe(_settle, ready, None, exc)
+            return
+        loop.call_soon_threadsafe(_settle, ready, None, None)
+
+        repo = ApplicationRepository(conn, autocommit=False)
+        ops: list[_WriteOp] = []
+        try:
+            stopping = False
+            while not stopping:
+                batch = [self._queue.get()]
+                # Everything that queued up during the previous commit joins this transaction.
+                while len(batch) < self.write_batch_size:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                ops = [op for op in batch if op is not _STOP]
+                stopping = len(ops) != len(batch)
+                if ops:
+                    self._run_batch(repo, ops, loop)
+        except BaseException as exc:
+            # The writer cannot go on: fail its batch and everything still queued so no caller awaits forever.
+            with self._lock:
+                self._writer_error = exc
+            for op in ops + self._drain_queue():
+                _notify(loop, op.future, None, exc)
+        finally:
+            conn.close()
+
+    def _drain_queue(self) -> list[_WriteOp]:
+        ops = []
+        while True:
+            try:
+                op = self._queue.get_nowait()
+            except queue.Empty:
+                return ops
+            if op is not _STOP:
+                ops.append(op)
+
+    def _run_batch(self, repo: ApplicationRepository, ops: list[_WriteOp], loop: asyncio.AbstractEventLoop) -> None:
+        conn = repo.conn
+        outcomes: list[tuple[Any, BaseException | None]] = []
+        try:
+            self._begin(conn)
+            for op in ops:
+                try:
+                    outcomes.append((getattr(repo, op.method)(*op.args, **op.kwargs), None))
+                except sqlite3.OperationalError:
+                    # Lock or I/O trouble: give up on the whole transaction.
+                    raise
+                except Exception as exc:
+                    # SQLite rolled back just the failing statement; the rest of the batch stands.
+                    outcomes.append((None, exc))
+            conn.execute("COMMIT")
+            self.commits += 1
+        except sqlite3.Error as exc:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            outcomes = [(None, exc)] * len(ops)
+        for op, (result, error) in zip(ops, outcomes):
+            _notify(loop, op.future, result, error)
+
+    def _begin(self, conn: sqlite3.Connection) -> None:
+        # IMMEDIATE takes the write lock up front, so the busy timeout applies here
+        # instead of surfacing as SQLITE_BUSY halfway through the batch.
+        for delay in [*self.retry.delays(), None]:
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                return
+            except sqlite3.OperationalError as exc:
+                if delay is None or not _is_busy(exc):
+                    raise
+                time.sleep(delay)
+
+    # Reads
+
+    async def get_application(self, application_id: int) -> JobApplication | None:
+        return await self._read(lambda repo: repo.get_application(application_id))
+
+    async def list_applications(self, status: str | None = None, limit: int | None = None) -> list[JobApplication]:
+        return await self._read(lambda repo: list(repo.iter_applications(status=status, limit=limit)))
+
+    async def search(
+        self, query: str, limit: int = 20, prefix: bool = False, raw: bool = False
+    ) -> list[JobApplication]:
+        return await self._read(lambda repo: repo.search(query, limit=limit, prefix=prefix, raw=raw))
+
+    async def funnel_metrics(self) -> FunnelMetrics:
+        return await self._read(lambda repo: repo.funnel_metrics())
+
+    async def _read(self, query: Callable[[ApplicationRepository], T]) -> T:
+        if self._pool is None:
+            raise RuntimeError("AsyncApplicationRepository is not started")
+        conn = await self._pool.get()
+        try:
+            return await asyncio.to_thread(_run_read, conn, query)
+        finally:
+            self._pool.put_nowait(conn)
+
+
+def _run_read(conn: sqlite3.Connection, query: Callable[[ApplicationRepository], T]) -> T:
+    try:
+        return query(ApplicationRepository(conn, autocommit=False))
+    finally:
+        # End the implicit read transaction so the next read sees fresh commits.
+        if conn.in_transaction:
+            conn.rollback()
+
+
+def _notify(
+    loop: asyncio.AbstractEventLoop, future: asyncio.Future[Any], result: Any, error: BaseException | None
+) -> None:
+    try:
+        loop.call_soon_threadsafe(_settle, future, result, error)
+    except RuntimeError:
+        pass  # The loop is closed, so nobody can be awaiting the future any more.
+
+
+def _settle(future: asyncio.Future[Any], result: Any, error: BaseException | None) -> None:
+    if future.done():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import json
+import queue
+import shlex
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Iterable
+
+from .repository import ApplicationRepository
+
+# Group-commit defaults for the batch command.
+BATCH_COMMIT_EVERY = 500
+BATCH_COMMIT_INTERVAL_MS = 200
+# Lines the reader thread may run ahead of SQLite, in multiples of commit_every.
+READ_AHEAD_GROUPS = 4
+
+
+@dataclass(slots=True)
+class BatchResult:
+    """Outcome of one batch operation, reported once its transaction has committed."""
+    line: int
+    op: str
+    ok: bool
+    data: dict[str, object] = field(default_factory=dict)
+    error: str | None = None
+
+    def to_json(self) -> str:
+        payload: dict[str, object] = {"line": self.line, "op": self.op, "ok": self.ok, **self.data}
+        if self.error is not None:
+            payload["error"] = self.error
+        return json.dumps(payload)
+
+
+@dataclass(slots=True)
+class BatchSummary:
+    operations: int = 0
+    failed: int = 0
+    commits: int = 0
+
+
+def parse_operation(line: str) -> dict[str, object]:
+    """Parse a JSON object or a CLI-style line such as ``add --company X --role Y``."""
+    text = line.strip()
+    if text.startswith("{"):
+        operation = json.loads(text)
+        if not isinstance(operation, dict) or "op" not in operation:
+            raise ValueError("JSON operations need an 'op' field")
+        return operation
+
+    tokens = shlex.split(text)
+    operation: dict[str, object] = {"op": tokens[0]}
+    args = tokens[1:]
+    if len(args) % 2 or not all(key.startswith("--") for key in args[::2]):
+        raise ValueError("expected '--option value' pairs after the operation name")
+    for key, value in zip(args[::2], args[1::2]):
+        operation[key[2:].replace("-", "_")] = value
+    return operation
+
+
+_END = object()
+
+
+def _read_lines(lines: Iterable[str], inbox: queue.Queue, stop: threading.Event) -> None:
+    def put(item: object) -> bool:
+        # The inbox is bounded; give up once run_batch has returned and nobody drains it.
+        while not stop.is_set():
+            try:
+                inbox.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    try:
+        for line in lines:
+            if not put(line):
+                return
+    except BaseException as exc:  # handed to run_batch, which re-raises it
+        put(exc)
+    else:
+        put(_END)
+
+
+def _apply(repo: ApplicationRepository, operation: dict[str, object]) -> dict[str, object]:
+    op = str(operation["op"]).replace("_", "-")
+    if op == "add":
+        app_id = repo.add_application(
+            company=str(operation["company"]),
+            role=str(operation["role"]),
+            source=str(operation.get("source") or "unknown"),
+            applied_date=operation.get("applied_date") or None,
+            notes=str(operation.get("notes") or ""),
+        )
+        return {"id": app_id}
+    if op == "update-status":
+        app_id = int(operation["id"])
+        if not repo.update_status(app_id, str(operation["status"])):
+            raise LookupError(f"Application #{app_id} not found")
+        return {"id": app_id, "status": operation["status"]}
+    raise ValueError(f"Unsupported batch operation: {op}")
+
+
+def run_batch(
+    repo: ApplicationRepository,
+    lines: Iterable[str],
+    on_result: Callable[[BatchResult], None],
+    commit_every: int = BATCH_COMMIT_EVERY,
+    commit_interval_ms: float = BATCH_COMMIT_INTERVAL_MS,
+) -> BatchSummary:
+    """Run operations against one connection, committing every N ops or T milliseconds.
+
+    ``repo`` must have ``autocommit=False``. Results are buffered and passed to
+    ``on_result`` right after the commit that made them durable. A failing
+    operation is reported and skipped without affecting the rest of its group.
+    The interval is enforced even while no new line arrives. Blank lines and
+    ``#`` comments are ignored. If reading ``lines`` fails, the operations
+    already applied are committed and reported before the error is re-raised.
+    """
+    if repo.autocommit:
+        raise ValueError("run_batch needs a repository created with autocommit=False")
+    if commit_every < 1:
+        raise ValueError("commit_every must be at least 1")
+
+    summary = BatchSummary()
+    pending: list[BatchResult] = []
+    group_started = 0.0
+
+    def flush() -> None:
+        repo.conn.commit()
+        summary.commits += 1
+        for result in pending:
+            on_result(result)
+        pending.clear()
+
+    # Lines are read on a separate thread so a quiet input (an idle stdin pipe)
+    # cannot hold a pending group, and the write lock, past the commit interval.
+    # The inbox is bounded so a fast reader cannot buffer the whole input.
+    inbox: queue.Queue = queue.Queue(maxsize=commit_every * READ_AHEAD_GROUPS)
+    stop = threading.Event()
+    threading.Thread(target=_read_lines, args=(lines, inbox, stop), name="batch-reader", daemon=True).start()
+
+    number = 0
+    try:
+        while True:
+            if pending:
+                remaining = commit_interval_ms / 1000 - (time.monotonic() - group_started)
+                try:
+                    line = inbox.get(timeout=max(remaining, 0))
+                except queue.Empty:
+                    flush()
+                    continue
+            else:
+                line = inbox.get()
+            if line is _END:
+                break
+            if isinstance(line, BaseException):
+                # Operations already applied stay durable and reported, as on a normal end of input.
+                if pending:
+                    flush()
+                raise line
+            number += 1
+            if not line.strip() or line.lstrip().startswith("#"):
+                continue
+
+            op = "?"
+            try:
+                operation = parse_operation(line)
+                op = str(operation["op"])
+                result = BatchResult(number, op, True, _apply(repo, operation))
+            except (KeyError, LookupError, TypeError, ValueError, sqlite3.Error) as exc:
+                message = f"missing field {exc}" if isinstance(exc, KeyError) else str(exc)
+                result = BatchResult(number, op, False, error=message)
+                summary.failed += 1
+
+            if not pending:
+                group_started = time.monotonic()
+            pending.append(result)
+            summary.operations += 1
+            if len(pending) >= commit_every or (time.monotonic() - group_started) * 1000 >= commit_interval_ms:
+                flush()
+    finally:
+        stop.set()
+
+    if pending:
+        flush()
+    return summary
@@ -1,17 +1,48 @@
 from __future__ import annotations
 
 import argparse
+import sqlite3
 import sys
+import time
+from datetime import date
 
-from .analytics import build_funnel_metrics
-from .db import connect, init_db
-from .models import ApplicationStatus
-from .repository import ApplicationRepository
+from .analytics import COHORT_PERIODS, GROUP_BY_FIELDS, build_funnel_metrics, grouped_funnel_metrics
+from .batch import BATCH_COMMIT_EVERY, BATCH_COMMIT_INTERVAL_MS, run_batch
+from .db import BUSY_TIMEOUT_MS, DB_PROFILES, connect, init_db, rebuild_search_index
+from .export import COMPRESSIONS, EXPORT_CHUNK_SIZE, EXPORT_FORMATS, export_applications
+from .models import ApplicationStatus, JobApplication
+from .repository import IMPORT_CHUNK_SIZE, ApplicationRepository
+
+
+def _positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
+
+
+def _iso_date(value: str) -> str:
+    try:
+        return date.fromisoformat(value).isoformat()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected a YYYY-MM-DD date, got {value!r}") from None
 
 
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(prog="jobtracker", description="Track job applications and report funnel metrics.")
     parser.add_argument("--db", default="applications.db", help="Path to SQLite database file")
+    parser.add_argument(
+        "--db-profile",
+        choices=list(DB_PROFILES),
+        default="default",
+        help="Connection pragma profile (journal mode, synchronous, cache and mmap sizes)",
+    )
+    parser.add_argument(
+        "--busy-timeout-ms",
+        type=int,
+        default=BUSY_TIMEOUT_MS,
+        help="How long to wait for another process's write lock before failing",
+    )
 
     sub = parser.add_subparsers(dest="command", required=True)
 
@@ -26,27 +57,81 @@ def build_parser() -> argparse.ArgumentParser:
 
     list_cmd = sub.add_parser("list", help="List applications")
     list_cmd.add_argument("--status", choices=[s.value for s in ApplicationStatus], default=None)
+    list_cmd.add_argument("--limit", type=_positive_int, default=None, help="Show at most this many applications")
+    list_cmd.add_argument("--after-id", type=int, default=None, help="Continue after this application (keyset page)")
+
+    search = sub.add_parser("search", help="Full-text search over company, role and notes")
+    search.add_argument("query", help="Words that must all match, e.g. 'python remote' or 'AT&T'")
+    search.add_argument("--limit", type=_positive_int, default=20)
+    search_mode = search.add_mutually_exclusive_group()
+    search_mode.add_argument("--prefix", action="store_true", help="Treat every word as a prefix")
+    search_mode.add_argument("--raw", action="store_true", help="Pass the query as FTS5 syntax, e.g. 'python OR rust'")
+
+    sub.add_parser("rebuild-search-index", help="Rebuild the full-text search index from the applications table")
 
     update = sub.add_parser("update-status", help="Update status for an existing application")
     update.add_argument("--id", type=int, required=True)
     update.add_argument("--status", choices=[s.value for s in ApplicationStatus], required=True)
 
-    sub.add_parser("stats", help="Show funnel metrics")
+    stats = sub.add_parser("stats", help="Show funnel metrics")
+    stats.add_argument("--stages", action="store_true", help="Also show average days per status transition")
+    stats.add_argument("--by", choices=GROUP_BY_FIELDS, help="Break metrics down by application cohort, source or company")
+    stats.add_argument("--period", choices=COHORT_PERIODS, default="month", help="Cohort width for --by cohort")
+    stats.add_argument("--since", type=_iso_date, help="Only count applications applied on or after this date (YYYY-MM-DD)")
 
-    export_cmd = sub.add_parser("export-csv", help="Export applications to CSV")
+    export_cmd = sub.add_parser("export", aliases=["export-csv"], help="Export applications (streamed in chunks)")
     export_cmd.add_argument("--output", required=True)
+    export_cmd.add_argument("--format", choices=EXPORT_FORMATS, default="csv", help="parquet/arrow need pyarrow")
+    export_cmd.add_argument(
+        "--compression",
+        choices=COMPRESSIONS,
+        default=None,
+        help="Defaults to the output suffix (.gz, .zst); zstd needs zstandard",
+    )
+    export_cmd.add_argument("--since", type=_iso_date, help="Only applications applied on or after this date (YYYY-MM-DD)")
+    export_cmd.add_argument("--status", choices=[s.value for s in ApplicationStatus], default=None)
+    export_cmd.add_argument("--where", help="Extra SQL condition, e.g. \"source = 'referral'\"")
+    export_cmd.add_argument(
+        "--chunk-size", type=_positive_int, default=EXPORT_CHUNK_SIZE, help="Rows fetched per round trip"
+    )
 
     import_cmd = sub.add_parser("import-csv", help="Import applications from CSV")
     import_cmd.add_argument("--input", required=True)
+    import_cmd.add_argument("--chunk-size", type=_positive_int, default=IMPORT_CHUNK_SIZE, help="Rows per insert batch")
+    import_cmd.add_argument("--progress", action="store_true", help="Report progress to stderr while importing")
+    import_cmd.add_argument(
+        "--upsert",
+        action="store_true",
+        help="Merge rows into existing applications with the same company, role and applied date",
+    )
+
+    batch = sub.add_parser(
+        "batch",
+        help="Run many add/update-status operations (JSONL or CLI-style lines) over one connection",
+    )
+    batch.add_argument("--input", default="-", help="File of operations, one per line ('-' for stdin)")
+    batch.add_argument(
+        "--commit-every", type=_positive_int, default=BATCH_COMMIT_EVERY, help="Commit after this many operations"
+    )
+    batch.add_argument(
+        "--commit-interval-ms",
+        type=float,
+        default=BATCH_COMMIT_INTERVAL_MS,
+        help="Commit once the oldest uncommitted operation is this old",
+    )
 
     return parser
 
 
+def _format_row(row: JobApplication) -> str:
+    return f"{row.id:>3} | {row.applied_date} | {row.company:<24} | {row.role:<24} | {row.status}"
+
+
 def main(argv: list[str] | None = None) -> int:
     parser = build_parser()
     args = parser.parse_args(argv)
 
-    conn = connect(args.db)
+    conn = connect(args.db, profile=args.db_profile, busy_timeout_ms=args.busy_timeout_ms)
     repo = ApplicationRepository(conn)
 
     if args.command == "init-db":
@@ -68,14 +153,68 @@ def main(argv: list[str] | None = None) -> int:
         return 0
 
     if args.command == "list":
-        rows = repo.list_applications(status=args.status)
+        after = None
+        if args.after_id is not None:
+            anchor = repo.get_application(args.after_id)
+            if anchor is None:
+                print(f"Application #{args.after_id} not found")
+                return 1
+            after = (anchor.applied_date, anchor.id)
+
+        # Fetch one extra row to learn whether another page exists.
+        limit = args.limit + 1 if args.limit is not None else None
+        shown = 0
+        last = None
+        for row in repo.iter_applications(status=args.status, limit=limit, after=after):
+            if args.limit is not None and shown == args.limit:
+                print(f"More results: --after-id {last.id}")
+                break
+            print(_format_row(row))
+            shown += 1
+            last = row
+        if not shown:
+            print("No applications found")
+        return 0
+
+    if args.command == "search":
+        try:
+            rows = repo.search(args.query, limit=args.limit, prefix=args.prefix, raw=args.raw)
+        except ValueError as exc:
+            print(exc)
+            return 1
         if not rows:
             print("No applications found")
             return 0
         for row in rows:
-            print(f"{row.id:>3} | {row.applied_date} | {row.company:<24} | {row.role:<24} | {row.status}")
+            print(_format_row(row))
         return 0
 
+    if args.command == "rebuild-search-index":
+        rebuild_search_index(conn)
+        print("Rebuilt full-text search index")
+        return 0
+
+    if args.command == "batch":
+        batch_repo = ApplicationRepository(conn, autocommit=False)
+        handle = sys.stdin if args.input == "-" else open(args.input, "r", encoding="utf-8")
+        started = time.perf_counter()
+        with handle:
+            summary = run_batch(
+                batch_repo,
+                handle,
+                on_result=lambda result: print(result.to_json()),
+                commit_every=args.commit_every,
+                commit_interval_ms=args.commit_interval_ms,
+            )
+        elapsed = time.perf_counter() - started
+        rate = summary.operations / elapsed if elapsed > 0 else 0.0
+        print(
+            f"Ran {summary.operations} operations ({summary.failed} failed) in {summary.commits} commits, "
+            f"{elapsed:.2f}s ({rate:,.0f} ops/s)",
+            file=sys.stderr,
+        )
+        return 1 if summary.failed else 0
+
     if args.command == "update-status":
         changed = repo.update_status(args.id, args.status)
         if not changed:
@@ -84,8 +223,23 @@ def main(argv: list[str] | None = None) -> int:
         print(f"Updated application #{args.id} to '{args.status}'")
         return 0
 
+    if args.command == "stats" and args.by:
+        applications = repo.iter_applications(since=args.since)
+        groups = grouped_funnel_metrics(applications, args.by, args.period)
+        print(f"{args.by:<24} {'total':>7} {'intvw':>6} {'offers':>6} {'rej':>6} {'resp':>6} {'offer':>6} {'days':>6}")
+        for key, group in groups.items():
+            print(
+                f"{key:<24} {group.total:>7} {group.interviews:>6} {group.offers:>6} {group.rejected:>6} "
+                f"{group.response_rate:>6.1%} {group.offer_rate:>6.1%} {group.avg_days_to_update:>6}"
+            )
+        return 0
+
     if args.command == "stats":
-        metrics = build_funnel_metrics(repo.iter_all())
+        # The counters cover the whole table; a date window has to stream the matching rows.
+        if args.since:
+            metrics = build_funnel_metrics(repo.iter_applications(since=args.since))
+        else:
+            metrics = repo.funnel_metrics()
         print(f"Total applications:     {metrics.total}")
         print(f"Interview-stage count: {metrics.interviews}")
         print(f"Offers:                {metrics.offers}")
@@ -93,16 +247,49 @@ def main(argv: list[str] | None = None) -> int:
         print(f"Response rate:         {metrics.response_rate:.1%}")
         print(f"Offer rate:            {metrics.offer_rate:.1%}")
         print(f"Avg days to update:    {metrics.avg_days_to_update}")
+        if args.stages:
+            print()
+            for stage in repo.stage_durations(since=args.since):
+                transition = f"{stage.from_status} -> {stage.to_status}"
+                print(f"{transition:<28} {stage.transitions:>6}  avg {stage.avg_days} days")
         return 0
 
-    if args.command == "export-csv":
-        total = repo.export_csv(args.output)
+    if args.command in ("export", "export-csv"):
+        try:
+            total = export_applications(
+                conn,
+                args.output,
+                fmt=args.format,
+                compression=args.compression,
+                since=args.since,
+                status=args.status,
+                where=args.where,
+                chunk_size=args.chunk_size,
+            )
+        except (RuntimeError, ValueError, sqlite3.Error) as exc:
+            print(f"Export failed: {exc}")
+            return 1
         print(f"Exported {total} applications to {args.output}")
         return 0
 
     if args.command == "import-csv":
-        imported = repo.import_csv(args.input)
-        print(f"Imported {imported} applications from {args.input}")
+        def report(count: int) -> None:
+            print(f"\rImported {count} rows...", end="", file=sys.stderr, flush=True)
+
+        started = time.perf_counter()
+        progress = report if args.progress else None
+        if args.upsert:
+            summary = repo.upsert_csv(args.input, chunk_size=args.chunk_size, progress=progress)
+            imported = summary.total
+        else:
+            imported = repo.import_csv(args.input, chunk_size=args.chunk_size, progress=progress)
+        elapsed = time.perf_counter() - started
+        if args.progress:
+            print(file=sys.stderr)
+        rate = imported / elapsed if elapsed > 0 else 0.0
+        print(f"Imported {imported} applications from {args.input} in {elapsed:.2f}s ({rate:,.0f} rows/s)")
+        if args.upsert:
+            print(f"{summary.inserted} inserted, {summary.updated} updated, {summary.unchanged} unchanged")
         return 0
 
     parser.print_help()
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import sqlite3
+from pathlib import Path
 
 SCHEMA_SQL = """
 CREATE TABLE IF NOT EXISTS applications (
@@ -18,15 +19,245 @@ CREATE INDEX IF NOT EXISTS idx_applications_status ON applications(status);
 CREATE INDEX IF NOT EXISTS idx_applications_company ON applications(company);
 """
 
+# External-content FTS5 index over the searchable text columns, kept in sync by triggers.
+SEARCH_SCHEMA_SQL = """
+CREATE VIRTUAL TABLE IF NOT EXISTS applications_fts USING fts5(
+    company,
+    role,
+    notes,
+    content='applications',
+    content_rowid='id',
+    prefix='2 3'
+);
+
+CREATE TRIGGER IF NOT EXISTS applications_fts_insert AFTER INSERT ON applications BEGIN
+    INSERT INTO applications_fts(rowid, company, role, notes) VALUES (new.id, new.company, new.role, new.notes);
+END;
+
+CREATE TRIGGER IF NOT EXISTS applications_fts_delete AFTER DELETE ON applications BEGIN
+    INSERT INTO applications_fts(applications_fts, rowid, company, role, notes)
+    VALUES ('delete', old.id, old.company, old.role, old.notes);
+END;
+
+CREATE TRIGGER IF NOT EXISTS applications_fts_update AFTER UPDATE OF company, role, notes ON applications BEGIN
+    INSERT INTO applications_fts(applications_fts, rowid, company, role, notes)
+    VALUES ('delete', old.id, old.company, old.role, old.notes);
+    INSERT INTO applications_fts(rowid, company, role, notes) VALUES (new.id, new.company, new.role, new.notes);
+END;
+"""
+
 
-def connect(db_path: str) -> sqlite3.Connection:
+# Connection pragmas per --db-profile. "default" trades the fsync on every commit for WAL's
+# fsync at checkpoint, which is still crash-safe; "fast" may lose the last commits on power loss.
+DB_PROFILES: dict[str, dict[str, str | int]] = {
+    "default": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -16384,
+        "mmap_size": 64 * 1024 * 1024,
+        "temp_store": "MEMORY",
+    },
+    "durable": {"journal_mode": "WAL", "synchronous": "FULL"},
+    "fast": {
+        "journal_mode": "WAL",
+        "synchronous": "OFF",
+        "cache_size": -65536,
+        "mmap_size": 256 * 1024 * 1024,
+        "temp_store": "MEMORY",
+    },
+    # SQLite's own defaults: rollback journal and synchronous=FULL. The journal mode is
+    # set explicitly because a file created under WAL would otherwise stay in WAL.
+    "legacy": {"journal_mode": "DELETE"},
+}
+
+
+# How long a connection waits for another process's lock before raising "database is locked".
+BUSY_TIMEOUT_MS = 5000
+
+
+def connect(
+    db_path: str,
+    profile: str = "default",
+    busy_timeout_ms: int = BUSY_TIMEOUT_MS,
+    read_only: bool = False,
+    check_same_thread: bool = True,
+) -> sqlite3.Connection:
+    if profile not in DB_PROFILES:
+        raise ValueError(f"Unknown database profile: {profile}")
+    target = db_path
+    if read_only:
+        # mode=ro refuses writes at the SQLite level; the file must already exist.
+        target = Path(db_path).absolute().as_uri() + "?mode=ro"
+    conn = sqlite3.connect(
+        target,
+        timeout=busy_timeout_ms / 1000,
+        uri=read_only,
+        check_same_thread=check_same_thread,
+    )
     # Use Row objects so callers can access columns by name (row["status"]).
-    conn = sqlite3.connect(db_path)
     conn.row_factory = sqlite3.Row
+    for pragma, value in DB_PROFILES[profile].items():
+        # The journal mode is a property of the file; readers inherit whatever the writer set.
+        if read_only and pragma == "journal_mode":
+            continue
+        conn.execute(f"PRAGMA {pragma}={value}")
     return conn
 
 
-def init_db(conn: sqlite3.Connection) -> None:
-    # Safe to call on every startup; IF NOT EXISTS keeps this idempotent.
-    conn.executescript(SCHEMA_SQL)
+# Composite indexes matching the hot queries: listing ordered by (applied_date DESC, id DESC),
+# optionally filtered by status. last_updated is appended so the funnel stats aggregate can
+# be answered from the status index alone without touching the (notes-heavy) table rows.
+LIST_INDEXES_SQL = """
+DROP INDEX IF EXISTS idx_applications_status;
+CREATE INDEX IF NOT EXISTS idx_applications_status_applied
+    ON applications(status, applied_date DESC, id DESC, last_updated);
+CREATE INDEX IF NOT EXISTS idx_applications_applied ON applications(applied_date DESC, id DESC);
+"""
+
+# Days from application to last update, as counted by the stats command (0 when the dates do not parse).
+_ROW_TOUCHED = "({row}.applied_date != '' AND {row}.last_updated != '')"
+_ROW_DAYS = (
+    "CASE WHEN {touched} "
+    "THEN COALESCE(MAX(julianday({row}.last_updated) - julianday({row}.applied_date), 0), 0) ELSE 0 END"
+)
+
+
+def _counter_delta(row: str, sign: str) -> str:
+    touched = _ROW_TOUCHED.format(row=row)
+    days = _ROW_DAYS.format(row=row, touched=touched)
+    return f"""
+    INSERT INTO status_counts (status, applications, touched, days_to_update)
+    VALUES ({row}.status, {sign}1, {sign}{touched}, {sign}({days}))
+    ON CONFLICT (status) DO UPDATE SET
+        applications = applications + excluded.applications,
+        touched = touched + excluded.touched,
+        days_to_update = days_to_update + excluded.days_to_update;"""
+
+
+# Append-only status history plus per-status counters, both maintained by triggers so every
+# write path (add, update-status, imports, raw SQL) records them in the same transaction.
+# Rows without history are backfilled: one 'applied' event at applied_date, and for apps already
+# past 'applied' a second event at last_updated.
+STATUS_HISTORY_SQL = f"""
+CREATE TABLE IF NOT EXISTS status_events (
+    id INTEGER PRIMARY KEY,
+    application_id INTEGER NOT NULL,
+    from_status TEXT,
+    to_status TEXT NOT NULL,
+    changed_on TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_status_events_application ON status_events(application_id, id);
+
+CREATE TABLE IF NOT EXISTS status_counts (
+    status TEXT PRIMARY KEY,
+    applications INTEGER NOT NULL DEFAULT 0,
+    touched INTEGER NOT NULL DEFAULT 0,
+    days_to_update REAL NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+
+CREATE TRIGGER IF NOT EXISTS applications_history_insert AFTER INSERT ON applications BEGIN
+    INSERT INTO status_events (application_id, from_status, to_status, changed_on)
+    VALUES (new.id, NULL, 'applied', new.applied_date);
+    INSERT INTO status_events (application_id, from_status, to_status, changed_on)
+    SELECT new.id, 'applied', new.status, new.last_updated WHERE new.status != 'applied';
+    {_counter_delta("new", "+")}
+END;
+
+CREATE TRIGGER IF NOT EXISTS applications_history_status AFTER UPDATE OF status ON applications
+WHEN old.status IS NOT new.status BEGIN
+    INSERT INTO status_events (application_id, from_status, to_status, changed_on)
+    VALUES (new.id, old.status, new.status, new.last_updated);
+END;
+
+CREATE TRIGGER IF NOT EXISTS applications_counts_update
+AFTER UPDATE OF status, applied_date, last_updated ON applications BEGIN
+    {_counter_delta("old", "-")}
+    {_counter_delta("new", "+")}
+END;
+
+CREATE TRIGGER IF NOT EXISTS applications_counts_delete AFTER DELETE ON applications BEGIN
+    {_counter_delta("old", "-")}
+END;
+
+INSERT INTO status_events (application_id, from_status, to_status, changed_on)
+SELECT id, from_status, to_status, changed_on FROM (
+    SELECT id, NULL AS from_status, 'applied' AS to_status, applied_date AS changed_on, 0 AS step
+    FROM applications
+    UNION ALL
+    SELECT id, 'applied', status, last_updated, 1 FROM applications WHERE status != 'applied'
+)
+WHERE id NOT IN (SELECT application_id FROM status_events)
+ORDER BY id, step;
+
+DELETE FROM status_counts;
+INSERT INTO status_counts (status, applications, touched, days_to_update)
+SELECT
+    status,
+    COUNT(*),
+    TOTAL({_ROW_TOUCHED.format(row="applications")}),
+    TOTAL({_ROW_DAYS.format(row="applications", touched=_ROW_TOUCHED.format(row="applications"))})
+FROM applications
+GROUP BY status;
+"""
+
+# Natural key used to merge re-imported rows; the Python side builds the same string in
+# repository.natural_key. It is NULL on later duplicates of a key, so existing duplicates and
+# plain inserts keep working while the first row of each key becomes the upsert target.
+NATURAL_KEY_SQL_EXPR = "company || char(31) || role || char(31) || applied_date"
+
+NATURAL_KEY_SQL = f"""
+ALTER TABLE applications ADD COLUMN natural_key TEXT;
+ALTER TABLE applications ADD COLUMN content_hash INTEGER;
+
+UPDATE applications SET natural_key = {NATURAL_KEY_SQL_EXPR}
+WHERE id IN (SELECT MIN(id) FROM applications GROUP BY company, role, applied_date);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_applications_natural_key ON applications(natural_key);
+"""
+
+# Ordered schema migrations. PRAGMA user_version stores the number applied so far; each entry
+# runs once, atomically, on databases below its version. Version 1 uses IF NOT EXISTS so
+# databases created before versioning are adopted without changes.
+MIGRATIONS: list[str] = [
+    SCHEMA_SQL,
+    # Building the search index includes a one-time backfill of rows that predate it.
+    SEARCH_SCHEMA_SQL + "INSERT INTO applications_fts(applications_fts) VALUES ('rebuild');",
+    LIST_INDEXES_SQL,
+    STATUS_HISTORY_SQL,
+    # Existing rows get no content_hash; the first upsert import that sees them fills it in.
+    NATURAL_KEY_SQL,
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def schema_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn: sqlite3.Connection) -> int:
+    """Apply pending migrations in order and return how many ran."""
+    current = schema_version(conn)
+    if current > SCHEMA_VERSION:
+        raise RuntimeError(f"Database schema version {current} is newer than this jobtracker ({SCHEMA_VERSION})")
+
+    for version in range(current + 1, SCHEMA_VERSION + 1):
+        try:
+            conn.executescript(f"BEGIN;\n{MIGRATIONS[version - 1]}\nPRAGMA user_version = {version};\nCOMMIT;")
+        except sqlite3.Error:
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+    return SCHEMA_VERSION - current
+
+
+def rebuild_search_index(conn: sqlite3.Connection) -> None:
+    # Re-reads every row of the content table from scratch.
+    conn.execute("INSERT INTO applications_fts(applications_fts) VALUES ('rebuild')")
     conn.commit()
+
+
+def init_db(conn: sqlite3.Connection) -> None:
+    # Safe to call on every startup: an up-to-date database costs one PRAGMA read,
+    # with no DDL and no commit.
+    migrate(conn)
@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import csv
+import gzip
+import io
+import json
+import os
+import sqlite3
+from contextlib import contextmanager
+from dataclasses import fields
+from datetime import date
+from pathlib import Path
+from types import ModuleType
+from typing import Iterator, TextIO
+
+from .models import JobApplication
+
+EXPORT_FORMATS = ("csv", "jsonl", "parquet", "arrow")
+COMPRESSIONS = ("none", "gzip", "zstd")
+
+# Rows fetched and written per round trip; memory stays flat regardless of table size.
+EXPORT_CHUNK_SIZE = 5000
+
+# Same columns and order as JobApplication (and repository.APPLICATION_COLUMNS).
+EXPORT_FIELDS = [field.name for field in fields(JobApplication)]
+
+_SUFFIX_COMPRESSION = {".gz": "gzip", ".zst": "zstd"}
+
+
+# The optional dependencies are imported on first use so other CLI commands do not pay for them.
+def _require_pyarrow() -> ModuleType:
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError as exc:
+        raise RuntimeError(
+            "Parquet and Arrow output require pyarrow (pip install 'job-application-tracker[export]'); "
+            "use --format jsonl for a dependency-free export"
+        ) from exc
+    return pyarrow
+
+
+def _require_zstandard() -> ModuleType:
+    try:
+        import zstandard
+    except ImportError as exc:
+        raise RuntimeError("zstd compression requires zstandard (pip install 'job-application-tracker[export]')") from exc
+    return zstandard
+
+
+def compression_for_path(path: str) -> str:
+    """Guess the compression from the file suffix: ``.gz`` is gzip, ``.zst`` is zstd."""
+    return _SUFFIX_COMPRESSION.get(Path(path).suffix, "none")
+
+
+def build_export_query(
+    since: str | None = None,
+    status: str | None = None,
+    where: str | None = None,
+) -> tuple[str, list[object]]:
+    """SELECT for an export with the filters applied by SQLite rather than in Python.
+
+    ``where`` is a raw SQL condition from the operator running the export, e.g.
+    ``"source = 'referral'"``; it is wrapped in parentheses and ANDed with the rest.
+    """
+    clauses: list[str] = []
+    params: list[object] = []
+    if since is not None:
+        # Stored dates are ISO strings, so only a normalized ISO date compares correctly.
+        clauses.append("applied_date >= ?")
+        params.append(date.fromisoformat(since).isoformat())
+    if status is not None:
+        clauses.append("status = ?")
+        params.append(status)
+    if where:
+        clauses.append(f"({where})")
+
+    query = f"SELECT {', '.join(EXPORT_FIELDS)} FROM applications"
+    if clauses:
+        query += " WHERE " + " AND ".join(clauses)
+    return query + " ORDER BY id", params
+
+
+def iter_export_chunks(
+    conn: sqlite3.Connection,
+    query: str,
+    params: list[object],
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+) -> Iterator[list[tuple]]:
+    """Run ``query`` now and return an iterator over its rows in chunks.
+
+    The first chunk is fetched before returning, so a bad query fails here,
+    before any output file has been touched.
+    """
+    # Plain tuples: the writers below only need positions.
+    cursor = conn.cursor()
+    cursor.row_factory = None
+    cursor.execute(query, params)
+    return _fetch_chunks(cursor, cursor.fetchmany(chunk_size), chunk_size)
+
+
+def _fetch_chunks(cursor: sqlite3.Cursor, chunk: list[tuple], chunk_size: int) -> Iterator[list[tuple]]:
+    while chunk:
+        yield chunk
+        chunk = cursor.fetchmany(chunk_size)
+
+
+@contextmanager
+def _replace_on_success(path: str) -> Iterator[str]:
+    # Write next to the target and rename over it, so a failed export leaves the previous file intact.
+    target = Path(path)
+    tmp = target.with_name(f".{target.name}.tmp")
+    try:
+        yield str(tmp)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    os.replace(tmp, target)
+
+
+@contextmanager
+def _open_text(path: str, compression: str) -> Iterator[TextIO]:
+    if compression == "gzip":
+        with gzip.open(path, "wt", newline="", encoding="utf-8") as handle:
+            yield handle
+    elif compression == "zstd":
+        zstandard = _require_zstandard()
+        with open(path, "wb") as raw, zstandard.ZstdCompressor().stream_writer(raw) as compressed:
+            handle = io.TextIOWrapper(compressed, newline="", encoding="utf-8")
+            yield handle
+            handle.flush()
+            handle.detach()
+    else:
+        with open(path, "w", newline="", encoding="utf-8") as handle:
+            yield handle
+
+
+def _write_csv(handle: TextIO, chunks: Iterator[list[tuple]]) -> int:
+    writer = csv.writer(handle)
+    writer.writerow(EXPORT_FIELDS)
+    total = 0
+    for chunk in chunks:
+        writer.writerows(chunk)
+        total += len(chunk)
+    return total
+
+
+def _write_jsonl(handle: TextIO, chunks: Iterator[list[tuple]]) -> int:
+    total = 0
+    for chunk in chunks:
+        handle.writelines(
+            json.dumps(dict(zip(EXPORT_FIELDS, row)), ensure_ascii=False, separators=(",", ":")) + "\n"
+            for row in chunk
+        )
+        total += len(chunk)
+    return total
+
+
+def _write_arrow(path: str, fmt: str, compression: str, chunks: Iterator[list[tuple]]) -> int:
+    pa = _require_pyarrow()
+    schema = pa.schema([("id", pa.int64())] + [(name, pa.string()) for name in EXPORT_FIELDS[1:]])
+    if fmt == "parquet":
+        writer = pa.parquet.ParquetWriter(path, schema, compression=compression)
+    else:
+        if compression == "gzip":
+            raise ValueError("Arrow IPC files support zstd compression, not gzip")
+        options = pa.ipc.IpcWriteOptions(compression="zstd" if compression == "zstd" else None)
+        writer = pa.ipc.new_file(path, schema, options=options)
+
+    total = 0
+    with writer:
+        for chunk in chunks:
+            arrays = [pa.array(column, type=field.type) for column, field in zip(zip(*chunk), schema)]
+            writer.write_batch(pa.record_batch(arrays, schema=schema))
+            total += len(chunk)
+    return total
+
+
+def export_applications(
+    conn: sqlite3.Connection,
+    output_path: str,
+    fmt: str = "csv",
+    compression: str | None = None,
+    since: str | None = None,
+    status: str | None = None,
+    where: str | None = None,
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+) -> int:
+    """Stream applications in id order to ``output_path`` and return the row count.
+
+    The file is written under a temporary name and renamed into place once
+    complete; on any error an existing ``output_path`` is left unchanged.
+
+    ``compression`` defaults to the one implied by the file suffix. CSV and JSON
+    lines are compressed as a whole file; Parquet and Arrow compress inside the file.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {fmt}")
+    if compression is None:
+        compression = compression_for_path(output_path)
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"Unsupported compression: {compression}")
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+
+    query, params = build_export_query(since=since, status=status, where=where)
+    chunks = iter_export_chunks(conn, query, params, chunk_size)
+    with _replace_on_success(output_path) as tmp_path:
+        if fmt in ("parquet", "arrow"):
+            return _write_arrow(tmp_path, fmt, compression, chunks)
+        with _open_text(tmp_path, compression) as handle:
+            return (_write_csv if fmt == "csv" else _write_jsonl)(handle, chunks)
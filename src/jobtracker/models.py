@@ -14,6 +14,18 @@ class ApplicationStatus(StrEnum):
     WITHDRAWN = "withdrawn"
 
 
+# How far along the funnel each status is. Merges never move an application backwards; the
+# terminal outcomes share a rank so the most recently updated one wins between them.
+STATUS_RANK = {
+    ApplicationStatus.APPLIED: 0,
+    ApplicationStatus.PHONE_SCREEN: 1,
+    ApplicationStatus.INTERVIEW: 2,
+    ApplicationStatus.OFFER: 3,
+    ApplicationStatus.REJECTED: 3,
+    ApplicationStatus.WITHDRAWN: 3,
+}
+
+
 @dataclass(slots=True)
 class JobApplication:
     """In-memory representation of one DB row from the applications table."""
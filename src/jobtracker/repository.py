@@ -1,19 +1,169 @@
 from __future__ import annotations
 
 import csv
+import hashlib
+from contextlib import contextmanager
+from dataclasses import dataclass
 from datetime import date
+from itertools import islice
 import sqlite3
-from typing import Iterable
+from typing import Callable, Iterator
 
-from .models import ApplicationStatus, JobApplication
+from .analytics import INTERVIEW_STAGE_STATUSES, FunnelMetrics, StageDuration, funnel_metrics_from_totals
+from .export import export_applications
+from .models import STATUS_RANK, ApplicationStatus, JobApplication
 
 
 VALID_STATUSES = {status.value for status in ApplicationStatus}
 
+# Rows per executemany batch for import_csv.
+IMPORT_CHUNK_SIZE = 5000
+
+# Parameters: the seven application columns, then natural_key and content_hash.
+_INSERT_COLUMNS = "company, role, status, source, applied_date, last_updated, notes, natural_key, content_hash"
+
+
+def _insert_application_sql(natural_key: str) -> str:
+    # Shared by the plain insert and the upsert, which differ only in how ?8 becomes the key.
+    return f"""
+INSERT INTO applications ({_INSERT_COLUMNS})
+VALUES (?1, ?2, ?3, ?4, ?5, ?6, ?7, {natural_key}, ?9)
+"""
+
+
+# The key is only claimed if no other row holds it yet, so plain inserts still accept duplicates.
+INSERT_APPLICATION_SQL = _insert_application_sql(
+    "(SELECT ?8 WHERE NOT EXISTS (SELECT 1 FROM applications WHERE natural_key = ?8))"
+)
+
+
+def _status_rank_sql(column: str) -> str:
+    cases = " ".join(f"WHEN '{status}' THEN {rank}" for status, rank in STATUS_RANK.items())
+    return f"(CASE {column} {cases} ELSE 0 END)"
+
+
+# Merge a re-imported row into the application with the same natural key. Rows whose content
+# hash matches the last import of that key are skipped without a write. Otherwise the status
+# only moves forward (or sideways to a newer terminal state) and the newer row's details win.
+UPSERT_APPLICATION_SQL = _insert_application_sql("?8") + f"""
+ON CONFLICT (natural_key) DO UPDATE SET
+    status = CASE
+        WHEN {_status_rank_sql("excluded.status")} > {_status_rank_sql("status")}
+          OR ({_status_rank_sql("excluded.status")} = {_status_rank_sql("status")} AND excluded.last_updated > last_updated)
+        THEN excluded.status ELSE status END,
+    source = CASE WHEN excluded.last_updated >= last_updated THEN excluded.source ELSE source END,
+    notes = CASE WHEN excluded.last_updated >= last_updated THEN excluded.notes ELSE notes END,
+    last_updated = MAX(last_updated, excluded.last_updated),
+    content_hash = excluded.content_hash
+WHERE content_hash IS NOT excluded.content_hash
+"""
+
+# Column order matches the JobApplication fields.
+APPLICATION_COLUMNS = "id, company, role, status, source, applied_date, last_updated, notes"
+
+# bm25 column weights for (company, role, notes): a company hit outranks a notes hit.
+SEARCH_WEIGHTS = "5.0, 3.0, 1.0"
+
+# Rows fetched per round trip when streaming applications.
+LIST_BATCH_SIZE = 500
+
+_INTERVIEW_STAGE_SQL = ", ".join(f"'{status}'" for status in sorted(INTERVIEW_STAGE_STATUSES))
+
+FUNNEL_METRICS_SQL = f"""
+SELECT
+    COUNT(*),
+    COUNT(*) FILTER (WHERE status IN ({_INTERVIEW_STAGE_SQL})),
+    COUNT(*) FILTER (WHERE status = 'offer'),
+    COUNT(*) FILTER (WHERE status = 'rejected'),
+    TOTAL(MAX(julianday(last_updated) - julianday(applied_date), 0))
+        FILTER (WHERE applied_date != '' AND last_updated != ''),
+    COUNT(*) FILTER (WHERE applied_date != '' AND last_updated != '')
+FROM applications
+"""
+
+# Same figures read from the trigger-maintained per-status counters: one row per status
+# instead of a scan over every application.
+FUNNEL_COUNTERS_SQL = f"""
+SELECT
+    COALESCE(SUM(applications), 0),
+    COALESCE(SUM(applications) FILTER (WHERE status IN ({_INTERVIEW_STAGE_SQL})), 0),
+    COALESCE(SUM(applications) FILTER (WHERE status = 'offer'), 0),
+    COALESCE(SUM(applications) FILTER (WHERE status = 'rejected'), 0),
+    TOTAL(days_to_update),
+    COALESCE(SUM(touched), 0)
+FROM status_counts
+"""
+
+# Time spent in each stage: the gap between consecutive events of one application.
+STAGE_DURATIONS_SQL = """
+SELECT from_status, to_status, COUNT(*), AVG(MAX(days, 0))
+FROM (
+    SELECT
+        from_status,
+        to_status,
+        julianday(changed_on)
+            - julianday(LAG(changed_on) OVER (PARTITION BY application_id ORDER BY id)) AS days
+    FROM status_events
+    WHERE ?1 IS NULL OR application_id IN (SELECT id FROM applications WHERE applied_date >= ?1)
+)
+WHERE from_status IS NOT NULL AND days IS NOT NULL
+GROUP BY from_status, to_status
+ORDER BY from_status, to_status
+"""
+
+
+def natural_key(company: str, role: str, applied_date: str) -> str:
+    # Must match db.NATURAL_KEY_SQL_EXPR, which backfills existing rows.
+    return f"{company}\x1f{role}\x1f{applied_date}"
+
+
+def content_hash(status: str, source: str, last_updated: str, notes: str) -> int:
+    """64-bit digest of the fields an import can change, stored as a signed SQLite INTEGER."""
+    digest = hashlib.blake2b("\x1f".join((status, source, last_updated, notes)).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+def _insert_params(
+    company: str, role: str, status: str, source: str, applied_date: str, last_updated: str, notes: str
+) -> tuple[object, ...]:
+    return (
+        company,
+        role,
+        status,
+        source,
+        applied_date,
+        last_updated,
+        notes,
+        natural_key(company, role, applied_date),
+        content_hash(status, source, last_updated, notes),
+    )
+
+
+@dataclass(slots=True)
+class ImportSummary:
+    """Row counts from an upsert import."""
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+
+    @property
+    def total(self) -> int:
+        return self.inserted + self.updated + self.unchanged
+
+
+def _application_from_row(cursor: sqlite3.Cursor, row: tuple) -> JobApplication:
+    return JobApplication(*row)
+
 
 class ApplicationRepository:
-    def __init__(self, conn: sqlite3.Connection):
+    def __init__(self, conn: sqlite3.Connection, autocommit: bool = True):
+        # autocommit=False leaves committing to the caller so many writes can share one transaction.
         self.conn = conn
+        self.autocommit = autocommit
+
+    def _commit(self) -> None:
+        if self.autocommit:
+            self.conn.commit()
 
     def add_application(
         self,
@@ -26,37 +176,91 @@ class ApplicationRepository:
         applied = applied_date or date.today().isoformat()
         now = date.today().isoformat()
         cursor = self.conn.execute(
-            """
-            INSERT INTO applications (company, role, status, source, applied_date, last_updated, notes)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-            """,
-            (company.strip(), role.strip(), ApplicationStatus.APPLIED.value, source.strip(), applied, now, notes),
+            INSERT_APPLICATION_SQL,
+            _insert_params(company.strip(), role.strip(), ApplicationStatus.APPLIED.value, source.strip(), applied, now, notes),
         )
-        self.conn.commit()
+        self._commit()
         return int(cursor.lastrowid)
 
-    def list_applications(self, status: str | None = None) -> list[JobApplication]:
-        query = "SELECT * FROM applications"
-        params: tuple[str, ...] = ()
+    def get_application(self, application_id: int) -> JobApplication | None:
+        cursor = self.conn.cursor()
+        cursor.row_factory = _application_from_row
+        return cursor.execute(
+            f"SELECT {APPLICATION_COLUMNS} FROM applications WHERE id = ?", (application_id,)
+        ).fetchone()
+
+    def iter_applications(
+        self,
+        status: str | None = None,
+        limit: int | None = None,
+        after: tuple[str, int] | None = None,
+        batch_size: int = LIST_BATCH_SIZE,
+        since: str | None = None,
+    ) -> Iterator[JobApplication]:
+        """Stream applications newest-first, fetching ``batch_size`` rows at a time.
+
+        ``after`` is a keyset cursor ``(applied_date, id)`` taken from the last row
+        of the previous page, so each page starts with an index seek instead of
+        skipping over earlier rows. ``since`` keeps applications with
+        ``applied_date >= since``; it must be an ISO date, which then compares as a string.
+        """
+        clauses: list[str] = []
+        params: list[object] = []
         if status:
-            query += " WHERE status = ?"
-            params = (status,)
+            clauses.append("status = ?")
+            params.append(status)
+        if after is not None:
+            clauses.append("(applied_date, id) < (?, ?)")
+            params.extend(after)
+        if since is not None:
+            clauses.append("applied_date >= ?")
+            params.append(date.fromisoformat(since).isoformat())
+
+        query = f"SELECT {APPLICATION_COLUMNS} FROM applications"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
         query += " ORDER BY applied_date DESC, id DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
 
-        rows = self.conn.execute(query, params).fetchall()
-        return [
-            JobApplication(
-                id=row["id"],
-                company=row["company"],
-                role=row["role"],
-                status=row["status"],
-                source=row["source"],
-                applied_date=row["applied_date"],
-                last_updated=row["last_updated"],
-                notes=row["notes"],
-            )
-            for row in rows
-        ]
+        # Positional rows straight into the dataclass; no sqlite3.Row name lookups.
+        cursor = self.conn.cursor()
+        cursor.row_factory = _application_from_row
+        cursor.execute(query, params)
+        while batch := cursor.fetchmany(batch_size):
+            yield from batch
+
+    def search(self, query: str, limit: int = 20, prefix: bool = False, raw: bool = False) -> list[JobApplication]:
+        """Full-text search over company, role and notes, best bm25 match first.
+
+        Every whitespace-separated word of ``query`` must match, taken literally
+        (``AT&T``, ``C++``, ``remote-first``); ``prefix=True`` also matches words
+        that merely start with it. ``raw=True`` passes ``query`` through as an
+        FTS5 expression instead, e.g. ``python OR rust`` or ``data*``.
+        """
+        if not raw:
+            suffix = "*" if prefix else ""
+            query = " ".join('"' + word.replace('"', '""') + '"' + suffix for word in query.split())
+        cursor = self.conn.cursor()
+        cursor.row_factory = _application_from_row
+        try:
+            return cursor.execute(
+                f"""
+                SELECT {", ".join(f"a.{column}" for column in APPLICATION_COLUMNS.split(", "))}
+                FROM applications_fts
+                JOIN applications AS a ON a.id = applications_fts.rowid
+                WHERE applications_fts MATCH ?
+                ORDER BY bm25(applications_fts, {SEARCH_WEIGHTS})
+                LIMIT ?
+                """,
+                (query, limit),
+            ).fetchall()
+        except sqlite3.OperationalError as exc:
+            raise ValueError(f"Invalid search query {query!r}: {exc}") from None
+
+    def list_applications(self, status: str | None = None) -> list[JobApplication]:
+        return list(self.iter_applications(status=status))
 
     def update_status(self, application_id: int, new_status: str) -> bool:
         if new_status not in VALID_STATUSES:
@@ -66,56 +270,118 @@ class ApplicationRepository:
             "UPDATE applications SET status = ?, last_updated = ? WHERE id = ?",
             (new_status, date.today().isoformat(), application_id),
         )
-        self.conn.commit()
+        self._commit()
         return cursor.rowcount > 0
 
     def export_csv(self, output_path: str) -> int:
-        rows = self.conn.execute("SELECT * FROM applications ORDER BY id").fetchall()
-        with open(output_path, "w", newline="", encoding="utf-8") as handle:
-            writer = csv.DictWriter(
-                handle,
-                fieldnames=[
-                    "id",
-                    "company",
-                    "role",
-                    "status",
-                    "source",
-                    "applied_date",
-                    "last_updated",
-                    "notes",
-                ],
-            )
-            writer.writeheader()
-            writer.writerows([dict(row) for row in rows])
-        return len(rows)
+        """Write every application to a CSV file, streamed in chunks; see ``export.export_applications``."""
+        return export_applications(self.conn, output_path, fmt="csv", compression="none")
 
-    def import_csv(self, input_path: str) -> int:
-        imported = 0
-        with open(input_path, "r", newline="", encoding="utf-8") as handle:
-            reader = csv.DictReader(handle)
-            for row in reader:
-                status = row.get("status", ApplicationStatus.APPLIED.value)
-                if status not in VALID_STATUSES:
-                    status = ApplicationStatus.APPLIED.value
-
-                self.conn.execute(
-                    """
-                    INSERT INTO applications (company, role, status, source, applied_date, last_updated, notes)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        (row.get("company") or "Unknown").strip(),
-                        (row.get("role") or "Unknown").strip(),
-                        status,
-                        (row.get("source") or "unknown").strip(),
-                        row.get("applied_date") or date.today().isoformat(),
-                        row.get("last_updated") or date.today().isoformat(),
-                        row.get("notes") or "",
-                    ),
-                )
-                imported += 1
+    @contextmanager
+    def _bulk_write_pragmas(self) -> Iterator[None]:
+        # WAL + synchronous=NORMAL for the import only; the previous settings are restored afterwards.
         self.conn.commit()
+        journal_mode = self.conn.execute("PRAGMA journal_mode").fetchone()[0]
+        synchronous = self.conn.execute("PRAGMA synchronous").fetchone()[0]
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        try:
+            yield
+        finally:
+            self.conn.execute(f"PRAGMA synchronous={int(synchronous)}")
+            self.conn.execute(f"PRAGMA journal_mode={journal_mode}")
+
+    @staticmethod
+    def _import_row(row: dict[str, str], today: str) -> tuple[object, ...]:
+        status = row.get("status", ApplicationStatus.APPLIED.value)
+        if status not in VALID_STATUSES:
+            status = ApplicationStatus.APPLIED.value
+        return _insert_params(
+            (row.get("company") or "Unknown").strip(),
+            (row.get("role") or "Unknown").strip(),
+            status,
+            (row.get("source") or "unknown").strip(),
+            row.get("applied_date") or today,
+            row.get("last_updated") or today,
+            row.get("notes") or "",
+        )
+
+    def _import_chunks(
+        self,
+        input_path: str,
+        sql: str,
+        chunk_size: int,
+        progress: Callable[[int], None] | None,
+    ) -> tuple[int, int]:
+        """Run ``sql`` over the CSV rows in one transaction; return (rows read, rows written)."""
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+
+        today = date.today().isoformat()
+        imported = 0
+        written = 0
+        with open(input_path, "r", newline="", encoding="utf-8") as handle, self._bulk_write_pragmas():
+            rows = (self._import_row(row, today) for row in csv.DictReader(handle))
+            with self.conn:
+                self.conn.execute("BEGIN")
+                while chunk := list(islice(rows, chunk_size)):
+                    written += self.conn.executemany(sql, chunk).rowcount
+                    imported += len(chunk)
+                    if progress is not None:
+                        progress(imported)
+        return imported, written
+
+    def import_csv(
+        self,
+        input_path: str,
+        chunk_size: int = IMPORT_CHUNK_SIZE,
+        progress: Callable[[int], None] | None = None,
+    ) -> int:
+        """Bulk-insert CSV rows in executemany chunks inside a single transaction.
+
+        ``progress`` is called with the running row count after each chunk. A
+        failure rolls back the whole import.
+        """
+        imported, _ = self._import_chunks(input_path, INSERT_APPLICATION_SQL, chunk_size, progress)
         return imported
 
-    def iter_all(self) -> Iterable[JobApplication]:
-        return self.list_applications(status=None)
+    def upsert_csv(
+        self,
+        input_path: str,
+        chunk_size: int = IMPORT_CHUNK_SIZE,
+        progress: Callable[[int], None] | None = None,
+    ) -> ImportSummary:
+        """Idempotent import: merge rows into applications with the same company, role and applied date.
+
+        Re-importing an overlapping export inserts only new applications, merges
+        changed ones (see ``UPSERT_APPLICATION_SQL``) and skips rows whose content
+        is unchanged since the last import without writing them.
+        """
+        before = self._application_count()
+        imported, written = self._import_chunks(input_path, UPSERT_APPLICATION_SQL, chunk_size, progress)
+        inserted = self._application_count() - before
+        return ImportSummary(inserted=inserted, updated=written - inserted, unchanged=imported - written)
+
+    def _application_count(self) -> int:
+        # Read from the trigger-maintained counters rather than counting the table.
+        return self.conn.execute("SELECT COALESCE(SUM(applications), 0) FROM status_counts").fetchone()[0]
+
+    def funnel_metrics(self) -> FunnelMetrics:
+        """Funnel KPIs from the per-status counters, so the cost does not grow with the table."""
+        totals = self.conn.execute(FUNNEL_COUNTERS_SQL).fetchone()
+        return funnel_metrics_from_totals(*totals)
+
+    def stage_durations(self, since: str | None = None) -> list[StageDuration]:
+        """Average days between consecutive status changes, per (from, to) transition.
+
+        ``since`` limits it to applications applied on or after that ISO date.
+        """
+        return [
+            StageDuration(from_status, to_status, transitions, round(avg_days, 2))
+            for from_status, to_status, transitions, avg_days in self.conn.execute(
+                STAGE_DURATIONS_SQL, (date.fromisoformat(since).isoformat() if since else None,)
+            )
+        ]
+
+    def iter_all(self) -> Iterator[JobApplication]:
+        return self.iter_applications()
@@ -1,6 +1,6 @@
 import unittest
 
-from jobtracker.analytics import build_funnel_metrics
+from jobtracker.analytics import build_funnel_metrics, cohort_key, grouped_funnel_metrics
 from jobtracker.models import JobApplication
 
 
@@ -22,6 +22,28 @@ class AnalyticsTests(unittest.TestCase):
         self.assertAlmostEqual(metrics.response_rate, 1.0)
         self.assertAlmostEqual(metrics.offer_rate, 0.25)
 
+    def test_grouped_metrics_match_per_group_reference(self) -> None:
+        # Two January cohorts and one February cohort, over three sources.
+        apps = [
+            JobApplication(1, "A", "Eng", "applied", "referral", "2026-01-01", "2026-01-01", ""),
+            JobApplication(2, "B", "Eng", "interview", "linkedin", "2026-01-01", "2026-01-05", ""),
+            JobApplication(3, "C", "Eng", "offer", "site", "2026-01-02", "2026-01-08", ""),
+            JobApplication(4, "D", "Eng", "rejected", "site", "2026-02-02", "2026-02-06", ""),
+        ]
+        # A generator works too: groups are accumulated in a single pass.
+        by_source = grouped_funnel_metrics((app for app in apps), "source")
+        self.assertEqual(list(by_source), ["linkedin", "referral", "site"])
+        site = [app for app in apps if app.source == "site"]
+        self.assertEqual(by_source["site"], build_funnel_metrics(site))
+
+        by_month = grouped_funnel_metrics(apps, "cohort", "month")
+        self.assertEqual({key: m.total for key, m in by_month.items()}, {"2026-01": 3, "2026-02": 1})
+        by_week = grouped_funnel_metrics(apps, "cohort", "week")
+        self.assertEqual({key: m.total for key, m in by_week.items()}, {"2026-W01": 3, "2026-W06": 1})
+        self.assertEqual(cohort_key("", "week"), "unknown")
+        with self.assertRaises(ValueError):
+            grouped_funnel_metrics(apps, "role")
+
 
 if __name__ == "__main__":
     unittest.main()
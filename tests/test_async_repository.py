@@ -0,0 +1,97 @@
+import asyncio
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+
+from jobtracker.async_repository import AsyncApplicationRepository, RetryPolicy
+from jobtracker.db import connect
+
+
+class AsyncRepositoryTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = str(Path(self.tmp.name) / "apps.db")
+        self.repo = AsyncApplicationRepository(self.db_path, readers=2)
+        await self.repo.start()
+
+    async def asyncTearDown(self) -> None:
+        await self.repo.close()
+        self.tmp.cleanup()
+
+    async def test_concurrent_writes_are_coalesced(self) -> None:
+        ids = await asyncio.gather(
+            *(self.repo.add_application(company=f"Co {i}", role="Eng", applied_date="2026-01-01") for i in range(50))
+        )
+        self.assertEqual(len(set(ids)), 50)
+        # 50 writes queued at once should not need 50 commits.
+        self.assertLess(self.repo.commits, 50)
+
+        self.assertTrue(await self.repo.update_status(ids[0], "interview"))
+        self.assertEqual((await self.repo.get_application(ids[0])).status, "interview")
+        self.assertEqual(len(await self.repo.list_applications(limit=10)), 10)
+        self.assertEqual(len(await self.repo.search("co")), 20)
+        self.assertEqual((await self.repo.funnel_metrics()).interviews, 1)
+
+    async def test_failing_write_does_not_affect_its_batch(self) -> None:
+        first = await self.repo.add_application(company="A", role="Eng")
+        results = await asyncio.gather(
+            self.repo.update_status(first, "offer"),
+            self.repo.update_status(first, "bogus"),
+            self.repo.add_application(company="B", role="Eng"),
+            return_exceptions=True,
+        )
+        self.assertIs(results[0], True)
+        self.assertIsInstance(results[1], ValueError)
+        self.assertIsInstance(results[2], int)
+        self.assertEqual(len(await self.repo.list_applications()), 2)
+
+    async def test_write_during_close_fails_instead_of_hanging(self) -> None:
+        pending = asyncio.gather(*(self.repo.add_application(company=f"Co {i}", role="Eng") for i in range(5)))
+        closing = asyncio.create_task(self.repo.close())
+        # Let close() queue the stop marker; the writer thread is still running.
+        await asyncio.sleep(0)
+        with self.assertRaises(RuntimeError):
+            await asyncio.wait_for(self.repo.add_application(company="Late", role="Eng"), timeout=5)
+        await closing
+        # Writes queued before close() still commit.
+        self.assertEqual(len(await pending), 5)
+
+    async def test_writer_failure_settles_every_queued_write(self) -> None:
+        def broken_begin(conn: sqlite3.Connection) -> None:
+            raise RuntimeError("disk gone")
+
+        self.repo._begin = broken_begin
+        results = await asyncio.wait_for(
+            asyncio.gather(
+                *(self.repo.add_application(company=f"Co {i}", role="Eng") for i in range(5)), return_exceptions=True
+            ),
+            timeout=5,
+        )
+        self.assertTrue(all(isinstance(result, RuntimeError) for result in results))
+        with self.assertRaisesRegex(RuntimeError, "writer has stopped"):
+            await self.repo.add_application(company="Late", role="Eng")
+
+    async def test_readers_cannot_write(self) -> None:
+        with self.assertRaises(sqlite3.OperationalError):
+            await self.repo._read(lambda repo: repo.add_application(company="A", role="Eng"))
+
+    async def test_writer_retries_while_another_process_holds_the_lock(self) -> None:
+        await self.repo.close()
+        self.repo = AsyncApplicationRepository(
+            self.db_path, busy_timeout_ms=10, retry=RetryPolicy(attempts=20, backoff_ms=10, max_backoff_ms=20)
+        )
+        await self.repo.start()
+
+        other = connect(self.db_path)
+        self.addCleanup(other.close)
+        other.execute("BEGIN IMMEDIATE")
+        pending = asyncio.ensure_future(self.repo.add_application(company="A", role="Eng"))
+        await asyncio.sleep(0.05)
+        self.assertFalse(pending.done())
+        other.rollback()
+        self.assertGreater(await pending, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
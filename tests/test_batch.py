@@ -0,0 +1,114 @@
+import tempfile
+import threading
+import unittest
+
+from jobtracker.batch import READ_AHEAD_GROUPS, parse_operation, run_batch
+from jobtracker.db import connect, init_db
+from jobtracker.repository import ApplicationRepository
+
+
+class BatchTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.db_file = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+        self.db_file.close()
+        self.conn = connect(self.db_file.name)
+        init_db(self.conn)
+        self.repo = ApplicationRepository(self.conn, autocommit=False)
+
+    def tearDown(self) -> None:
+        self.conn.close()
+
+    def test_parse_cli_and_json_lines(self) -> None:
+        self.assertEqual(
+            parse_operation('add --company "Acme Co" --role Eng --applied-date 2026-01-02'),
+            {"op": "add", "company": "Acme Co", "role": "Eng", "applied_date": "2026-01-02"},
+        )
+        self.assertEqual(parse_operation('{"op": "update-status", "id": 3, "status": "offer"}')["id"], 3)
+        with self.assertRaises(ValueError):
+            parse_operation("add --company")
+
+    def test_group_commits_and_per_operation_results(self) -> None:
+        lines = [
+            '{"op": "add", "company": "Acme", "role": "Eng"}',
+            "add --company Globex --role Data",
+            "",
+            "# comment",
+            "update-status --id 1 --status interview",
+            "update-status --id 99 --status offer",
+            '{"op": "add", "company": "NoRole"}',
+            "update-status --id 2 --status bogus",
+            "add --company Initech --role SRE",
+        ]
+        results = []
+        summary = run_batch(self.repo, lines, results.append, commit_every=3, commit_interval_ms=60_000)
+
+        self.assertEqual(summary.operations, 7)
+        self.assertEqual(summary.failed, 3)
+        self.assertEqual(summary.commits, 3)
+        self.assertEqual([r.ok for r in results], [True, True, True, False, False, False, True])
+        self.assertEqual(results[0].data, {"id": 1})
+        self.assertIn("not found", results[3].error)
+        self.assertFalse(self.conn.in_transaction)
+
+        check = connect(self.db_file.name)
+        self.addCleanup(check.close)
+        statuses = [row["status"] for row in check.execute("SELECT status FROM applications ORDER BY id")]
+        self.assertEqual(statuses, ["interview", "applied", "applied"])
+
+    def test_interval_commits_while_input_is_idle(self) -> None:
+        release = threading.Event()
+        committed = []
+
+        def quiet_pipe():
+            yield "add --company Acme --role Eng"
+            # Hold the next line back until the first result has been committed.
+            release.wait(timeout=10)
+            yield "add --company Globex --role Data"
+
+        def on_result(result) -> None:
+            committed.append(result)
+            release.set()
+
+        summary = run_batch(self.repo, quiet_pipe(), on_result, commit_every=100, commit_interval_ms=20)
+        self.assertTrue(release.is_set())
+        self.assertEqual(summary.commits, 2)
+        self.assertEqual([r.data["id"] for r in committed], [1, 2])
+
+    def test_input_errors_are_raised(self) -> None:
+        def broken():
+            yield "add --company Acme --role Eng"
+            raise OSError("pipe closed")
+
+        results = []
+        with self.assertRaises(OSError):
+            run_batch(self.repo, broken(), results.append, commit_interval_ms=60_000)
+        # The operation read before the failure is committed and reported.
+        self.assertEqual([r.data for r in results], [{"id": 1}])
+        self.assertFalse(self.conn.in_transaction)
+
+    def test_reader_stays_within_a_few_groups(self) -> None:
+        read = []
+        sizes = []
+
+        def lines():
+            for i in range(50):
+                read.append(i)
+                yield f"add --company C{i} --role Eng"
+
+        def on_result(result) -> None:
+            # Lines read ahead of the committed operations are bounded by the inbox.
+            sizes.append(len(read) - result.line)
+
+        summary = run_batch(self.repo, lines(), on_result, commit_every=2, commit_interval_ms=60_000)
+        self.assertEqual(summary.operations, 50)
+        self.assertLessEqual(max(sizes), 2 * READ_AHEAD_GROUPS + 2)
+        with self.assertRaises(ValueError):
+            run_batch(self.repo, [], print, commit_every=0)
+
+    def test_requires_manual_commit_repository(self) -> None:
+        with self.assertRaises(ValueError):
+            run_batch(ApplicationRepository(self.conn), [], print)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import io
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+
+from jobtracker.cli import main
+from jobtracker.db import SCHEMA_VERSION, connect, schema_version
+
+
+class CliTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.db_file = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+        self.db_file.close()
+        self.conn = connect(self.db_file.name)
+
+    def tearDown(self) -> None:
+        self.conn.close()
+
+    def test_accepts_db_profile(self) -> None:
+        argv = ["--db", self.db_file.name, "--db-profile", "durable", "add", "--company", "A", "--role", "B"]
+        self.assertEqual(main(argv), 0)
+        self.assertEqual(schema_version(self.conn), SCHEMA_VERSION)
+
+    def test_rejects_bad_limits_and_dates(self) -> None:
+        bad_argvs = (
+            ["list", "--limit", "0"],
+            ["list", "--limit", "-2"],
+            ["search", "acme", "--limit", "0"],
+            ["export", "--output", "out.csv", "--chunk-size", "0"],
+            ["import-csv", "--input", "in.csv", "--chunk-size", "0"],
+            ["batch", "--commit-every", "0"],
+        )
+        for argv in bad_argvs:
+            with redirect_stderr(io.StringIO()), self.assertRaises(SystemExit) as raised:
+                main(["--db", self.db_file.name, *argv])
+            self.assertEqual(raised.exception.code, 2)
+
+        with redirect_stderr(io.StringIO()) as err, self.assertRaises(SystemExit):
+            main(["--db", self.db_file.name, "stats", "--since", "2026-13-01"])
+        self.assertIn("expected a YYYY-MM-DD date", err.getvalue())
+
+        for company in ("A", "B", "C"):
+            main(["--db", self.db_file.name, "add", "--company", company, "--role", "Engineer"])
+        with redirect_stdout(io.StringIO()) as out:
+            self.assertEqual(main(["--db", self.db_file.name, "list", "--limit", "1"]), 0)
+        self.assertEqual(len(out.getvalue().splitlines()), 2)
+        self.assertIn("More results: --after-id", out.getvalue())
+
+
+
+if __name__ == "__main__":
+    unittest.main()
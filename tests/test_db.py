@@ -0,0 +1,111 @@
+import sqlite3
+import tempfile
+import unittest
+
+from jobtracker.db import SCHEMA_SQL, SCHEMA_VERSION, connect, init_db, migrate, schema_version
+from jobtracker.repository import APPLICATION_COLUMNS, FUNNEL_METRICS_SQL
+
+
+class MigrationTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.db_file = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+        self.db_file.close()
+        self.conn = connect(self.db_file.name)
+
+    def tearDown(self) -> None:
+        self.conn.close()
+
+    def _plan(self, sql: str, params: tuple = ()) -> str:
+        rows = self.conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+        return "\n".join(row["detail"] for row in rows)
+
+    def test_fresh_database_is_migrated_once(self) -> None:
+        self.assertEqual(migrate(self.conn), SCHEMA_VERSION)
+        self.assertEqual(schema_version(self.conn), SCHEMA_VERSION)
+        self.assertEqual(migrate(self.conn), 0)
+
+    def test_unversioned_database_is_adopted_and_backfilled(self) -> None:
+        # A database created before versioning: tables exist but user_version is 0.
+        self.conn.executescript(SCHEMA_SQL)
+        self.conn.execute(
+            "INSERT INTO applications (company, role, status, source, applied_date, last_updated) "
+            "VALUES ('Umbrella', 'Eng', 'applied', 'site', '2026-01-01', '2026-01-01')"
+        )
+        self.conn.commit()
+
+        init_db(self.conn)
+        self.assertEqual(schema_version(self.conn), SCHEMA_VERSION)
+        hits = self.conn.execute("SELECT rowid FROM applications_fts WHERE applications_fts MATCH 'umbrella'")
+        self.assertEqual(len(hits.fetchall()), 1)
+        events = self.conn.execute("SELECT from_status, to_status FROM status_events").fetchall()
+        self.assertEqual([tuple(row) for row in events], [(None, "applied")])
+        counts = self.conn.execute("SELECT status, applications, touched FROM status_counts").fetchall()
+        self.assertEqual([tuple(row) for row in counts], [("applied", 1, 1)])
+
+    def test_natural_key_backfill_keeps_existing_duplicates(self) -> None:
+        self.conn.executescript(SCHEMA_SQL)
+        for _ in range(2):
+            self.conn.execute(
+                "INSERT INTO applications (company, role, status, source, applied_date, last_updated) "
+                "VALUES ('Umbrella', 'Eng', 'applied', 'site', '2026-01-01', '2026-01-01')"
+            )
+        self.conn.commit()
+
+        init_db(self.conn)
+        keys = self.conn.execute("SELECT id, natural_key FROM applications ORDER BY id").fetchall()
+        self.assertEqual([tuple(row) for row in keys], [(1, "Umbrella\x1fEng\x1f2026-01-01"), (2, None)])
+
+    def test_newer_schema_is_rejected(self) -> None:
+        self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION + 1}")
+        with self.assertRaises(RuntimeError):
+            migrate(self.conn)
+
+    def test_hot_queries_avoid_temp_btrees(self) -> None:
+        init_db(self.conn)
+        ordered = " ORDER BY applied_date DESC, id DESC"
+        queries = [
+            (f"SELECT {APPLICATION_COLUMNS} FROM applications{ordered}", ()),
+            (f"SELECT {APPLICATION_COLUMNS} FROM applications WHERE status = ?{ordered}", ("offer",)),
+            (
+                f"SELECT {APPLICATION_COLUMNS} FROM applications "
+                f"WHERE status = ? AND (applied_date, id) < (?, ?){ordered} LIMIT 20",
+                ("offer", "2026-01-01", 10),
+            ),
+            (FUNNEL_METRICS_SQL, ()),
+        ]
+        for sql, params in queries:
+            plan = self._plan(sql, params)
+            self.assertNotIn("TEMP B-TREE", plan, sql)
+            self.assertIn("USING", plan, sql)
+        self.assertIn("COVERING INDEX", self._plan(FUNNEL_METRICS_SQL))
+
+    def test_migration_failure_rolls_back(self) -> None:
+        self.conn.execute("CREATE TABLE applications_fts (broken)")
+        with self.assertRaises(sqlite3.Error):
+            migrate(self.conn)
+        self.assertFalse(self.conn.in_transaction)
+        self.assertEqual(schema_version(self.conn), 1)
+
+    def test_up_to_date_database_skips_schema_work(self) -> None:
+        init_db(self.conn)
+        statements: list[str] = []
+        self.conn.set_trace_callback(statements.append)
+        init_db(self.conn)
+        self.assertEqual(statements, ["PRAGMA user_version"])
+
+    def test_profiles_apply_pragmas(self) -> None:
+        self.assertEqual(self.conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+        self.assertEqual(self.conn.execute("PRAGMA synchronous").fetchone()[0], 1)
+        legacy = connect(":memory:", profile="legacy")
+        self.addCleanup(legacy.close)
+        self.assertEqual(legacy.execute("PRAGMA synchronous").fetchone()[0], 2)
+        # A WAL file opened with the legacy profile goes back to a rollback journal.
+        self.conn.close()
+        self.conn = connect(self.db_file.name, profile="legacy")
+        self.assertEqual(self.conn.execute("PRAGMA journal_mode").fetchone()[0], "delete")
+        with self.assertRaises(ValueError):
+            connect(":memory:", profile="turbo")
+
+
+if __name__ == "__main__":
+    unittest.main()
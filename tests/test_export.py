@@ -0,0 +1,116 @@
+import csv
+import gzip
+import io
+import json
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+
+from jobtracker.db import connect, init_db
+from jobtracker.export import EXPORT_FIELDS, export_applications
+from jobtracker.repository import ApplicationRepository
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+class ExportTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.conn = connect(str(Path(self.tmp.name) / "apps.db"))
+        self.addCleanup(self.conn.close)
+        init_db(self.conn)
+        self.repo = ApplicationRepository(self.conn)
+        for i in range(7):
+            app_id = self.repo.add_application(
+                company=f"Co, {i}", role="Eng", source="referral" if i % 2 else "site", applied_date=f"2026-01-0{i + 1}"
+            )
+            if i == 3:
+                self.repo.update_status(app_id, "offer")
+
+    def _path(self, name: str) -> str:
+        return str(Path(self.tmp.name) / name)
+
+    def test_export_csv_streams_every_row(self) -> None:
+        path = self._path("apps.csv")
+        self.assertEqual(self.repo.export_csv(path), 7)
+        with open(path, newline="", encoding="utf-8") as handle:
+            rows = list(csv.DictReader(handle))
+        self.assertEqual(list(rows[0]), EXPORT_FIELDS)
+        self.assertEqual([row["company"] for row in rows], [f"Co, {i}" for i in range(7)])
+
+    def test_filters_are_combined(self) -> None:
+        path = self._path("apps.csv.gz")
+        total = export_applications(
+            self.conn, path, since="2026-01-03", where="source = 'referral'", chunk_size=2
+        )
+        self.assertEqual(total, 2)
+        with gzip.open(path, "rt", newline="", encoding="utf-8") as handle:
+            companies = [row["company"] for row in csv.DictReader(handle)]
+        self.assertEqual(companies, ["Co, 3", "Co, 5"])
+        self.assertEqual(export_applications(self.conn, self._path("offers.jsonl"), fmt="jsonl", status="offer"), 1)
+        with self.assertRaises(ValueError):
+            export_applications(self.conn, self._path("bad.csv"), since="2026-1-3")
+
+    def test_failed_export_keeps_previous_file(self) -> None:
+        path = self._path("nightly.csv")
+        export_applications(self.conn, path)
+        previous = Path(path).read_bytes()
+        with self.assertRaises(sqlite3.OperationalError):
+            export_applications(self.conn, path, where="nosuchcol = 1")
+
+        def fail_late(app_id: int) -> int:
+            if app_id > 4:
+                raise ValueError("boom")
+            return 1
+
+        # Fails after the first chunks have already been written.
+        self.conn.create_function("fail_late", 1, fail_late)
+        with self.assertRaises(sqlite3.OperationalError):
+            export_applications(self.conn, path, chunk_size=2, where="fail_late(id)")
+        self.assertEqual(Path(path).read_bytes(), previous)
+        self.assertEqual([p.name for p in Path(self.tmp.name).iterdir() if p.name.endswith(".tmp")], [])
+
+    def test_jsonl_rows_keep_types(self) -> None:
+        path = self._path("apps.jsonl")
+        export_applications(self.conn, path, fmt="jsonl", chunk_size=3)
+        with open(path, encoding="utf-8") as handle:
+            records = [json.loads(line) for line in handle]
+        self.assertEqual(len(records), 7)
+        self.assertIsInstance(records[0]["id"], int)
+        self.assertEqual(list(records[0]), EXPORT_FIELDS)
+
+    @unittest.skipIf(zstandard is None, "zstandard not installed")
+    def test_zstd_csv(self) -> None:
+        path = self._path("apps.csv.zst")
+        export_applications(self.conn, path)
+        with open(path, "rb") as raw:
+            text = zstandard.ZstdDecompressor().stream_reader(raw).read().decode("utf-8")
+        self.assertEqual(len(list(csv.DictReader(io.StringIO(text)))), 7)
+
+    @unittest.skipIf(pa is None, "pyarrow not installed")
+    def test_parquet_and_arrow(self) -> None:
+        parquet = self._path("apps.parquet")
+        self.assertEqual(export_applications(self.conn, parquet, fmt="parquet", compression="zstd", chunk_size=3), 7)
+        table = pq.read_table(parquet)
+        self.assertEqual(table.column_names, EXPORT_FIELDS)
+        self.assertEqual(table.column("id").to_pylist(), list(range(1, 8)))
+
+        arrow = self._path("apps.arrow")
+        export_applications(self.conn, arrow, fmt="arrow", status="offer")
+        with pa.ipc.open_file(arrow) as reader:
+            self.assertEqual(reader.read_all().column("status").to_pylist(), ["offer"])
+
+
+if __name__ == "__main__":
+    unittest.main()
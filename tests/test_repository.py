@@ -1,8 +1,11 @@
+import csv
 import tempfile
 import unittest
+from pathlib import Path
 
-from jobtracker.db import connect, init_db
-from jobtracker.repository import ApplicationRepository
+from jobtracker.analytics import build_funnel_metrics, funnel_metrics_from_totals, grouped_funnel_metrics
+from jobtracker.db import SCHEMA_SQL, connect, init_db, rebuild_search_index
+from jobtracker.repository import FUNNEL_METRICS_SQL, ApplicationRepository
 
 
 class RepositoryTests(unittest.TestCase):
@@ -35,6 +38,183 @@ class RepositoryTests(unittest.TestCase):
         rows = self.repo.list_applications(status="interview")
         self.assertEqual(len(rows), 1)
 
+    def test_import_csv_in_chunks(self) -> None:
+        # Bulk import batches rows, reports progress, and restores the journal mode.
+        csv_path = Path(self.db_file.name).with_suffix(".csv")
+        self.addCleanup(csv_path.unlink)
+        with csv_path.open("w", newline="", encoding="utf-8") as handle:
+            writer = csv.writer(handle)
+            writer.writerow(["company", "role", "status", "applied_date"])
+            for i in range(25):
+                writer.writerow([f" Co {i} ", "Eng", "bogus" if i == 0 else "interview", "2026-01-02"])
+
+        self.conn.execute("PRAGMA journal_mode=DELETE")
+        seen: list[int] = []
+        imported = self.repo.import_csv(str(csv_path), chunk_size=10, progress=seen.append)
+        self.assertEqual(imported, 25)
+        self.assertEqual(seen, [10, 20, 25])
+        self.assertEqual(self.conn.execute("PRAGMA journal_mode").fetchone()[0], "delete")
+
+        rows = self.repo.list_applications()
+        self.assertEqual(len(rows), 25)
+        self.assertEqual(len(self.repo.list_applications(status="applied")), 1)
+        self.assertTrue(all(row.company.startswith("Co ") and row.source == "unknown" for row in rows))
+
+    def test_upsert_import_merges_overlapping_exports(self) -> None:
+        csv_path = Path(self.db_file.name).with_suffix(".csv")
+        self.addCleanup(csv_path.unlink)
+        header = ["company", "role", "status", "source", "applied_date", "last_updated", "notes"]
+
+        def write(rows: list[list[str]]) -> None:
+            with csv_path.open("w", newline="", encoding="utf-8") as handle:
+                writer = csv.writer(handle)
+                writer.writerow(header)
+                writer.writerows(rows)
+
+        manual = self.repo.add_application(company="Acme", role="Eng", applied_date="2026-01-01")
+        first = [
+            ["Acme", "Eng", "interview", "ats", "2026-01-01", "2026-01-05", ""],
+            ["Globex", "Eng", "offer", "ats", "2026-01-02", "2026-01-09", ""],
+            ["Initech", "Eng", "applied", "ats", "2026-01-03", "2026-01-03", ""],
+            ["Initech", "Eng", "phone_screen", "ats", "2026-01-03", "2026-01-04", "dup in file"],
+        ]
+        write(first)
+        summary = self.repo.upsert_csv(str(csv_path), chunk_size=2)
+        self.assertEqual((summary.inserted, summary.updated, summary.unchanged), (2, 2, 0))
+        self.assertEqual(self.repo.get_application(manual).status, "interview")
+
+        # Status never moves backwards, but newer details still merge in.
+        write([first[0], ["Globex", "Eng", "interview", "ats", "2026-01-02", "2026-01-12", "late"], first[2]])
+        summary = self.repo.upsert_csv(str(csv_path))
+        self.assertEqual((summary.inserted, summary.updated, summary.unchanged), (0, 2, 1))
+        apps = {app.company: app for app in self.repo.iter_all()}
+        self.assertEqual(len(apps), 3)
+        self.assertEqual((apps["Globex"].status, apps["Globex"].last_updated, apps["Globex"].notes), ("offer", "2026-01-12", "late"))
+        self.assertEqual(apps["Initech"].status, "phone_screen")
+        self.assertEqual(self.repo.funnel_metrics(), build_funnel_metrics(self.repo.iter_all()))
+
+        # Re-importing the same file is a no-op.
+        changes = self.conn.total_changes
+        self.assertEqual(self.repo.upsert_csv(str(csv_path)).unchanged, 3)
+        self.assertEqual(self.conn.total_changes, changes)
+
+    def test_sql_funnel_metrics_match_python_reference(self) -> None:
+        self.assertEqual(self.repo.funnel_metrics(), build_funnel_metrics([]))
+        samples = [
+            ("A", "applied", "2026-01-01", "2026-01-01"),
+            ("B", "interview", "2026-01-01", "2026-01-05"),
+            ("C", "offer", "2026-01-02", "2026-01-09"),
+            ("D", "rejected", "2026-01-02", "2026-01-06"),
+            ("E", "phone_screen", "2026-01-10", "2026-01-03"),
+            ("F", "withdrawn", "2026-02-01", ""),
+            # import-csv stores dates unchecked; both paths count this one as 0 days.
+            ("G", "interview", "2026-01-03", "01/05/2026"),
+        ]
+        for company, status, applied, updated in samples:
+            self.conn.execute(
+                "INSERT INTO applications (company, role, status, source, applied_date, last_updated) "
+                "VALUES (?, 'Eng', ?, 'site', ?, ?)",
+                (company, status, applied, updated),
+            )
+        self.conn.commit()
+        self.assertEqual(self.repo.funnel_metrics(), build_funnel_metrics(self.repo.iter_all()))
+        by_source = grouped_funnel_metrics(self.repo.iter_all(), "source")
+        self.assertEqual(by_source["site"], self.repo.funnel_metrics())
+
+    def test_keyset_pages_cover_every_row_once(self) -> None:
+        for i in range(7):
+            self.repo.add_application(company=f"Co {i}", role="Eng", applied_date=f"2026-01-0{1 + i % 3}")
+        expected = [app.id for app in self.repo.list_applications()]
+
+        seen: list[int] = []
+        after = None
+        while True:
+            page = list(self.repo.iter_applications(limit=3, after=after, batch_size=2))
+            if not page:
+                break
+            seen.extend(app.id for app in page)
+            after = (page[-1].applied_date, page[-1].id)
+        self.assertEqual(seen, expected)
+        self.assertEqual(len(list(self.repo.iter_applications(since="2026-01-02"))), 4)
+        self.assertEqual(self.repo.get_application(expected[0]).id, expected[0])
+        self.assertIsNone(self.repo.get_application(999))
+
+    def test_full_text_search_tracks_changes(self) -> None:
+        first = self.repo.add_application(company="Acme Robotics", role="Python Engineer", notes="remote friendly")
+        second = self.repo.add_application(company="Globex", role="Data Engineer", notes="python heavy, acme client")
+
+        self.assertEqual([app.id for app in self.repo.search("acme")], [first, second])
+        self.assertEqual([app.id for app in self.repo.search("rob", prefix=True)], [first])
+        self.assertEqual([app.id for app in self.repo.search("glob*", raw=True)], [second])
+        self.assertEqual([app.id for app in self.repo.search("python OR robotics", raw=True)], [first, second])
+
+        third = self.repo.add_application(company="AT&T", role="C++ Developer", notes="remote-first team")
+        for text in ("AT&T", "c++", "remote-first"):
+            self.assertEqual([app.id for app in self.repo.search(text)], [third], text)
+        self.assertEqual(self.repo.search('say "hi"'), [])
+
+        self.conn.execute("UPDATE applications SET notes = 'on-site' WHERE id = ?", (second,))
+        self.conn.execute("DELETE FROM applications WHERE id = ?", (first,))
+        self.conn.commit()
+        self.assertEqual(self.repo.search("acme"), [])
+        with self.assertRaises(ValueError):
+            self.repo.search('"unbalanced', raw=True)
+
+    def test_status_counters_follow_every_write_path(self) -> None:
+        first = self.repo.add_application(company="A", role="Eng", applied_date="2026-01-01")
+        second = self.repo.add_application(company="B", role="Eng", applied_date="2026-01-03")
+        self.repo.update_status(first, "interview")
+        self.repo.update_status(first, "offer")
+        self.conn.execute("UPDATE applications SET last_updated = '2026-01-02' WHERE id = ?", (second,))
+        self.conn.execute(
+            "INSERT INTO applications (company, role, status, source, applied_date, last_updated) "
+            "VALUES ('C', 'Eng', 'rejected', 'site', '2026-01-05', 'not a date')"
+        )
+        self.conn.execute("DELETE FROM applications WHERE id = ?", (second,))
+        self.conn.commit()
+
+        scanned = self.conn.execute(FUNNEL_METRICS_SQL).fetchone()
+        self.assertEqual(self.repo.funnel_metrics(), funnel_metrics_from_totals(*scanned))
+        statuses = [row["status"] for row in self.conn.execute("SELECT status FROM status_counts WHERE applications > 0")]
+        self.assertEqual(sorted(statuses), ["offer", "rejected"])
+
+    def test_stage_durations_use_status_events(self) -> None:
+        app_id = self.repo.add_application(company="A", role="Eng", applied_date="2026-01-01")
+        self.repo.update_status(app_id, "interview")
+        self.repo.update_status(app_id, "interview")
+        events = self.conn.execute(
+            "SELECT from_status, to_status FROM status_events WHERE application_id = ? ORDER BY id", (app_id,)
+        ).fetchall()
+        self.assertEqual([tuple(row) for row in events], [(None, "applied"), ("applied", "interview")])
+
+        self.conn.execute(
+            "UPDATE status_events SET changed_on = '2026-01-08' WHERE application_id = ? AND to_status = 'interview'",
+            (app_id,),
+        )
+        [stage] = self.repo.stage_durations()
+        self.assertEqual((stage.from_status, stage.to_status, stage.transitions, stage.avg_days), ("applied", "interview", 1, 7.0))
+        self.assertEqual(self.repo.stage_durations(since="2026-01-01"), [stage])
+        self.assertEqual(self.repo.stage_durations(since="2026-01-02"), [])
+        with self.assertRaises(ValueError):
+            list(self.repo.iter_applications(since="January"))
+
+    def test_search_index_backfills_existing_rows(self) -> None:
+        # A database from before the search index migration: the version 1 schema with data.
+        conn = connect(":memory:")
+        self.addCleanup(conn.close)
+        conn.executescript(SCHEMA_SQL)
+        conn.execute(
+            "INSERT INTO applications (company, role, status, source, applied_date, last_updated) "
+            "VALUES ('Initech', 'Engineer', 'applied', 'site', '2026-01-01', '2026-01-01')"
+        )
+        conn.execute("PRAGMA user_version = 1")
+        conn.commit()
+        repo = ApplicationRepository(conn)
+        init_db(conn)
+        self.assertEqual(len(repo.search("initech")), 1)
+        rebuild_search_index(conn)
+        self.assertEqual(len(repo.search("initech")), 1)
+
 
 if __name__ == "__main__":
     unittest.main()